@@ -1,44 +1,85 @@
 """AI assistant endpoints: respond, resolve, classify, prioritize, and schedule items."""
 
+import asyncio
+import copy
+import functools
+import inspect
 import os
 import json
-import math
+import threading
+import time
 import uuid
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
+import numpy as np
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from openai import OpenAI
 from backend.app.db.ai_queries import (
-    add_ai_message,
     add_ai_memory,
+    count_indexed_ai_memories,
     list_ai_memories,
-    list_ai_messages_since,
-    list_ai_memories_with_embeddings,
-    prune_ai_memories,
+    search_ai_memories,
     touch_ai_memories,
 )
-from backend.app.db.event_queries import add_event, delete_event, list_events_for_date, list_events_from_date
+from backend.app.db.event_queries import (
+    add_event,
+    add_event_exdate,
+    delete_event,
+    expansion_cache_stats,
+    get_event,
+)
+from backend.app.db.recurrence import daily_rule
 from backend.app.db.queries import (
     add_task,
     get_tasks,
-    list_open_tasks,
     mark_task_done,
     mark_all_tasks_done,
     update_task_priority,
 )
-from backend.app.db.workday_queries import get_work_day, set_work_day
 from backend.app.db.reminder_queries import (
     create_active_for_date,
     delete_active_reminder,
     delete_event_reminders,
-    list_active_reminders,
+    get_reminder,
     list_recent_reminders,
     mark_done,
 )
+from backend.app.db.people_queries import add_relationship
 from backend.app.db.pronunciation_queries import upsert_pronunciation
-from backend.app.services.event_reminder_service import create_event_reminders_for_date
+from backend.app.db.schedule_queries import apply_schedule_batch
+from backend.app.services.briefing_service import briefing_service
+from backend.app.services.caching import TTLCache
+from backend.app.services.day_summary import day_summary
+from backend.app.services.embedding_cache import embedding_cache, normalize_text
+from backend.app.services.history_manager import history_manager
+from backend.app.services.event_reminder_service import (
+    create_event_reminders_for_date,
+    plan_event_reminders,
+)
+from backend.app.services.intent_classifier import get_intent_classifier
+from backend.app.services.item_matcher import (
+    best_item,
+    events_index,
+    matcher_stats,
+    rank_items,
+    reminders_index,
+    tasks_index,
+    tokenize,
+)
+from backend.app.services.memory_pipeline import maintenance_stats, memory_pipeline
+from backend.app.services.openai_client import (
+    AsyncGuardedOpenAI,
+    CircuitOpenError,
+    GuardedOpenAI,
+    client_stats,
+    get_async_openai_client,
+    get_openai_client,
+)
+from backend.app.services.people_profile import parse_family_memory, people_profile
+from backend.app.services.request_snapshot import RequestSnapshot, snapshot_stats
 
 router = APIRouter()
 TZ = ZoneInfo("Europe/London")
@@ -107,31 +148,104 @@ class ReclassifyConfirmRequest(BaseModel):
     target: str
     item_type: str
     item_id: int
+    text: str = ""  # the original prompt, so a named date moves one occurrence of a series
+
 
+def get_client() -> GuardedOpenAI:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=500, detail="OPENAI_API_KEY not set")
+    return get_openai_client(api_key)
 
-def get_client() -> OpenAI:
+
+def get_async_client() -> AsyncGuardedOpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="OPENAI_API_KEY not set")
-    return OpenAI(api_key=api_key)
+    return get_async_openai_client(api_key)
+
+
+def _create_or_none(client: GuardedOpenAI, **kwargs):
+    """Structured-output call for the `_parse_*` helpers; None (-> local fallback) on failure."""
+    try:
+        return client.responses.create(**kwargs)
+    except Exception:
+        return None
+
+
+async def _acreate_or_none(client: AsyncGuardedOpenAI, **kwargs):
+    """Async `_create_or_none`; cancellation still propagates."""
+    try:
+        return await client.responses.create(**kwargs)
+    except Exception:
+        return None
+
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    if len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(y * y for y in b))
-    if norm_a == 0.0 or norm_b == 0.0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+_parse_cache = TTLCache(
+    maxsize=int(os.getenv("AI_PARSE_CACHE_MAX_ENTRIES", "512")),
+    ttl_s=float(os.getenv("AI_PARSE_CACHE_TTL_SECONDS", "21600")),
+)
 
 
-def _embed_text(client: OpenAI, text: str, model: str) -> list[float]:
-    response = client.embeddings.create(model=model, input=text)
-    return response.data[0].embedding
+# Phrasings resolved against the current time; their parses must not be replayed later.
+_RELATIVE_TIME_RE = re.compile(
+    r"\bin\s+(?:an?|\d+|half\s+an?)\s*(?:min(?:ute)?s?|hours?|hrs?)\b"
+    r"|\b(?:tonight|later|this\s+(?:morning|afternoon|evening)|now|soon)\b",
+    re.IGNORECASE,
+)
 
 
-def _parse_resolve(client: OpenAI, text: str, model: str) -> ResolveResult | None:
+def _cached_parse(fn):
+    """
+    Memoise a `_parse_*` helper on (helper, normalised text, today's date, model).
+    Failures (None) and prompts with time-relative phrasing ("in 2 hours", "tonight")
+    are not cached; callers get deep copies since they mutate results.
+    """
+
+    def cache_key(text: str, model: str) -> tuple | None:
+        if _RELATIVE_TIME_RE.search(text):
+            return None
+        return (fn.__name__, normalize_text(text), datetime.now(TZ).date().isoformat(), model)
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(client: AsyncGuardedOpenAI, text: str, model: str):
+            key = cache_key(text, model)
+            if key is None:
+                return await fn(client, text, model)
+            cached = _parse_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            result = await fn(client, text, model)
+            if result is not None:
+                _parse_cache.set(key, copy.deepcopy(result))
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(client: GuardedOpenAI, text: str, model: str):
+        key = cache_key(text, model)
+        if key is None:
+            return fn(client, text, model)
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        result = fn(client, text, model)
+        if result is not None:
+            _parse_cache.set(key, copy.deepcopy(result))
+        return result
+
+    return wrapper
+
+
+def _embed_text(client: GuardedOpenAI, text: str, model: str) -> np.ndarray:
+    return embedding_cache.embed(client, text, model)
+
+
+@_cached_parse
+def _parse_resolve(client: GuardedOpenAI, text: str, model: str) -> ResolveResult | None:
     system_prompt = (
         "You detect completion intents. Return JSON with fields: "
         "action ('complete'|'delete'|'none'), target ('task'|'reminder'|'event'|'none'), "
@@ -140,7 +254,8 @@ def _parse_resolve(client: OpenAI, text: str, model: str) -> ResolveResult | Non
         "If they want to remove/cancel an event, action=delete and target=event. "
         "If no completion intent, action=none."
     )
-    response = client.responses.create(
+    response = _create_or_none(
+        client,
         model=model,
         input=[
             {"role": "system", "content": system_prompt},
@@ -171,6 +286,8 @@ def _parse_resolve(client: OpenAI, text: str, model: str) -> ResolveResult | Non
             }
         },
     )
+    if response is None:
+        return None
     output_text = response.output_text or ""
     try:
         payload = json.loads(output_text)
@@ -182,13 +299,15 @@ def _parse_resolve(client: OpenAI, text: str, model: str) -> ResolveResult | Non
         return None
 
 
-def _parse_reclassify(client: OpenAI, text: str, model: str) -> dict | None:
+@_cached_parse
+def _parse_reclassify(client: GuardedOpenAI, text: str, model: str) -> dict | None:
     system_prompt = (
         "You detect reclassify intents. Return JSON with fields: "
         "target ('task'|'reminder'|'event'|'none') and title (string or null). "
         "If the user says something should be moved to a category, extract the title."
     )
-    response = client.responses.create(
+    response = _create_or_none(
+        client,
         model=model,
         input=[
             {"role": "system", "content": system_prompt},
@@ -215,6 +334,8 @@ def _parse_reclassify(client: OpenAI, text: str, model: str) -> dict | None:
             }
         },
     )
+    if response is None:
+        return None
     output_text = response.output_text or ""
     try:
         payload = json.loads(output_text)
@@ -223,14 +344,16 @@ def _parse_reclassify(client: OpenAI, text: str, model: str) -> dict | None:
     return payload
 
 
-def _parse_priority(client: OpenAI, text: str, model: str) -> dict | None:
+@_cached_parse
+def _parse_priority(client: GuardedOpenAI, text: str, model: str) -> dict | None:
     system_prompt = (
         "You extract task priority updates. "
         "Return JSON with fields: title (string or null) and priority "
         "('vital'|'medium'|'trivial'|'none'). "
         "If no priority change intent, set priority='none'."
     )
-    response = client.responses.create(
+    response = _create_or_none(
+        client,
         model=model,
         input=[
             {"role": "system", "content": system_prompt},
@@ -257,6 +380,8 @@ def _parse_priority(client: OpenAI, text: str, model: str) -> dict | None:
             }
         },
     )
+    if response is None:
+        return None
     output_text = response.output_text or ""
     try:
         payload = json.loads(output_text)
@@ -265,7 +390,10 @@ def _parse_priority(client: OpenAI, text: str, model: str) -> dict | None:
     return payload
 
 
-def _parse_schedule(client: OpenAI, text: str, model: str) -> ScheduleResult | None:
+@_cached_parse
+async def _parse_schedule(
+    client: AsyncGuardedOpenAI, text: str, model: str
+) -> ScheduleResult | None:
     today = datetime.now(TZ).date().isoformat()
     system_prompt = (
         "You extract scheduling intents. Today is "
@@ -312,7 +440,8 @@ def _parse_schedule(client: OpenAI, text: str, model: str) -> ScheduleResult | N
         "'I'm off on Tuesday' -> action=workday, is_work=false for that date. "
         "'I'm working Tuesday 9 to 5' -> action=workday with start/end times."
     )
-    response = client.responses.create(
+    response = await _acreate_or_none(
+        client,
         model=model,
         input=[
             {"role": "system", "content": system_prompt},
@@ -410,6 +539,8 @@ def _parse_schedule(client: OpenAI, text: str, model: str) -> ScheduleResult | N
             }
         },
     )
+    if response is None:
+        return None
     output_text = response.output_text or ""
     try:
         payload = json.loads(output_text)
@@ -421,8 +552,9 @@ def _parse_schedule(client: OpenAI, text: str, model: str) -> ScheduleResult | N
         return None
 
 
-def _parse_schedule_mixed(
-    client: OpenAI, text: str, model: str
+@_cached_parse
+async def _parse_schedule_mixed(
+    client: AsyncGuardedOpenAI, text: str, model: str
 ) -> list[ScheduleItem] | None:
     today = datetime.now(TZ).date().isoformat()
     system_prompt = (
@@ -434,7 +566,8 @@ def _parse_schedule_mixed(
         "start_hhmm, end_hhmm, all_day, priority, is_work}. "
         "Use null when fields do not apply. If no items, return an empty array."
     )
-    response = client.responses.create(
+    response = await _acreate_or_none(
+        client,
         model=model,
         input=[
             {"role": "system", "content": system_prompt},
@@ -491,6 +624,8 @@ def _parse_schedule_mixed(
             }
         },
     )
+    if response is None:
+        return None
     output_text = response.output_text or ""
     try:
         payload = json.loads(output_text)
@@ -508,6 +643,53 @@ def _parse_schedule_mixed(
     return parsed_items
 
 
+COMMAND_INTENTS = ("respond", "schedule", "resolve", "reclassify", "priority")
+
+
+@_cached_parse
+def _parse_intent(client: GuardedOpenAI, text: str, model: str) -> str | None:
+    system_prompt = (
+        "You route voice commands for a home assistant. Return JSON with field intent: "
+        "'schedule' (add reminders, tasks, events or workday changes), "
+        "'resolve' (something is done, or cancel/delete an item), "
+        "'reclassify' (move an item between task/reminder/event), "
+        "'priority' (change a task's priority), "
+        "or 'respond' (anything else: conversation, questions, today's summary, "
+        "remembering facts)."
+    )
+    response = _create_or_none(
+        client,
+        model=model,
+        input=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ],
+        store=False,
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "command_intent",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {
+                        "intent": {"type": "string", "enum": list(COMMAND_INTENTS)},
+                    },
+                    "required": ["intent"],
+                },
+            }
+        },
+    )
+    if response is None:
+        return None
+    try:
+        intent = json.loads(response.output_text or "").get("intent")
+    except Exception:
+        return None
+    return intent if intent in COMMAND_INTENTS else None
+
+
 def _looks_mixed(prompt: str) -> bool:
     lowered = prompt.lower()
     intent_hits = 0
@@ -520,13 +702,14 @@ def _looks_mixed(prompt: str) -> bool:
     return intent_hits >= 2 and (" and " in lowered or "," in lowered)
 
 
+_DATE_WORDS_RE = re.compile(
+    r"\b(today|tomorrow|tonight|later|next week|this week|next month|this month)\b",
+    re.IGNORECASE,
+)
+
+
 def _strip_date_words(text: str) -> str:
-    cleaned = re.sub(
-        r"\b(today|tomorrow|tonight|later|next week|this week|next month|this month)\b",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
+    cleaned = _DATE_WORDS_RE.sub("", text)
     return re.sub(r"\s+", " ", cleaned).strip(" ,.")
 
 def _normalize_task_phrase(text: str) -> str:
@@ -624,126 +807,6 @@ def _looks_like_reminder(prompt: str) -> bool:
     return any(phrase in lowered for phrase in reminder_phrases)
 
 
-def _natural_time(hhmm: str | None) -> str:
-    if not hhmm:
-        return ""
-    try:
-        dt = datetime.strptime(hhmm, "%H:%M")
-        hour = dt.strftime("%I").lstrip("0") or "12"
-        minute = dt.strftime("%M")
-        suffix = dt.strftime("%p").lower()
-        if minute == "00":
-            return f"{hour} {suffix}"
-        return f"{hour}:{minute} {suffix}"
-    except Exception:
-        return hhmm
-
-
-def _family_summary(memories: list[dict]) -> str:
-    family_rels = {
-        "wife",
-        "husband",
-        "partner",
-        "son",
-        "sons",
-        "daughter",
-        "daughters",
-        "dad",
-        "father",
-        "mum",
-        "mom",
-        "mother",
-        "sister",
-        "sisters",
-        "brother",
-        "brothers",
-    }
-    members = ["you (Dad)"]
-    def add_names(names: list[str], rel: str) -> None:
-        for name in names:
-            cleaned = name.strip()
-            if cleaned:
-                members.append(f"{cleaned} ({rel})")
-
-    for mem in memories:
-        summary = mem.get("summary", "")
-        match = re.match(
-            r"^(?P<name>.+?) is my (?P<rel>[A-Za-z ]+)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            name = match.group("name").strip()
-            rel = match.group("rel").strip().lower()
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names([name], rel)
-            continue
-        match = re.match(
-            r"^my (?P<rel>[A-Za-z ]+) is (?P<name>.+?)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            name = match.group("name").strip()
-            rel = match.group("rel").strip().lower()
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names([name], rel)
-            continue
-        match = re.match(
-            r"^(?P<names>.+?) are my (?P<rel>[A-Za-z ]+)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            names = match.group("names")
-            rel = match.group("rel").strip().lower()
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names(re.split(r",| and ", names), rel)
-            continue
-        match = re.match(
-            r"^my (?P<rel>[A-Za-z ]+) are (?P<names>.+?)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            names = match.group("names")
-            rel = match.group("rel").strip().lower()
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names(re.split(r",| and ", names), rel)
-            continue
-        match = re.match(
-            r"^the (?P<rel>[A-Za-z ]+) is named (?P<name>.+?)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            name = match.group("name").strip()
-            rel = match.group("rel").strip().lower()
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names([name], rel)
-            continue
-        match = re.match(
-            r"^the family has (?P<rel>[A-Za-z ]+) named (?P<names>.+?)\.?$",
-            summary,
-            re.IGNORECASE,
-        )
-        if match:
-            names = match.group("names")
-            rel = match.group("rel").strip().lower()
-            rel = rel.replace("twin ", "")
-            rel = rel[:-1] if rel.endswith("s") else rel
-            if rel in family_rels:
-                add_names(re.split(r",| and ", names), rel)
-    if len(members) == 1:
-        return "I don't have any family details saved yet."
-    return "Your family includes " + ", ".join(members) + "."
-
-
 def _extract_pronunciation(text: str) -> tuple[str | None, str | None]:
     cleaned = text.strip()
     patterns = [
@@ -776,6 +839,171 @@ def _extract_relative_hhmm_and_date(text: str, now_dt: datetime) -> tuple[str |
     return target_dt.strftime("%H:%M"), target_dt.date().isoformat()
 
 
+_LOCAL_REMINDER_RE = re.compile(
+    r"\b(?:remind me|alert me|ping me|nudge me|"
+    r"(?:set|add) (?:a |an )?(?:reminder|alert))\s+(?:to\s+|about\s+|for\s+|that\s+)?(?P<what>.+)$",
+    re.IGNORECASE,
+)
+_LOCAL_TIME_PHRASE_RE = re.compile(
+    r"\b(?:in\s+\d+\s*(?:minute|minutes|hour|hours)"
+    r"|(?:at\s+)?\d{1,2}(?::[0-5]\d)?\s*(?:am|pm)"
+    r"|(?:at\s+)?(?:[01]?\d|2[0-3]):[0-5]\d"
+    r"|today|tonight|tomorrow|this (?:morning|afternoon|evening))\b",
+    re.IGNORECASE,
+)
+# Anything that needs real date understanding (or several intents) goes to the LLM.
+_LOCAL_BLOCKERS_RE = re.compile(
+    r"\b(?:mon|tues|wednes|thurs|fri|satur|sun)day|"
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b|"
+    r"\b(?:next|every|daily|weekly|week|weekend|month|until|from|between|"
+    r"working|shift|off|appointment|meeting|event|calendar)\b|"
+    r"\b\d{1,2}(?:st|nd|rd|th)\b|\d{4}-\d{2}-\d{2}|/",
+    re.IGNORECASE,
+)
+_LOCAL_PRIORITY_RE = re.compile(
+    r"\b(?:urgent|urgently|important|asap|vital|priority|no rush|whenever)\b", re.IGNORECASE
+)
+_LOCAL_TASK_RE = re.compile(
+    r"^\s*(?:i\s+|i've\s+|ive\s+)?(?:need to|have to|got to)\s+|"
+    r"^\s*(?:add (?:a )?task(?: to)?|todo:?)\s+",
+    re.IGNORECASE,
+)
+
+_stats_lock = threading.Lock()
+_schedule_stats = {"local_hits": 0, "llm_calls": 0, "llm_ms_total": 0.0}
+_command_stats = {
+    "local": 0,
+    "llm": 0,
+    "fallbacks": 0,
+    "by_intent": {intent: 0 for intent in COMMAND_INTENTS},
+}
+# Intents that complete, delete or move items need more confidence before acting locally.
+_DESTRUCTIVE_INTENTS = frozenset({"resolve", "reclassify"})
+_speculation_stats = {
+    "runs": 0,
+    "schedule_wins": 0,
+    "mixed_wins": 0,
+    "cancelled": 0,
+    "schedule_calls": 0,
+    "schedule_ms_total": 0.0,
+    "mixed_calls": 0,
+    "mixed_ms_total": 0.0,
+}
+
+
+def _speculation_summary() -> dict:
+    with _stats_lock:
+        stats = dict(_speculation_stats)
+    for kind in ("schedule", "mixed"):
+        calls = stats[f"{kind}_calls"]
+        total_ms = stats.pop(f"{kind}_ms_total")
+        stats[f"{kind}_avg_ms"] = round(total_ms / calls, 1) if calls else 0.0
+    return stats
+
+
+def _command_routing_stats() -> dict:
+    with _stats_lock:
+        return {**_command_stats, "by_intent": dict(_command_stats["by_intent"])}
+
+
+def _capitalize(text: str) -> str:
+    return text[:1].upper() + text[1:]
+
+
+def _parse_schedule_local(text: str, now_dt: datetime) -> ScheduleResult | None:
+    """
+    Deterministic parser for the simple single-intent cases (timed reminders, plain
+    tasks). Returns None whenever the text is ambiguous so the LLM handles it.
+    """
+    if _looks_mixed(text) or _LOCAL_BLOCKERS_RE.search(text):
+        return None
+    lowered = text.lower()
+
+    if _looks_like_reminder(text):
+        match = _LOCAL_REMINDER_RE.search(text)
+        if not match:
+            return None
+        rel_hhmm, rel_date = _extract_relative_hhmm_and_date(text, now_dt)
+        if rel_hhmm:
+            hhmm, date = rel_hhmm, rel_date
+        else:
+            hhmm = _extract_time_hhmm(text)
+            if not hhmm:
+                return None
+            day = now_dt.date()
+            if re.search(r"\btomorrow\b", lowered):
+                day = day + timedelta(days=1)
+            elif hhmm <= now_dt.strftime("%H:%M"):
+                return None
+            date = day.isoformat()
+        title = _LOCAL_TIME_PHRASE_RE.sub("", match.group("what"))
+        title = re.sub(r"\s+", " ", title).strip(" ,.!?")
+        title = re.sub(r"^(?:to|about)\s+", "", title, flags=re.IGNORECASE)
+        if not title or re.search(r"\d", title):
+            return None
+        return ScheduleResult(
+            action="reminder",
+            title=_capitalize(title),
+            date=date,
+            start_hhmm=hhmm,
+            all_day=False,
+        )
+
+    if _looks_like_appointment(text) or _LOCAL_PRIORITY_RE.search(text):
+        return None
+    if _extract_time_hhmm(text) or re.search(r"\bin\s+\d+", lowered):
+        return None
+    # Only split where another lead-in follows: "buy bread and milk" stays one task.
+    parts = re.split(
+        r"\s*(?:,|\band\b|\bthen\b)\s*(?=(?:i\s+|i've\s+)?(?:need to|have to|got to)\b)",
+        text,
+        flags=re.IGNORECASE,
+    )
+    if not all(_LOCAL_TASK_RE.search(part) for part in parts):
+        return None
+    titles = []
+    for part in parts:
+        title = _LOCAL_TASK_RE.sub("", part).strip(" ,.!?")
+        # Times ("at 3") and dates ("tomorrow") would be dropped or kept as title text.
+        if not title or re.search(r"\d", title) or _DATE_WORDS_RE.search(title):
+            return None
+        if len(title.split()) > 8:
+            return None
+        titles.append(_capitalize(title))
+    return ScheduleResult(
+        action="task",
+        title=titles[0],
+        tasks=titles,
+        all_day=False,
+    )
+
+
+def _record_schedule_parse(local: bool, llm_ms: float = 0.0) -> None:
+    with _stats_lock:
+        if local:
+            _schedule_stats["local_hits"] += 1
+        else:
+            _schedule_stats["llm_calls"] += 1
+            _schedule_stats["llm_ms_total"] += llm_ms
+
+
+def _schedule_parse_stats() -> dict:
+    with _stats_lock:
+        local_hits = _schedule_stats["local_hits"]
+        llm_calls = _schedule_stats["llm_calls"]
+        llm_ms_total = _schedule_stats["llm_ms_total"]
+    total = local_hits + llm_calls
+    avg_llm_ms = llm_ms_total / llm_calls if llm_calls else 0.0
+    return {
+        "local_hits": local_hits,
+        "llm_calls": llm_calls,
+        "local_hit_rate": round(local_hits / total, 3) if total else 0.0,
+        "avg_llm_ms": round(avg_llm_ms, 1),
+        # Estimate: each local hit avoided one average LLM parse.
+        "est_ms_saved": round(local_hits * avg_llm_ms, 1),
+    }
+
+
 def _infer_term_from_history(history: list[dict]) -> str | None:
     for msg in reversed(history[-5:]):
         if msg.get("role") != "user":
@@ -799,6 +1027,7 @@ def _infer_term_from_history(history: list[dict]) -> str | None:
 
 
 def _infer_possessive_relation(history: list[dict]) -> str | None:
+    """Name of the relative Dad most recently introduced ("my son is Tom" -> "Tom")."""
     for msg in reversed(history[-5:]):
         if msg.get("role") != "user":
             continue
@@ -809,29 +1038,30 @@ def _infer_possessive_relation(history: list[dict]) -> str | None:
             flags=re.IGNORECASE,
         )
         if match:
-            relation = match.group(1).lower()
-            return f"my {relation}"
+            return match.group(2)
     return None
 
 
-@router.post("/api/ai/respond")
-def ai_respond(body: AiRequest):
-    """Main conversational endpoint: handles memories, identity capture, and returns a reply."""
-    prompt = body.text.strip()
-    if not prompt:
-        raise HTTPException(status_code=400, detail="text is required")
+def _recent_history(now: datetime) -> list[dict]:
+    return history_manager.recent(now)
 
+
+def _local_reply(prompt: str, history: list[dict]) -> dict | None:
+    """Answer identity captures, pronunciations and the day summary without the LLM."""
     lowered = prompt.lower()
-    now = datetime.utcnow()
-    since = (now - timedelta(days=1)).isoformat(timespec="seconds")
-    history = list_ai_messages_since(since)
     if "family" in lowered:
-        memories = list_ai_memories(limit=200)
-        return {"text": _family_summary(memories)}
+        return {"text": people_profile.family_text()}
     if lowered.startswith("remember "):
         memory_text = prompt[len("remember ") :].strip()
         if memory_text:
-            add_ai_memory(memory_text)
+            # "remember Tom is my son" is an identity fact, not a free-text memory.
+            family = [
+                (name, rel) for name, rel in parse_family_memory(memory_text) if name[:1].isupper()
+            ]
+            for name, rel in family:
+                add_relationship(name, rel)
+            if not family:
+                add_ai_memory(memory_text)
             return {"text": "Got it. I'll remember that."}
 
     identity_match = re.search(
@@ -842,7 +1072,17 @@ def ai_respond(body: AiRequest):
     if identity_match:
         name = identity_match.group(1)
         relation = identity_match.group(2)
-        add_ai_memory(f"{name} is my {relation}.")
+        add_relationship(name, relation)
+        return {"text": "Got it. I'll remember that."}
+
+    # "my son is Tom": the name must be capitalised so "my son is ill" is not captured.
+    family_match = re.search(
+        r"(?i:\bmy\s+(son|daughter|wife|husband|dad|father|mum|mom|mother|sister|brother)\s+is)"
+        r"\s+([A-Z][\w'-]*)\b",
+        prompt,
+    )
+    if family_match:
+        add_relationship(family_match.group(2), family_match.group(1).lower())
         return {"text": "Got it. I'll remember that."}
 
     relation_match = re.search(
@@ -855,11 +1095,11 @@ def ai_respond(body: AiRequest):
         rel = relation_match.group(2).lower()
         name = relation_match.group(3)
         if owner == "my":
-            add_ai_memory(f"{name} is my {rel}.")
+            add_relationship(name, rel)
             return {"text": "Got it. I'll remember that."}
         possessive = _infer_possessive_relation(history)
         if possessive:
-            add_ai_memory(f"{name} is {possessive}'s {rel}.")
+            add_relationship(name, rel, possessive)
             return {"text": "Got it. I'll remember that."}
 
     possessive_pet = re.search(
@@ -871,7 +1111,7 @@ def ai_respond(body: AiRequest):
         owner = possessive_pet.group(1)
         pet = possessive_pet.group(2).lower()
         name = possessive_pet.group(3)
-        add_ai_memory(f"{name} is {owner}'s {pet}.")
+        add_relationship(name, pet, owner)
         return {"text": "Got it. I'll remember that."}
 
     shared_condition = re.search(
@@ -938,77 +1178,26 @@ def ai_respond(body: AiRequest):
             "todays tasks",
         )
     ):
-        today = datetime.now(TZ).date().isoformat()
-        events = list_events_for_date(today)
-        tasks = list_open_tasks()
-        workday = get_work_day(today)
-        alerts = [
-            r
-            for r in list_active_reminders()
-            if not r["reminder_key"].startswith("event:")
-            and r["reminder_key"]
-            not in {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
-        ]
-        alerts_by_label: dict[str, dict] = {}
-        for alert in alerts:
-            label = alert["label"].strip()
-            if label not in alerts_by_label:
-                alerts_by_label[label] = alert
-                continue
-            # Keep the earliest scheduled time for summary.
-            if alert["scheduled_hhmm"] < alerts_by_label[label]["scheduled_hhmm"]:
-                alerts_by_label[label] = alert
-        alerts = list(alerts_by_label.values())
-        event_lines = []
-        if workday and workday.get("is_work"):
-            work_start = _natural_time(workday.get("start_hhmm") or "08:00")
-            work_end = _natural_time(workday.get("end_hhmm") or "16:30")
-            event_lines.append(f"{work_start} until {work_end} — Work")
-        for e in events:
-            if e["all_day"]:
-                when = "all day"
-            elif e["start_hhmm"] and e["end_hhmm"]:
-                start = _natural_time(e["start_hhmm"])
-                end = _natural_time(e["end_hhmm"])
-                when = f"{start} until {end}"
-            else:
-                when = _natural_time(e["start_hhmm"]) or "time TBD"
-            event_lines.append(f"{when} — {e['title']}")
-        task_lines = [t["title"] for t in tasks if t.get("status") == "todo"]
-        events_text = ", ".join(event_lines) if event_lines else "none"
-        tasks_text = ", ".join(task_lines) if task_lines else "none"
-        alert_lines = [
-            f"{a['label']} ({_natural_time(a['scheduled_hhmm'])})" for a in alerts
-        ]
-        alerts_text = ", ".join(alert_lines) if alert_lines else "none"
-        summary = (
-            f"Today: Events: {events_text}. "
-            f"Tasks: {tasks_text}. "
-            f"Alerts: {alerts_text}."
-        )
-        return {"text": summary}
+        text = day_summary.get()["text"]
+        reply = {"text": text}
+        audio_url = briefing_service.audio_url(text)
+        if audio_url:
+            reply["audio_url"] = audio_url
+        return reply
+    return None
 
-    client = get_client()
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    memory_model = os.getenv("OPENAI_MEMORY_MODEL", model)
-    embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+
+def _build_messages(
+    client: GuardedOpenAI, prompt: str, history: list[dict], embedding_model: str
+) -> list[dict]:
+    """System prompt + known people + relevant memories + budgeted chat history + the new prompt."""
     top_k = int(os.getenv("AI_MEMORY_TOP_K", "8"))
     memories = []
-    memories_with_embeddings = list_ai_memories_with_embeddings()
     selected_memory_ids = []
-    if memories_with_embeddings:
+    if count_indexed_ai_memories():
         try:
             prompt_embedding = _embed_text(client, prompt, embedding_model)
-            scored = []
-            for memory in memories_with_embeddings:
-                try:
-                    emb = json.loads(memory["embedding"])
-                except Exception:
-                    continue
-                score = _cosine_similarity(prompt_embedding, emb)
-                scored.append((score, memory))
-            scored.sort(key=lambda item: item[0], reverse=True)
-            memories = [m for _, m in scored[:top_k]]
+            memories = search_ai_memories(prompt_embedding, top_k)
             selected_memory_ids = [m["id"] for m in memories]
         except Exception:
             memories = []
@@ -1024,11 +1213,45 @@ def ai_respond(body: AiRequest):
     )
 
     messages = [{"role": "system", "content": system_prompt}]
+    people = people_profile.prompt_block()
+    if people:
+        messages.append({"role": "system", "content": people})
     if memories:
         memory_lines = "\n".join(f"- {m['summary']}" for m in memories)
         messages.append({"role": "system", "content": f"Profile memory:\n{memory_lines}"})
-    messages.extend({"role": m["role"], "content": m["content"]} for m in history)
+    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    summary, turns = history_manager.context(
+        history,
+        client,
+        os.getenv("AI_HISTORY_SUMMARY_MODEL", os.getenv("OPENAI_MEMORY_MODEL", model)),
+        token_budget=int(os.getenv("AI_HISTORY_TOKEN_BUDGET", "1500")),
+        keep_turns=int(os.getenv("AI_HISTORY_KEEP_TURNS", "12")),
+    )
+    if summary:
+        messages.append({"role": "system", "content": f"Earlier in this conversation:\n{summary}"})
+    messages.extend(turns)
     messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+@router.post("/api/ai/respond")
+def ai_respond(body: AiRequest):
+    """Main conversational endpoint: handles memories, identity capture, and returns a reply."""
+    prompt = body.text.strip()
+    if not prompt:
+        raise HTTPException(status_code=400, detail="text is required")
+
+    now = datetime.utcnow()
+    history = _recent_history(now)
+    local = _local_reply(prompt, history)
+    if local is not None:
+        return local
+
+    client = get_client()
+    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    memory_model = os.getenv("OPENAI_MEMORY_MODEL", model)
+    embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    messages = _build_messages(client, prompt, history, embedding_model)
 
     try:
         response = client.responses.create(
@@ -1036,6 +1259,8 @@ def ai_respond(body: AiRequest):
             input=messages,
             store=False,
         )
+    except CircuitOpenError as exc:
+        raise HTTPException(status_code=503, detail="AI temporarily unavailable") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"AI failed: {exc}") from exc
 
@@ -1043,43 +1268,128 @@ def ai_respond(body: AiRequest):
     if not output_text:
         raise HTTPException(status_code=500, detail="AI returned empty response")
 
-    add_ai_message("user", prompt, now.isoformat(timespec="seconds"))
-    add_ai_message("assistant", output_text, datetime.utcnow().isoformat(timespec="seconds"))
+    history_manager.append("user", prompt, now.isoformat(timespec="seconds"))
+    history_manager.append("assistant", output_text, datetime.utcnow().isoformat(timespec="seconds"))
 
-    try:
-        memory_prompt = (
-            "Extract long-term memories worth saving about projects, relationships, "
-            "preferences (likes/dislikes), ongoing goals, and identity facts (who people are, "
-            "and how they relate to Dad). Do NOT save schedules, calendar details, workday swaps, "
-            "or pronunciation instructions. Return a JSON array of sentences; short memories "
-            "should be under 50 words. Longer memories can be any length. If none, return []."
+    memory_pipeline.submit(client, prompt, memory_model, embedding_model)
+
+    return {"text": output_text}
+
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace.
+_SENTENCE_END_RE = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "approx"}
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class _SentenceSplitter:
+    """Accumulate streamed text deltas and release whole sentences for TTS."""
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(self._buffer):
+            candidate = self._buffer[start : match.end()].strip()
+            last_word = candidate.rstrip(".!?…\"')]").rsplit(" ", 1)[-1].lower()
+            if len(candidate) < self.min_chars or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/api/ai/respond/stream")
+async def ai_respond_stream(body: AiRequest):
+    """
+    Streaming variant of `/api/ai/respond` (Server-Sent Events): `token` events carry
+    text deltas, `sentence` events carry complete sentences ready for TTS, then `done`
+    (full text) or `error`.
+    """
+    prompt = body.text.strip()
+    if not prompt:
+        raise HTTPException(status_code=400, detail="text is required")
+
+    now = datetime.utcnow()
+    history = await run_in_threadpool(_recent_history, now)
+    local = await run_in_threadpool(_local_reply, prompt, history)
+    if local is not None:
+
+        async def local_events():
+            yield _sse("sentence", {"text": local["text"]})
+            yield _sse("done", local)
+
+        return StreamingResponse(
+            local_events(), media_type="text/event-stream", headers=_SSE_HEADERS
         )
-        memory_resp = client.responses.create(
-            model=memory_model,
-            input=[
-                {"role": "system", "content": memory_prompt},
-                {"role": "user", "content": prompt},
-            ],
-            store=False,
+
+    client = get_client()
+    async_client = get_async_client()
+    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    memory_model = os.getenv("OPENAI_MEMORY_MODEL", model)
+    embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+    messages = await run_in_threadpool(
+        _build_messages, client, prompt, history, embedding_model
+    )
+
+    async def events():
+        splitter = _SentenceSplitter()
+        parts: list[str] = []
+        try:
+            stream = await async_client.responses.create(
+                model=model,
+                input=messages,
+                store=False,
+                stream=True,
+            )
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    yield _sse("token", {"text": event.delta})
+                    for sentence in splitter.feed(event.delta):
+                        yield _sse("sentence", {"text": sentence})
+                elif event.type in {"response.failed", "error"}:
+                    raise RuntimeError(getattr(event, "message", None) or "stream failed")
+        except CircuitOpenError:
+            yield _sse("error", {"detail": "AI temporarily unavailable"})
+            return
+        except Exception as exc:
+            yield _sse("error", {"detail": f"AI failed: {exc}"})
+            return
+        rest = splitter.flush()
+        if rest:
+            yield _sse("sentence", {"text": rest})
+        output_text = "".join(parts)
+        if not output_text:
+            yield _sse("error", {"detail": "AI returned empty response"})
+            return
+        await run_in_threadpool(
+            history_manager.append, "user", prompt, now.isoformat(timespec="seconds")
         )
-        mem_text = memory_resp.output_text or "[]"
-        items = json.loads(mem_text)
-        if isinstance(items, list):
-            for item in items:
-                if isinstance(item, str):
-                    cleaned = item.strip()
-                    if cleaned:
-                        try:
-                            emb = _embed_text(client, cleaned, embedding_model)
-                        except Exception:
-                            emb = None
-                        add_ai_memory(cleaned, embedding=emb)
-            prune_ai_memories("short", 300)
-            prune_ai_memories("long", 200)
-    except Exception:
-        pass
+        await run_in_threadpool(
+            history_manager.append,
+            "assistant",
+            output_text,
+            datetime.utcnow().isoformat(timespec="seconds"),
+        )
+        memory_pipeline.submit(client, prompt, memory_model, embedding_model)
+        yield _sse("done", {"text": output_text})
 
-    return {"text": output_text}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 def _match_by_title(candidates: list[dict], title: str | None, key: str) -> dict | None:
@@ -1095,77 +1405,71 @@ def _match_by_title(candidates: list[dict], title: str | None, key: str) -> dict
     return candidates[0]
 
 
-def _tokenize(text: str) -> list[str]:
-    normalized = text.lower()
-    normalized = normalized.replace("docs", "doctors")
-    normalized = normalized.replace("doc", "doctor")
-    return re.findall(r"[a-z0-9']+", normalized)
+def _add_minutes(hhmm: str, minutes: int) -> str:
+    hh, mm = hhmm.split(":")
+    base = datetime.now(TZ).replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
+    return (base + timedelta(minutes=minutes)).strftime("%H:%M")
 
 
-def _best_match(prompt: str, candidates: list[dict], key: str) -> dict | None:
-    if not candidates:
-        return None
-    prompt_tokens = set(_tokenize(prompt))
-    best = None
-    best_score = 0.0
-    for item in candidates:
-        title = str(item.get(key, ""))
-        title_tokens = set(_tokenize(title))
-        if not title_tokens:
-            continue
-        overlap = prompt_tokens.intersection(title_tokens)
-        score = len(overlap) / max(len(title_tokens), 1)
-        if score > best_score:
-            best_score = score
-            best = item
-    if best_score >= 0.3:
-        return best
-    return None
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_WEEKDAY_NAMES = ("mon", "tues", "wednes", "thurs", "fri", "satur", "sun")
+_DAY_MONTH_RE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+    r"|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})(?:st|nd|rd|th)?\b",
+    re.IGNORECASE,
+)
 
 
-def _best_match_with_score(prompt: str, candidates: list[dict], key: str) -> tuple[dict | None, float]:
-    if not candidates:
-        return None, 0.0
-    prompt_tokens = set(_tokenize(prompt))
-    best = None
-    best_score = 0.0
-    for item in candidates:
-        title = str(item.get(key, ""))
-        title_tokens = set(_tokenize(title))
-        if not title_tokens:
-            continue
-        overlap = prompt_tokens.intersection(title_tokens)
-        score = len(overlap) / max(len(title_tokens), 1)
-        if score > best_score:
-            best_score = score
-            best = item
-    if best_score >= 0.3:
-        return best, best_score
-    return None, 0.0
-
-
-def _rank_matches(prompt: str, candidates: list[dict], key: str) -> list[dict]:
-    prompt_tokens = set(_tokenize(prompt))
-    ranked = []
-    for item in candidates:
-        title = str(item.get(key, ""))
-        title_tokens = set(_tokenize(title))
-        if not title_tokens:
-            continue
-        overlap = prompt_tokens.intersection(title_tokens)
-        score = len(overlap) / max(len(title_tokens), 1)
-        ranked.append({"score": score, "item": item})
-    ranked.sort(key=lambda r: r["score"], reverse=True)
-    return ranked
+def _mentioned_date(text: str, today: date) -> str | None:
+    """The single date a prompt names ("tomorrow", "friday", "Dec 8", ISO), or None."""
+    lowered = text.lower()
+    iso = re.search(r"\b\d{4}-\d{2}-\d{2}\b", lowered)
+    if iso:
+        return iso.group(0)
+    if re.search(r"\btoday\b|\btonight\b", lowered):
+        return today.isoformat()
+    if re.search(r"\btomorrow\b", lowered):
+        return (today + timedelta(days=1)).isoformat()
+    weekday = re.search(r"\b(mon|tues|wednes|thurs|fri|satur|sun)day\b", lowered)
+    if weekday:
+        ahead = (_WEEKDAY_NAMES.index(weekday.group(1)) - today.weekday()) % 7
+        return (today + timedelta(days=ahead)).isoformat()
+    day_month = _DAY_MONTH_RE.search(lowered)
+    if day_month:
+        day_text = day_month.group(1) or day_month.group(4)
+        month = _MONTH_NAMES.index(day_month.group(2) or day_month.group(3)) + 1
+        try:
+            named = date(today.year, month, int(day_text))
+            if named < today:
+                named = date(today.year + 1, month, int(day_text))
+        except ValueError:
+            return None
+        return named.isoformat()
+    return None
 
 
-def _add_minutes(hhmm: str, minutes: int) -> str:
-    hh, mm = hhmm.split(":")
-    base = datetime.now(TZ).replace(hour=int(hh), minute=int(mm), second=0, microsecond=0)
-    return (base + timedelta(minutes=minutes)).strftime("%H:%M")
+def _delete_event(event: dict, prompt: str = "") -> str | None:
+    """
+    Delete an event with its reminders. For a recurring event, a date named in
+    `prompt` only skips that occurrence; returns the skipped date (None if deleted).
+    """
+    today = datetime.now(TZ).date()
+    day = _mentioned_date(prompt, today) if event.get("rrule") else None
+    if day is None:
+        delete_event_reminders(event["id"])
+        delete_event(event["id"])
+        return None
+    add_event_exdate(event["id"], day)
+    # Today's reminder may announce the skipped occurrence; re-plan it for the series.
+    delete_event_reminders(event["id"], today.isoformat())
+    series = get_event(event["id"])
+    if series is not None:
+        create_event_reminders_for_date(today.isoformat(), [series])
+    return day
 
 
-def _reclassify_item(item_type: str, item: dict, target: str) -> dict:
+def _reclassify_item(item_type: str, item: dict, target: str, prompt: str = "") -> dict:
+    """Move an item to `target`; for a recurring event, a date named in `prompt` moves one occurrence."""
     now_dt = datetime.now(TZ)
     today = now_dt.date().isoformat()
 
@@ -1175,13 +1479,13 @@ def _reclassify_item(item_type: str, item: dict, target: str) -> dict:
             if item.get("status") != "done":
                 mark_done(item["id"])
         elif item_type == "event":
-            delete_event_reminders(item["id"])
-            delete_event(item["id"])
+            _delete_event(item, prompt)
         return {"target": "task"}
 
     if target == "reminder":
         if item_type == "event":
-            reminder_date = item["event_date"]
+            occurrence = _mentioned_date(prompt, now_dt.date()) if item.get("rrule") else None
+            reminder_date = occurrence or item["event_date"]
             scheduled_hhmm = item["start_hhmm"] or "09:00"
             label = item["title"]
         else:
@@ -1210,8 +1514,7 @@ def _reclassify_item(item_type: str, item: dict, target: str) -> dict:
             next_fire_at_iso=fire_dt.isoformat(timespec="seconds"),
         )
         if item_type == "event":
-            delete_event_reminders(item["id"])
-            delete_event(item["id"])
+            _delete_event(item, prompt)
         return {"target": "reminder", "date": reminder_date, "time": scheduled_hhmm}
 
     if target == "event":
@@ -1243,6 +1546,29 @@ def _reclassify_item(item_type: str, item: dict, target: str) -> dict:
     return {"target": "none"}
 
 
+@router.get("/api/ai/stats")
+def ai_stats():
+    """Cache and index counters for the AI endpoints."""
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "memory_index": {"size": count_indexed_ai_memories()},
+        "memory_pipeline": memory_pipeline.stats(),
+        "memory_maintenance": maintenance_stats(),
+        "people": people_profile.stats(),
+        "event_expansion": expansion_cache_stats(),
+        "openai": client_stats(),
+        "schedule_parse": _schedule_parse_stats(),
+        "command_routing": _command_routing_stats(),
+        "parse_cache": _parse_cache.stats(),
+        "schedule_speculation": _speculation_summary(),
+        "item_matcher": matcher_stats(),
+        "resolve_snapshot": snapshot_stats(),
+        "history": history_manager.stats(),
+        "day_summary": day_summary.stats(),
+        "briefing": briefing_service.stats(),
+    }
+
+
 @router.post("/api/ai/resolve")
 def ai_resolve(body: ResolveRequest):
     """Detect and apply completion/cancellation intents across tasks, reminders, and events."""
@@ -1250,16 +1576,21 @@ def ai_resolve(body: ResolveRequest):
     if not prompt:
         raise HTTPException(status_code=400, detail="text is required")
 
+    with RequestSnapshot() as snap:
+        return _resolve(prompt, snap)
+
+
+def _resolve(prompt: str, snap: RequestSnapshot) -> dict:
     client = get_client()
     model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     lowered = prompt.lower()
     deleted_events = []
     deleted_reminders = []
     if re.search(r"\b(delete|remove|cancel)\s+it\b", lowered):
-        reminders = list_active_reminders()
+        reminders = snap.reminders.items()
         if not reminders:
-            reminders = list_recent_reminders()
-        completion_tokens = set(_tokenize(prompt))
+            reminders = snap.recent_reminders()
+        completion_tokens = set(tokenize(prompt))
         med_keys = {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
         allow_meds = any(
             t in completion_tokens
@@ -1280,13 +1611,13 @@ def ai_resolve(body: ResolveRequest):
             reminders = [r for r in reminders if r.get("reminder_key") not in med_keys]
         if reminders:
             latest = max(reminders, key=lambda r: r.get("id", 0))
-            delete_active_reminder(latest["id"])
+            snap.write("reminders", delete_active_reminder, latest["id"])
             deleted_reminders.append(latest)
     if re.search(r"\bcancel\s+that\s+(alert|reminder)\b", lowered):
-        reminders = list_active_reminders()
+        reminders = snap.reminders.items()
         if not reminders:
-            reminders = list_recent_reminders()
-        completion_tokens = set(_tokenize(prompt))
+            reminders = snap.recent_reminders()
+        completion_tokens = set(tokenize(prompt))
         med_keys = {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
         allow_meds = any(
             t in completion_tokens
@@ -1307,38 +1638,32 @@ def ai_resolve(body: ResolveRequest):
             reminders = [r for r in reminders if r.get("reminder_key") not in med_keys]
         if reminders:
             latest = max(reminders, key=lambda r: r.get("id", 0))
-            delete_active_reminder(latest["id"])
+            snap.write("reminders", delete_active_reminder, latest["id"])
             deleted_reminders.append(latest)
     if re.search(
         r"\b(cancel|cancelled|canceled|delete|remove|call off|called off|scrap|scratch)\b",
         lowered,
     ) and re.search(r"\b(appointment|event|meeting|doctor|lawyer)\b", lowered):
-        today = datetime.now(TZ).date().isoformat()
-        events = [dict(e) for e in list_events_from_date(today)]
-        matched_events = {}
+        matched_events = {}  # id -> (event, the prompt part naming it)
         parts = [p.strip() for p in re.split(r",|\band\b|\beither\b", prompt) if p.strip()]
         for part in parts:
-            event_match, score = _best_match_with_score(part, events, "title")
+            event_match, score = snap.events.best(part)
             if event_match and score >= 0.3:
-                matched_events[event_match["id"]] = event_match
+                matched_events[event_match["id"]] = (event_match, part)
         if not matched_events:
-            event_match = _best_match(prompt, events, "title")
+            event_match, _ = snap.events.best(prompt)
             if event_match:
-                matched_events[event_match["id"]] = event_match
+                matched_events[event_match["id"]] = (event_match, prompt)
         if matched_events:
-            for event in matched_events.values():
-                delete_event_reminders(event["id"])
-                delete_event(event["id"])
-                deleted_events.append(event)
+            for event, part in matched_events.values():
+                skipped = snap.write(("events", "reminders"), _delete_event, event, part)
+                deleted_events.append({**event, "skipped_date": skipped} if skipped else event)
     if re.search(
         r"\b(cancel|cancelled|canceled|delete|remove|call off|called off|scrap|scratch)\b",
         lowered,
     ) and re.search(r"\b(alert|alerts|reminder|reminders)\b", lowered):
         today = datetime.now(TZ).date().isoformat()
-        reminders = list_active_reminders()
-        if not reminders:
-            reminders = list_recent_reminders()
-        completion_tokens = set(_tokenize(prompt))
+        completion_tokens = set(tokenize(prompt))
         med_keys = {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
         allow_meds = any(
             t in completion_tokens
@@ -1355,18 +1680,20 @@ def ai_resolve(body: ResolveRequest):
                 "lanzoprazole",
             }
         )
-        if not allow_meds:
-            reminders = [r for r in reminders if r.get("reminder_key") not in med_keys]
-        if re.search(r"\b(today|tonight)\b", lowered):
-            reminders = [r for r in reminders if r.get("dose_date") == today]
-        ranked = _rank_matches(prompt, reminders, "label")
+        today_only = re.search(r"\b(today|tonight)\b", lowered) is not None
+
+        def wanted(r: dict) -> bool:
+            if not allow_meds and r.get("reminder_key") in med_keys:
+                return False
+            return not today_only or r.get("dose_date") == today
+
+        if snap.reminders.count():
+            ranked = snap.reminders.rank(prompt, wanted)
+        else:
+            ranked = rank_items(prompt, [r for r in snap.recent_reminders() if wanted(r)], "label")
         matches = [r["item"] for r in ranked if r["score"] >= 0.3]
-        if not matches:
-            reminder_match = _best_match(prompt, reminders, "label")
-            if reminder_match:
-                matches = [reminder_match]
         for reminder in matches:
-            delete_active_reminder(reminder["id"])
+            snap.write("reminders", delete_active_reminder, reminder["id"])
             deleted_reminders.append(reminder)
     list_match = re.search(
         r"\b(i\s+have\s+done|i\s+did|i\s+finished|i\s+completed|i[' ]?ve)\b\s+(.*)",
@@ -1376,17 +1703,16 @@ def ai_resolve(body: ResolveRequest):
         tail = list_match.group(2)
         parts = [p.strip() for p in re.split(r",|\band\b", tail) if p.strip()]
         if len(parts) > 1:
-            tasks = list_open_tasks()
             matched = []
             for part in parts:
-                task_match, score = _best_match_with_score(part, tasks, "title")
+                task_match, score = snap.tasks.best(part)
                 if not task_match or score < 0.3:
                     normalized = _normalize_task_phrase(part)
-                    task_match, score = _best_match_with_score(normalized, tasks, "title")
+                    task_match, score = snap.tasks.best(normalized)
                 if task_match and score < 0.25:
                     task_match = None
                 if task_match:
-                    mark_task_done(task_match["id"])
+                    snap.write("tasks", mark_task_done, task_match["id"])
                     matched.append(task_match["title"])
             if matched:
                 return {
@@ -1398,7 +1724,7 @@ def ai_resolve(body: ResolveRequest):
     if re.search(r"\ball+(\s+my)?\s+tasks\b", lowered) and re.search(
         r"\b(mark|complete|completed|finish|finished|done)\b", lowered
     ):
-        count = mark_all_tasks_done()
+        count = snap.write("tasks", mark_all_tasks_done)
         response = {"ok": True, "action": "complete", "target": "task", "count": count}
         if deleted_events:
             response["events_deleted"] = deleted_events
@@ -1418,24 +1744,20 @@ def ai_resolve(body: ResolveRequest):
         else:
             response["target"] = "reminder"
         return response
+    snap.release()  # don't hold the read transaction across the LLM call
     parsed = _parse_resolve(client, prompt, model)
     if not parsed or parsed.action == "none":
         completion_words = {"done", "did", "finished", "completed", "called", "took", "taken"}
-        if any(word in _tokenize(prompt) for word in completion_words):
-            tasks = list_open_tasks()
-            reminders = list_active_reminders()
-            today = datetime.now(TZ).date().isoformat()
-            events = [dict(e) for e in list_events_from_date(today)]
-
-            task_match = _best_match(prompt, tasks, "title")
-            reminder_match = _best_match(prompt, reminders, "label")
+        if any(word in tokenize(prompt) for word in completion_words):
+            task_match, _ = snap.tasks.best(prompt)
+            reminder_match, _ = snap.reminders.best(prompt)
             if not reminder_match:
-                reminder_match = _best_match(prompt, list_recent_reminders(), "label")
-            event_match = _best_match(prompt, events, "title")
+                reminder_match, _ = best_item(prompt, snap.recent_reminders(), "label")
+            event_match, _ = snap.events.best(prompt)
 
             if reminder_match:
                 if reminder_match.get("status") != "done":
-                    mark_done(reminder_match["id"])
+                    snap.write("reminders", mark_done, reminder_match["id"])
                 return {
                     "ok": True,
                     "action": "complete",
@@ -1443,7 +1765,7 @@ def ai_resolve(body: ResolveRequest):
                     "reminder": reminder_match,
                 }
             if task_match:
-                mark_task_done(task_match["id"])
+                snap.write("tasks", mark_task_done, task_match["id"])
                 return {
                     "ok": True,
                     "action": "complete",
@@ -1451,8 +1773,9 @@ def ai_resolve(body: ResolveRequest):
                     "task": task_match,
                 }
             if event_match:
-                delete_event_reminders(event_match["id"])
-                delete_event(event_match["id"])
+                skipped = snap.write(("events", "reminders"), _delete_event, event_match, prompt)
+                if skipped:
+                    event_match = {**event_match, "skipped_date": skipped}
                 return {
                     "ok": True,
                     "action": "delete",
@@ -1462,13 +1785,7 @@ def ai_resolve(body: ResolveRequest):
         return {"ok": False, "message": "No completion intent detected."}
 
     # Match across tasks + reminders + events regardless of model target.
-    tasks = list_open_tasks()
-    reminders = list_active_reminders()
-    reminders_recent = list_recent_reminders()
-    today = datetime.now(TZ).date().isoformat()
-    events = [dict(e) for e in list_events_from_date(today)]
-
-    completion_tokens = set(_tokenize(prompt))
+    completion_tokens = set(tokenize(prompt))
     med_keys = {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
     allow_meds = any(
         t in completion_tokens
@@ -1485,32 +1802,30 @@ def ai_resolve(body: ResolveRequest):
             "lanzoprazole",
         }
     )
-    reminders_filtered = [
-        r for r in reminders if allow_meds or r.get("reminder_key") not in med_keys
-    ]
-    reminders_recent_filtered = [
-        r for r in reminders_recent if allow_meds or r.get("reminder_key") not in med_keys
-    ]
 
-    task_match, task_score = _best_match_with_score(prompt, tasks, "title")
-    reminder_match, reminder_score = _best_match_with_score(prompt, reminders_filtered, "label")
+    def med_allowed(r: dict) -> bool:
+        return allow_meds or r.get("reminder_key") not in med_keys
+
+    reminders_recent_filtered = [r for r in snap.recent_reminders() if med_allowed(r)]
+
+    task_match, task_score = snap.tasks.best(prompt)
+    reminder_match, reminder_score = snap.reminders.best(prompt, med_allowed)
     if not reminder_match:
-        reminder_match, reminder_score = _best_match_with_score(
-            prompt, reminders_recent_filtered, "label"
-        )
-    event_match, event_score = _best_match_with_score(prompt, events, "title")
+        reminder_match, reminder_score = best_item(prompt, reminders_recent_filtered, "label")
+    event_match, event_score = snap.events.best(prompt)
 
     if not task_match:
-        task_match = _match_by_title(tasks, parsed.title, "title")
+        task_match = _match_by_title(snap.tasks.items(), parsed.title, "title")
     if not reminder_match:
-        reminder_match = _match_by_title(reminders_filtered, parsed.title, "label")
+        reminder_match = _match_by_title(snap.reminders.items(med_allowed), parsed.title, "label")
         if not reminder_match:
             reminder_match = _match_by_title(reminders_recent_filtered, parsed.title, "label")
     if not event_match:
-        event_match = _match_by_title(events, parsed.title, "title")
+        event_match = _match_by_title(snap.events.items(), parsed.title, "title")
 
     # If user says meds without specifying which, pick the closest due med.
     if allow_meds:
+        reminders = snap.reminders.items()
         med_hint = None
         if "morning" in completion_tokens:
             med_hint = "morning_meds"
@@ -1532,7 +1847,7 @@ def ai_resolve(body: ResolveRequest):
             )
             if hint:
                 if hint.get("status") != "done":
-                    mark_done(hint["id"])
+                    snap.write("reminders", mark_done, hint["id"])
                 return {
                     "ok": True,
                     "action": "complete",
@@ -1558,7 +1873,7 @@ def ai_resolve(body: ResolveRequest):
             due.sort(key=lambda item: item[0])
             choice = due[0][1]
             if choice.get("status") != "done":
-                mark_done(choice["id"])
+                snap.write("reminders", mark_done, choice["id"])
             return {
                 "ok": True,
                 "action": "complete",
@@ -1575,7 +1890,7 @@ def ai_resolve(body: ResolveRequest):
 
     if best_target == "reminder" and reminder_match:
         if reminder_match.get("status") != "done":
-            mark_done(reminder_match["id"])
+            snap.write("reminders", mark_done, reminder_match["id"])
         return {
             "ok": True,
             "action": "complete",
@@ -1583,11 +1898,12 @@ def ai_resolve(body: ResolveRequest):
             "reminder": reminder_match,
         }
     if best_target == "task" and task_match:
-        mark_task_done(task_match["id"])
+        snap.write("tasks", mark_task_done, task_match["id"])
         return {"ok": True, "action": "complete", "target": "task", "task": task_match}
     if best_target == "event" and event_match:
-        delete_event_reminders(event_match["id"])
-        delete_event(event_match["id"])
+        skipped = snap.write(("events", "reminders"), _delete_event, event_match, prompt)
+        if skipped:
+            event_match = {**event_match, "skipped_date": skipped}
         return {"ok": True, "action": "delete", "target": "event", "event": event_match}
 
     return {"ok": False, "message": "No matching item found."}
@@ -1611,23 +1927,20 @@ def ai_reclassify(body: ReclassifyRequest):
     if not target:
         return {"ok": False, "message": "No target specified."}
 
-    tasks = list_open_tasks()
-    reminders = list_active_reminders()
-    reminders_recent = list_recent_reminders()
-    today = datetime.now(TZ).date().isoformat()
-    events = [dict(e) for e in list_events_from_date(today)]
-
     ranked = []
-    ranked += [{"type": "task", **r} for r in _rank_matches(prompt, tasks, "title")]
-    ranked += [{"type": "reminder", **r} for r in _rank_matches(prompt, reminders, "label")]
-    ranked += [{"type": "reminder", **r} for r in _rank_matches(prompt, reminders_recent, "label")]
-    ranked += [{"type": "event", **r} for r in _rank_matches(prompt, events, "title")]
+    ranked += [{"type": "task", **r} for r in tasks_index.rank(prompt)]
+    ranked += [{"type": "reminder", **r} for r in reminders_index.rank(prompt)]
+    ranked += [
+        {"type": "reminder", **r}
+        for r in rank_items(prompt, list_recent_reminders(), "label")
+    ]
+    ranked += [{"type": "event", **r} for r in events_index.rank(prompt)]
     ranked.sort(key=lambda r: r["score"], reverse=True)
 
     if not ranked or ranked[0]["score"] < 0.3:
         if title:
             # Try direct title match as fallback.
-            for item in tasks:
+            for item in tasks_index.items():
                 if title.lower() in item["title"].lower():
                     return {
                         "ok": True,
@@ -1651,7 +1964,7 @@ def ai_reclassify(body: ReclassifyRequest):
         return {"ok": False, "needs_confirmation": True, "target": target, "options": options}
 
     choice = ranked[0]
-    result = _reclassify_item(choice["type"], choice["item"], target)
+    result = _reclassify_item(choice["type"], choice["item"], target, prompt)
     return {"ok": True, "result": result}
 
 
@@ -1680,10 +1993,9 @@ def ai_priority(body: PriorityRequest):
         else:
             priority = "medium"
 
-    tasks = list_open_tasks()
-    task_match, task_score = _best_match_with_score(prompt, tasks, "title")
+    task_match, task_score = tasks_index.best(prompt)
     if not task_match:
-        task_match = _match_by_title(tasks, parsed.get("title"), "title")
+        task_match = _match_by_title(tasks_index.items(), parsed.get("title"), "title")
 
     if not task_match:
         return {"ok": False, "message": "No matching task found."}
@@ -1704,42 +2016,160 @@ def ai_reclassify_confirm(body: ReclassifyConfirmRequest):
         raise HTTPException(status_code=400, detail="invalid item_type")
 
     if item_type == "task":
-        tasks = list_open_tasks()
-        item = next((t for t in tasks if t["id"] == item_id), None)
+        item = tasks_index.get(item_id)
     elif item_type == "reminder":
-        reminders = list_active_reminders() + list_recent_reminders()
-        item = next((r for r in reminders if r["id"] == item_id), None)
+        item = get_reminder(item_id)
     else:
-        today = datetime.now(TZ).date().isoformat()
-        events = [dict(e) for e in list_events_from_date(today)]
-        item = next((e for e in events if e["id"] == item_id), None)
+        item = events_index.get(item_id)
 
     if not item:
         return {"ok": False, "message": "Item not found."}
 
-    result = _reclassify_item(item_type, item, target)
+    result = _reclassify_item(item_type, item, target, body.text)
     return {"ok": True, "result": result}
 
 
+async def _timed_parse(kind: str, coro):
+    start = time.perf_counter()
+    result = await coro
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _stats_lock:
+        _speculation_stats[f"{kind}_calls"] += 1
+        _speculation_stats[f"{kind}_ms_total"] += elapsed_ms
+    return result
+
+
+async def _parse_schedule_llm(
+    client: AsyncGuardedOpenAI, prompt: str, model: str
+) -> ScheduleResult | None:
+    """
+    `_parse_schedule`, plus `_parse_schedule_mixed` issued concurrently when the prompt
+    looks mixed. The first usable result (two or more items) wins; the other call is cancelled.
+    """
+    if not _looks_mixed(prompt):
+        return await _timed_parse("schedule", _parse_schedule(client, prompt, model))
+
+    schedule_task = asyncio.create_task(
+        _timed_parse("schedule", _parse_schedule(client, prompt, model))
+    )
+    mixed_task = asyncio.create_task(
+        _timed_parse("mixed", _parse_schedule_mixed(client, prompt, model))
+    )
+    parsed: ScheduleResult | None = None
+    mixed_items: list[ScheduleItem] | None = None
+    winner = None
+    pending = {schedule_task, mixed_task}
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if schedule_task in done and not schedule_task.exception():
+                parsed = schedule_task.result()
+                if parsed is not None and parsed.action != "none" and len(parsed.items) > 1:
+                    winner = "schedule"
+            if mixed_task in done and not mixed_task.exception():
+                mixed_items = mixed_task.result()
+                if mixed_items and len(mixed_items) > 1:
+                    winner = "mixed"
+    finally:
+        for task in pending:
+            task.cancel()
+        with _stats_lock:
+            _speculation_stats["runs"] += 1
+            _speculation_stats["cancelled"] += len(pending)
+            if winner:
+                _speculation_stats[f"{winner}_wins"] += 1
+
+    if winner == "mixed":
+        # Same outcome whichever call finished first: the longer item list is used.
+        if parsed is None or parsed.action == "none":
+            return ScheduleResult(action="mixed", title="", items=mixed_items)
+        if len(mixed_items) > len(parsed.items):
+            parsed.items = mixed_items
+        return parsed
+    if parsed is None or parsed.action == "none":
+        return parsed
+    if not parsed.items and mixed_items:
+        parsed.items = mixed_items
+    return parsed
+
+
 @router.post("/api/ai/schedule")
-def ai_schedule(body: ScheduleRequest):
+async def ai_schedule(body: ScheduleRequest):
     """Parse scheduling intent into tasks/events/reminders and persist them."""
     prompt = body.text.strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="text is required")
 
-    today = datetime.now(TZ).date().isoformat()
-    client = get_client()
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    parsed = _parse_schedule(client, prompt, model)
+    parsed = _parse_schedule_local(prompt, datetime.now(TZ))
+    if parsed is not None:
+        _record_schedule_parse(local=True)
+    else:
+        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        start = time.perf_counter()
+        parsed = await _parse_schedule_llm(get_async_client(), prompt, model)
+        _record_schedule_parse(local=False, llm_ms=(time.perf_counter() - start) * 1000)
     if not parsed or parsed.action == "none":
         return {"ok": False, "message": "No scheduling intent detected."}
+    return await run_in_threadpool(_apply_schedule, prompt, parsed)
+
+
+def _adhoc_reminder_row(title: str, reminder_date: str, scheduled_hhmm: str) -> dict:
+    """reminder_active row for a one-off reminder at `scheduled_hhmm` on `reminder_date`."""
+    hh, mm = scheduled_hhmm.split(":")
+    fire_dt = datetime.now(TZ).replace(
+        year=int(reminder_date[:4]),
+        month=int(reminder_date[5:7]),
+        day=int(reminder_date[8:10]),
+        hour=int(hh),
+        minute=int(mm),
+        second=0,
+        microsecond=0,
+    )
+    return {
+        "reminder_key": f"adhoc:{uuid.uuid4()}",
+        "label": title,
+        "speak_text": title,
+        "dose_date": reminder_date,
+        "scheduled_hhmm": scheduled_hhmm,
+        "next_fire_at": fire_dt.isoformat(timespec="seconds"),
+    }
 
+
+def _event_row(
+    title: str,
+    event_date: str,
+    end_date: str | None,
+    start_hhmm: str | None,
+    end_hhmm: str | None,
+    all_day: bool,
+    reminder_preset: str = "standard",
+) -> dict:
+    """Event row; a range to `end_date` (inclusive) becomes one daily series. ValueError on a bad range."""
+    row = {
+        "title": title,
+        "event_date": event_date,
+        "start_hhmm": start_hhmm,
+        "end_hhmm": end_hhmm,
+        "all_day": all_day,
+        "reminder_preset": reminder_preset,
+    }
+    if end_date and end_date != event_date:
+        try:
+            start_dt = datetime.fromisoformat(event_date).date()
+            end_dt = datetime.fromisoformat(end_date).date()
+        except Exception:
+            raise ValueError("invalid date range")
+        if end_dt < start_dt:
+            raise ValueError("end_date must be after date")
+        row["rrule"] = daily_rule()
+        row["until_date"] = end_dt.isoformat()
+    return row
+
+
+def _apply_schedule(prompt: str, parsed: ScheduleResult) -> dict:
+    """Persist a parsed schedule: mixed items, tasks, workdays, a reminder or an event."""
+    today = datetime.now(TZ).date().isoformat()
     lowered = prompt.lower()
-    if not parsed.items and _looks_mixed(prompt):
-        mixed_items = _parse_schedule_mixed(client, prompt, model)
-        if mixed_items:
-            parsed.items = mixed_items
     if parsed.items:
         existing_tasks = {
             _normalize_task_phrase(_strip_date_words((item.title or "").strip())).lower()
@@ -1795,6 +2225,7 @@ def ai_schedule(body: ScheduleRequest):
     if parsed.items and len(parsed.items) > 1:
         created = {"tasks": [], "reminders": [], "events": [], "workdays": []}
         created_task_titles = set()
+        event_rows = []
         for item in parsed.items:
             item_type = item.type
             if item_type == "task":
@@ -1808,13 +2239,11 @@ def ai_schedule(body: ScheduleRequest):
                 if not normalized_title or normalized_title in created_task_titles:
                     continue
                 created_task_titles.add(normalized_title)
-                add_task(title, priority)
                 created["tasks"].append({"title": title, "priority": priority})
             elif item_type == "reminder":
                 title = (item.title or "").strip()
                 if not title:
                     continue
-                today = datetime.now(TZ).date().isoformat()
                 reminder_date = item.date or today
                 if reminder_date < today:
                     continue
@@ -1822,25 +2251,6 @@ def ai_schedule(body: ScheduleRequest):
                 if not scheduled_hhmm:
                     now_dt = datetime.now(TZ) + timedelta(hours=1)
                     scheduled_hhmm = now_dt.strftime("%H:%M")
-                hh, mm = scheduled_hhmm.split(":")
-                fire_dt = datetime.now(TZ).replace(
-                    year=int(reminder_date[:4]),
-                    month=int(reminder_date[5:7]),
-                    day=int(reminder_date[8:10]),
-                    hour=int(hh),
-                    minute=int(mm),
-                    second=0,
-                    microsecond=0,
-                )
-                reminder_key = f"adhoc:{uuid.uuid4()}"
-                create_active_for_date(
-                    reminder_key=reminder_key,
-                    label=title,
-                    speak_text=title,
-                    dose_date=reminder_date,
-                    scheduled_hhmm=scheduled_hhmm,
-                    next_fire_at_iso=fire_dt.isoformat(timespec="seconds"),
-                )
                 created["reminders"].append(
                     {
                         "title": title,
@@ -1859,43 +2269,14 @@ def ai_schedule(body: ScheduleRequest):
                         continue
                     if not end_hhmm:
                         end_hhmm = _add_minutes(start_hhmm, 30)
-                event_ids = []
-                if item.end_date:
-                    try:
-                        start_dt = datetime.fromisoformat(item.date).date()
-                        end_dt = datetime.fromisoformat(item.end_date).date()
-                    except Exception:
-                        continue
-                    if end_dt < start_dt:
-                        continue
-                    cursor = start_dt
-                    while cursor <= end_dt:
-                        event_ids.append(
-                            add_event(
-                                title=item.title or "Event",
-                                event_date=cursor.isoformat(),
-                                start_hhmm=start_hhmm,
-                                end_hhmm=end_hhmm,
-                                all_day=all_day,
-                                reminder_preset="standard"
-                                if item_type == "event"
-                                else "none",
-                            )
-                        )
-                        cursor = cursor + timedelta(days=1)
-                else:
-                    event_ids.append(
-                        add_event(
-                            title=item.title or "Event",
-                            event_date=item.date,
-                            start_hhmm=start_hhmm,
-                            end_hhmm=end_hhmm,
-                            all_day=all_day,
-                            reminder_preset="standard"
-                            if item_type == "event"
-                            else "none",
+                try:
+                    event_rows.append(
+                        _event_row(
+                            item.title or "Event", item.date, item.end_date, start_hhmm, end_hhmm, all_day
                         )
                     )
+                except ValueError:
+                    continue
                 created["events"].append(
                     {
                         "title": item.title or "Event",
@@ -1904,13 +2285,11 @@ def ai_schedule(body: ScheduleRequest):
                         "start_hhmm": start_hhmm,
                         "end_hhmm": end_hhmm,
                         "all_day": all_day,
-                        "ids": event_ids,
                     }
                 )
             elif item_type == "workday":
                 if not item.date or item.is_work is None:
                     continue
-                set_work_day(item.date, item.is_work, item.start_hhmm, item.end_hhmm)
                 created["workdays"].append(
                     {
                         "date": item.date,
@@ -1921,7 +2300,21 @@ def ai_schedule(body: ScheduleRequest):
                 )
 
         if any(created.values()):
-            create_event_reminders_for_date(today)
+            result = apply_schedule_batch(
+                tasks=[(t["title"], t["priority"]) for t in created["tasks"]],
+                events=event_rows,
+                reminders=[
+                    _adhoc_reminder_row(r["title"], r["date"], r["scheduled_hhmm"])
+                    for r in created["reminders"]
+                ],
+                workdays=[
+                    (w["date"], w["is_work"], w["start_hhmm"], w["end_hhmm"])
+                    for w in created["workdays"]
+                ],
+                plan_event_reminders=lambda new_events: plan_event_reminders(new_events, today),
+            )
+            for event, event_id in zip(created["events"], result["event_ids"]):
+                event["ids"] = [event_id]
             return {"ok": True, "action": "mixed", **created}
 
     if parsed.action == "task":
@@ -1931,10 +2324,8 @@ def ai_schedule(body: ScheduleRequest):
         task_titles = [t.strip() for t in parsed.tasks if t.strip()] or [
             parsed.title.strip()
         ]
-        created = []
-        for title in task_titles:
-            add_task(title, priority)
-            created.append({"title": title, "priority": priority})
+        created = [{"title": title, "priority": priority} for title in task_titles]
+        apply_schedule_batch(tasks=[(title, priority) for title in task_titles])
         return {
             "ok": True,
             "action": parsed.action,
@@ -1949,7 +2340,6 @@ def ai_schedule(body: ScheduleRequest):
                 datetime.fromisoformat(entry.date)
             except Exception:
                 raise HTTPException(status_code=400, detail="invalid workday date")
-            set_work_day(entry.date, entry.is_work, entry.start_hhmm, entry.end_hhmm)
             updates.append(
                 {
                     "date": entry.date,
@@ -1960,6 +2350,9 @@ def ai_schedule(body: ScheduleRequest):
             )
         if not updates:
             return {"ok": False, "message": "No workday updates detected."}
+        apply_schedule_batch(
+            workdays=[(u["date"], u["is_work"], u["start_hhmm"], u["end_hhmm"]) for u in updates]
+        )
         return {"ok": True, "action": parsed.action, "workdays": updates}
 
     if parsed.action == "reminder":
@@ -1981,24 +2374,8 @@ def ai_schedule(body: ScheduleRequest):
         if not scheduled_hhmm:
             now_dt = datetime.now(TZ) + timedelta(hours=1)
             scheduled_hhmm = now_dt.strftime("%H:%M")
-        hh, mm = scheduled_hhmm.split(":")
-        fire_dt = datetime.now(TZ).replace(
-            year=int(reminder_date[:4]),
-            month=int(reminder_date[5:7]),
-            day=int(reminder_date[8:10]),
-            hour=int(hh),
-            minute=int(mm),
-            second=0,
-            microsecond=0,
-        )
-        reminder_key = f"adhoc:{uuid.uuid4()}"
-        create_active_for_date(
-            reminder_key=reminder_key,
-            label=parsed.title,
-            speak_text=parsed.title,
-            dose_date=reminder_date,
-            scheduled_hhmm=scheduled_hhmm,
-            next_fire_at_iso=fire_dt.isoformat(timespec="seconds"),
+        apply_schedule_batch(
+            reminders=[_adhoc_reminder_row(parsed.title, reminder_date, scheduled_hhmm)]
         )
         return {
             "ok": True,
@@ -2029,43 +2406,23 @@ def ai_schedule(body: ScheduleRequest):
                 raise HTTPException(status_code=400, detail="invalid date")
             parsed.end_date = (start_dt + timedelta(days=days - 1)).isoformat()
 
-    event_ids = []
-    if parsed.end_date:
-        try:
-            start_dt = datetime.fromisoformat(parsed.date).date()
-            end_dt = datetime.fromisoformat(parsed.end_date).date()
-        except Exception:
-            raise HTTPException(status_code=400, detail="invalid date range")
-        if end_dt < start_dt:
-            raise HTTPException(status_code=400, detail="end_date must be after date")
-        cursor = start_dt
-        while cursor <= end_dt:
-            event_ids.append(
-                add_event(
-                    title=parsed.title,
-                    event_date=cursor.isoformat(),
-                    start_hhmm=parsed.start_hhmm,
-                    end_hhmm=parsed.end_hhmm,
-                    all_day=parsed.all_day,
-                    reminder_preset=reminder_preset,
-                )
-            )
-            cursor = cursor + timedelta(days=1)
-    else:
-        event_ids.append(
-            add_event(
-                title=parsed.title,
-                event_date=parsed.date,
-                start_hhmm=parsed.start_hhmm,
-                end_hhmm=parsed.end_hhmm,
-                all_day=parsed.all_day,
-                reminder_preset=reminder_preset,
-            )
+    try:
+        row = _event_row(
+            parsed.title,
+            parsed.date,
+            parsed.end_date,
+            parsed.start_hhmm,
+            parsed.end_hhmm,
+            parsed.all_day,
+            reminder_preset,
         )
-
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     today = datetime.now(TZ).date().isoformat()
-    if parsed.date >= today or (parsed.end_date and parsed.end_date >= today):
-        create_event_reminders_for_date(today)
+    event_ids = apply_schedule_batch(
+        events=[row],
+        plan_event_reminders=lambda new_events: plan_event_reminders(new_events, today),
+    )["event_ids"]
 
     return {
         "ok": True,
@@ -2074,3 +2431,55 @@ def ai_schedule(body: ScheduleRequest):
         "action": parsed.action,
         "event": parsed.model_dump(),
     }
+
+
+@router.post("/api/ai/command")
+async def ai_command(body: AiRequest):
+    """Single voice entry point: classify the intent locally (LLM if unsure) and dispatch."""
+    prompt = body.text.strip()
+    if not prompt:
+        raise HTTPException(status_code=400, detail="text is required")
+
+    # Off the event loop: the first call trains the model if startup warming has not finished.
+    classifier = await run_in_threadpool(get_intent_classifier)
+    intent, confidence, _ = classifier.predict(prompt)
+    via = "local"
+    threshold = float(os.getenv("AI_INTENT_THRESHOLD", "0.55"))
+    if intent in _DESTRUCTIVE_INTENTS:
+        threshold = max(threshold, float(os.getenv("AI_INTENT_ACTION_THRESHOLD", "0.8")))
+    if confidence < threshold:
+        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        llm_intent = await run_in_threadpool(_parse_intent, get_client(), prompt, model)
+        if llm_intent:
+            intent, via = llm_intent, "llm"
+    with _stats_lock:
+        _command_stats[via] += 1
+        _command_stats["by_intent"][intent] += 1
+
+    if intent == "schedule":
+        result = await ai_schedule(ScheduleRequest(text=prompt))
+    elif intent == "resolve":
+        result = await run_in_threadpool(ai_resolve, ResolveRequest(text=prompt))
+    elif intent == "reclassify":
+        result = await run_in_threadpool(ai_reclassify, ReclassifyRequest(text=prompt))
+    elif intent == "priority":
+        result = await run_in_threadpool(ai_priority, PriorityRequest(text=prompt))
+    else:
+        result = await run_in_threadpool(ai_respond, AiRequest(text=prompt))
+    # A handler that found nothing to act on means the route was wrong: answer instead.
+    if (
+        intent != "respond"
+        and isinstance(result, dict)
+        and result.get("ok") is False
+        and not result.get("needs_confirmation")
+    ):
+        with _stats_lock:
+            _command_stats["fallbacks"] += 1
+        intent = "respond"
+        result = await run_in_threadpool(ai_respond, AiRequest(text=prompt))
+    return {
+        "intent": intent,
+        "confidence": round(confidence, 3),
+        "via": via,
+        "result": result,
+    }
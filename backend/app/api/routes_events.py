@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from backend.app.db.event_queries import add_event, list_events_for_date
+from backend.app.db.recurrence import parse_rrule
 from backend.app.services.event_reminder_service import create_event_reminders_for_date
 
 router = APIRouter()
@@ -18,14 +19,22 @@ class NewEvent(BaseModel):
     end_hhmm: str | None = None  # HH:MM
     all_day: bool = False
     reminder_preset: str | None = "none"
+    rrule: str | None = None  # e.g. FREQ=WEEKLY;BYDAY=MO,WE
+    until_date: str | None = None  # YYYY-MM-DD, last possible occurrence
+    exdates: list[str] = []  # YYYY-MM-DD occurrences to skip
 
 @router.post("/api/events")
 def create_event(body: NewEvent):
-    """Create an event (all-day or timed) and schedule reminders if applicable."""
+    """Create an event (all-day or timed, optionally recurring) and schedule reminders if applicable."""
     preset = body.reminder_preset or "none"
     if not body.all_day:
         if not body.start_hhmm or not body.end_hhmm:
             raise HTTPException(status_code=400, detail="start_hhmm and end_hhmm required")
+    if body.rrule:
+        try:
+            parse_rrule(body.rrule)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"invalid rrule: {exc}")
     event_id = add_event(
         title=body.title,
         event_date=body.event_date,
@@ -33,16 +42,19 @@ def create_event(body: NewEvent):
         end_hhmm=body.end_hhmm,
         all_day=body.all_day,
         reminder_preset=preset,
+        rrule=body.rrule,
+        until_date=body.until_date,
+        exdates=",".join(body.exdates) or None,
     )
 
     today = datetime.now(TZ).date().isoformat()
-    if body.event_date >= today:
+    if body.event_date >= today or (body.rrule and (body.until_date or today) >= today):
         create_event_reminders_for_date(today)
 
     return {"ok": True, "id": event_id}
 
 @router.get("/api/events")
 def list_events(date: str):
-    """List events for a specific date (YYYY-MM-DD)."""
+    """List events for a specific date (YYYY-MM-DD), including recurring occurrences."""
     events = list_events_for_date(date)
     return {"date": date, "events": [dict(e) for e in events]}
@@ -0,0 +1,23 @@
+"""Full-text search across tasks, events, reminders and memories."""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from fastapi import APIRouter, HTTPException
+
+from backend.app.db.search_queries import SEARCH_KINDS, search_items
+
+router = APIRouter()
+TZ = ZoneInfo("Europe/London")
+
+@router.get("/api/search")
+def search(q: str, types: str | None = None, limit: int = 20, include_done: bool = False):
+    """BM25-ranked matches for `q`; `types` is a comma list of task/event/reminder/memory."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q is required")
+    kinds = [t.strip() for t in types.split(",") if t.strip()] if types else list(SEARCH_KINDS)
+    unknown = [k for k in kinds if k not in SEARCH_KINDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown types: {', '.join(unknown)}")
+    today = datetime.now(TZ).date().isoformat()
+    results = search_items(q, kinds, max(1, min(limit, 100)), include_done, today)
+    return {"query": q, "results": results}
@@ -1,56 +1,104 @@
-"""Speech-to-text upload endpoint backed by faster-whisper."""
+"""Speech-to-text upload endpoints backed by faster-whisper."""
 
 import asyncio
-import mimetypes
 import os
-import tempfile
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
+from typing import AsyncIterator
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
 
-from backend.app.services.speech_to_text import STTService
+from backend.app.core.config import settings
+from backend.app.services.speech_to_text import (
+    STTFormatError,
+    STTLimitError,
+    STTResult,
+    STTService,
+    raw_pcm_dtype,
+)
+from backend.app.services.stt_cache import STTResultCache
 
 router = APIRouter()
 
+# Uploads are read and piped to the decoder in chunks of this size.
+STT_CHUNK_BYTES = 64 * 1024
+
+# Retried uploads of the same audio reuse the earlier transcription
+_stt_cache = STTResultCache(
+    cache_dir=settings.stt_cache_dir if os.getenv("STT_CACHE_DISK", "1") == "1" else None,
+    ttl_s=float(os.getenv("STT_CACHE_TTL_SECONDS", "600")),
+    max_entries=int(os.getenv("STT_CACHE_MAX_ENTRIES", "64")),
+)
+
 # Single shared model instance to avoid reloading between requests
 _stt_service = STTService(
     model_size=os.getenv("WHISPER_MODEL", "small.en"),
     device=os.getenv("WHISPER_DEVICE", "cpu"),
     compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
     default_language=os.getenv("WHISPER_LANGUAGE", "en"),
+    cpu_threads=int(os.getenv("WHISPER_CPU_THREADS", "0")),
+    long_audio_s=float(os.getenv("WHISPER_LONG_AUDIO_SECONDS", "45")),
+    batch_size=int(os.getenv("WHISPER_BATCH_SIZE", "8")),
+    max_upload_bytes=int(os.getenv("STT_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024))),
+    max_duration_s=float(os.getenv("STT_MAX_DURATION_SECONDS", "300")),
+    cache=_stt_cache,
 )
 
 
-@router.post("/api/stt")
-async def transcribe_audio(
-    background_tasks: BackgroundTasks, file: UploadFile = File(...)
-):
-    """Accept an audio upload, transcribe to text + segments, and return metadata."""
-    if not file:
-        raise HTTPException(status_code=400, detail="audio file is required")
+def _check_declared_size(size: int | None) -> None:
+    """Reject uploads whose declared size is already over the cap."""
+    limit = _stt_service.max_upload_bytes
+    if size is not None and limit is not None and size > limit:
+        raise HTTPException(status_code=413, detail=f"upload larger than {limit} bytes")
 
-    guessed_ext = mimetypes.guess_extension(file.content_type or "") or ".bin"
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=guessed_ext)
-    tmp_path = tmp.name
-    try:
-        contents = await file.read()
-        if not contents:
-            raise HTTPException(status_code=400, detail="empty audio upload")
-        tmp.write(contents)
-        tmp.close()
 
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(
-            None, lambda: _stt_service.transcribe_file(tmp_path)
-        )
+async def _transcribe_chunks(
+    chunks: AsyncIterator[bytes], content_type: str | None
+) -> STTResult:
+    """Transcribe an upload from its chunks, picking the raw PCM or ffmpeg path."""
+    try:
+        dtype = raw_pcm_dtype(content_type)
+        if dtype is not None:
+            return await _transcribe_pcm_chunks(chunks, dtype)
+        return await _transcribe_stream_chunks(chunks)
     except HTTPException:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
         raise
+    except STTLimitError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except STTFormatError as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - runtime safety
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
         raise HTTPException(status_code=500, detail=f"transcription failed: {exc}") from exc
 
-    background_tasks.add_task(os.remove, tmp_path)
+
+async def _transcribe_pcm_chunks(chunks: AsyncIterator[bytes], dtype) -> STTResult:
+    """Collect a raw PCM body (capped) and hand the samples straight to the model."""
+    limit = _stt_service.max_upload_bytes
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if limit is not None and len(body) > limit:
+            raise STTLimitError(f"upload larger than {limit} bytes")
+    if not body:
+        raise HTTPException(status_code=400, detail="empty audio upload")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: _stt_service.transcribe_pcm(body, dtype)
+    )
+
+
+async def _transcribe_stream_chunks(chunks: AsyncIterator[bytes]) -> STTResult:
+    """Feed upload chunks into an STT stream as they arrive, then transcribe."""
+    loop = asyncio.get_running_loop()
+    stream = await loop.run_in_executor(None, _stt_service.open_stream)
+    try:
+        async for chunk in chunks:
+            await loop.run_in_executor(None, stream.write, chunk)
+        if stream.bytes_received == 0:
+            raise HTTPException(status_code=400, detail="empty audio upload")
+        return await loop.run_in_executor(None, stream.finish)
+    finally:
+        await loop.run_in_executor(None, stream.close)
+
+
+def _result_payload(result: STTResult) -> dict:
     return {
         "text": result.text,
         "language": result.language,
@@ -58,3 +106,38 @@ async def transcribe_audio(
             {"start": s.start, "end": s.end, "text": s.text} for s in result.segments
         ],
     }
+
+
+@router.post("/api/stt")
+async def transcribe_audio(file: UploadFile = File(...)):
+    """Accept a multipart audio upload, transcribe to text + segments, and return metadata."""
+    if not file:
+        raise HTTPException(status_code=400, detail="audio file is required")
+    _check_declared_size(file.size)
+
+    async def chunks():
+        while True:
+            chunk = await file.read(STT_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+
+    result = await _transcribe_chunks(chunks(), file.content_type)
+    return _result_payload(result)
+
+
+@router.post("/api/stt/raw")
+async def transcribe_raw_audio(request: Request):
+    """
+    Accept the audio as the raw request body. Containers (webm/ogg/wav/...) are
+    decoded while the body is still arriving; `audio/L16;rate=16000` and
+    `audio/x-float32;rate=16000` mono samples go straight to the model.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        _check_declared_size(int(content_length))
+
+    result = await _transcribe_chunks(
+        request.stream(), request.headers.get("content-type")
+    )
+    return _result_payload(result)
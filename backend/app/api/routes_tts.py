@@ -5,6 +5,7 @@ import tempfile
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from backend.app.services.briefing_service import briefing_service
 from backend.app.services.voice_service import synthesize_blocking
 
 router = APIRouter()
@@ -33,3 +34,23 @@ def tts_speak(payload: TtsRequest, background_tasks: BackgroundTasks):
 
     background_tasks.add_task(os.remove, tmp.name)
     return FileResponse(tmp.name, media_type="audio/ogg", filename="speech.ogg")
+
+
+@router.get("/api/tts/briefing")
+def tts_briefing(v: str | None = None):
+    """
+    Today's summary as OGG, pre-rendered in the background (rendered now if stale).
+    `v` pins the text hash from `audio_url`; a version that is no longer on disk is a 404.
+    """
+    path = briefing_service.audio_path(v)
+    if path is None:
+        if v is not None:
+            raise HTTPException(status_code=404, detail="Briefing version not found")
+        raise HTTPException(status_code=500, detail="TTS failed")
+    return FileResponse(
+        path,
+        media_type="audio/ogg",
+        filename="briefing.ogg",
+        # Only a versioned URL names immutable audio.
+        headers={"Cache-Control": "private, max-age=86400" if v else "no-cache"},
+    )
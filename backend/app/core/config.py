@@ -6,5 +6,7 @@ from pathlib import Path
 class Settings(BaseModel):
     """Static defaults for the MVP; extend with env vars as the app grows."""
     db_path: str = str(Path(__file__).resolve().parents[2] / "data" / "pa.db")
+    stt_cache_dir: str = str(Path(__file__).resolve().parents[2] / "data" / "stt_cache")
+    briefing_dir: str = str(Path(__file__).resolve().parents[2] / "data" / "briefing")
 
 settings = Settings()
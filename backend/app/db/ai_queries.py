@@ -1,55 +1,86 @@
 """AI message + memory persistence helpers (chat history and embeddings)."""
 
-import json
+import threading
 from datetime import datetime
+import numpy as np
 from backend.app.db.conn import get_conn
+from backend.app.db.memory_index import encode_embedding, memory_index
 
 SHORT_MAX_WORDS = 50
 
 
-def add_ai_message(role: str, content: str, created_at: str | None = None) -> None:
-    """Append a chat message (user/assistant)."""
+def add_ai_message(role: str, content: str, created_at: str | None = None) -> int:
+    """Append a chat message (user/assistant); returns its id."""
     ts = created_at or datetime.utcnow().isoformat(timespec="seconds")
     with get_conn() as conn:
-        conn.execute(
+        cur = conn.execute(
             "INSERT INTO ai_messages (role, content, created_at) VALUES (?, ?, ?)",
             (role, content, ts),
         )
         conn.commit()
+    return int(cur.lastrowid)
 
 
 def list_ai_messages_since(since_iso: str) -> list[dict]:
     """List chat messages since a timestamp (inclusive)."""
     with get_conn() as conn:
         rows = conn.execute(
-            "SELECT role, content, created_at FROM ai_messages "
-            "WHERE created_at >= ? ORDER BY created_at ASC",
+            "SELECT id, role, content, created_at FROM ai_messages "
+            "WHERE created_at >= ? ORDER BY created_at ASC, id ASC",
             (since_iso,),
         ).fetchall()
     return [dict(r) for r in rows]
 
 
+def get_history_summary() -> dict | None:
+    """Return the rolling conversation summary (summary, covered_until, covered_id) if one exists."""
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT summary, covered_until, covered_id FROM ai_history_summary WHERE id = 1"
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def set_history_summary(summary: str, covered_until: str, covered_id: int) -> None:
+    """Replace the rolling conversation summary."""
+    with get_conn() as conn:
+        conn.execute(
+            "INSERT INTO ai_history_summary (id, summary, covered_until, covered_id, updated_at) "
+            "VALUES (1, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET summary = excluded.summary, "
+            "covered_until = excluded.covered_until, covered_id = excluded.covered_id, "
+            "updated_at = excluded.updated_at",
+            (summary, covered_until, covered_id, datetime.utcnow().isoformat(timespec="seconds")),
+        )
+        conn.commit()
+
+
 def add_ai_memory(
     summary: str,
-    embedding: list[float] | None = None,
+    embedding: list[float] | np.ndarray | None = None,
     created_at: str | None = None,
-) -> None:
-    """Insert a memory summary with optional embedding; skips empty strings."""
+) -> int | None:
+    """Insert a memory summary with optional embedding (float32 BLOB); returns the new id."""
     words = summary.split()
     word_count = len(words)
     if word_count == 0:
-        return
+        return None
     kind = "short" if word_count <= SHORT_MAX_WORDS else "long"
     ts = created_at or datetime.utcnow().isoformat(timespec="seconds")
-    embedding_json = json.dumps(embedding) if embedding else None
+    embedding_blob = encode_embedding(embedding) if embedding is not None else None
     with get_conn() as conn:
-        conn.execute(
+        cur = conn.execute(
             "INSERT OR IGNORE INTO ai_memories "
             "(summary, kind, word_count, embedding, created_at) "
             "VALUES (?, ?, ?, ?, ?)",
-            (summary, kind, word_count, embedding_json, ts),
+            (summary, kind, word_count, embedding_blob, ts),
         )
         conn.commit()
+    if cur.rowcount != 1:
+        return None
+    memory_id = int(cur.lastrowid)
+    if embedding is not None:
+        memory_index.add(memory_id, summary, kind, embedding)
+    return memory_id
 
 
 def list_ai_memories(limit: int = 20) -> list[dict]:
@@ -64,7 +95,7 @@ def list_ai_memories(limit: int = 20) -> list[dict]:
 
 
 def list_ai_memories_with_embeddings() -> list[dict]:
-    """List memories that have embeddings (for similarity search)."""
+    """List memories that have embeddings (raw float32 BLOBs), newest first."""
     with get_conn() as conn:
         rows = conn.execute(
             "SELECT id, summary, kind, word_count, embedding, last_used_at, created_at "
@@ -74,32 +105,72 @@ def list_ai_memories_with_embeddings() -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def prune_ai_memories(kind: str, max_count: int) -> None:
-    """Keep only the most-recently-used memories of a kind up to max_count."""
+_OVERFLOW_IDS_SQL = (
+    "SELECT id FROM ai_memories WHERE kind = ? "
+    "ORDER BY COALESCE(last_used_at, created_at) DESC LIMIT -1 OFFSET ?"
+)
+
+
+def prune_ai_memories(kind: str, max_count: int) -> list[int]:
+    """Keep only the most-recently-used memories of a kind up to max_count; returns deleted ids."""
     with get_conn() as conn:
-        rows = conn.execute(
-            "SELECT id FROM ai_memories WHERE kind = ? "
-            "ORDER BY COALESCE(last_used_at, created_at) DESC",
-            (kind,),
-        ).fetchall()
-        if len(rows) <= max_count:
-            return
-        delete_ids = [r["id"] for r in rows[max_count:]]
-        conn.executemany(
-            "DELETE FROM ai_memories WHERE id = ?",
-            [(i,) for i in delete_ids],
-        )
+        conn.execute("BEGIN IMMEDIATE")
+        delete_ids = [r["id"] for r in conn.execute(_OVERFLOW_IDS_SQL, (kind, max_count))]
+        if delete_ids:
+            conn.execute(
+                f"DELETE FROM ai_memories WHERE id IN ({_OVERFLOW_IDS_SQL})", (kind, max_count)
+            )
         conn.commit()
+    memory_index.remove(delete_ids)
+    return delete_ids
+
+
+def search_ai_memories(query_embedding: list[float], limit: int) -> list[dict]:
+    """Top-`limit` memories by cosine similarity, served from the in-memory index."""
+    memory_index.ensure_loaded(list_ai_memories_with_embeddings)
+    return memory_index.search(query_embedding, limit)
+
+
+def count_indexed_ai_memories() -> int:
+    """Number of memories with embeddings available for similarity search."""
+    memory_index.ensure_loaded(list_ai_memories_with_embeddings)
+    return len(memory_index)
+
+
+_touch_lock = threading.Lock()
+_pending_touches: dict[int, str] = {}
+TOUCH_FLUSH_SIZE = 256
 
 
 def touch_ai_memories(memory_ids: list[int]) -> None:
-    """Update last_used_at for the given memory ids."""
+    """Record a last_used_at touch in memory; written by `flush_ai_memory_touches`."""
     if not memory_ids:
         return
     ts = datetime.utcnow().isoformat(timespec="seconds")
+    with _touch_lock:
+        for mem_id in memory_ids:
+            _pending_touches[mem_id] = ts
+        flush = len(_pending_touches) >= TOUCH_FLUSH_SIZE
+    if flush:
+        flush_ai_memory_touches()
+
+
+def flush_ai_memory_touches() -> int:
+    """Write buffered touches in one transaction (one UPDATE per distinct timestamp)."""
+    with _touch_lock:
+        pending = dict(_pending_touches)
+        _pending_touches.clear()
+    if not pending:
+        return 0
+    by_ts: dict[str, list[int]] = {}
+    for mem_id, ts in pending.items():
+        by_ts.setdefault(ts, []).append(mem_id)
     with get_conn() as conn:
-        conn.executemany(
-            "UPDATE ai_memories SET last_used_at = ? WHERE id = ?",
-            [(ts, mem_id) for mem_id in memory_ids],
-        )
+        for ts, ids in by_ts.items():
+            conn.execute(
+                "UPDATE ai_memories SET last_used_at = ? "
+                f"WHERE id IN ({', '.join('?' * len(ids))})",
+                (ts, *ids),
+            )
         conn.commit()
+    return len(pending)
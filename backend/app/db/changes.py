@@ -0,0 +1,42 @@
+"""
+In-process change notifications for the item tables, so caches and indexes built on
+top of them (e.g. the fuzzy item matcher) can update incrementally instead of rescanning.
+"""
+
+import threading
+from typing import Callable
+
+# callback(op, item_id); item_id is None for bulk changes that touch unknown rows.
+ChangeCallback = Callable[[str, int | None], None]
+
+_lock = threading.Lock()
+_subscribers: dict[str, list[ChangeCallback]] = {}
+_versions: dict[str, int] = {}
+
+
+def subscribe(collection: str, callback: ChangeCallback) -> None:
+    """Call `callback(op, item_id)` after every committed write to `collection`."""
+    with _lock:
+        _subscribers.setdefault(collection, []).append(callback)
+
+
+def notify(collection: str, op: str, item_id: int | None = None) -> None:
+    """Record a committed insert/update/delete (or a bulk "reset") on `collection`."""
+    with _lock:
+        _versions[collection] = _versions.get(collection, 0) + 1
+        callbacks = list(_subscribers.get(collection, ()))
+    for callback in callbacks:
+        try:
+            callback(op, item_id)
+        except Exception:
+            pass
+
+
+def version(collection: str) -> int:
+    """Monotonic write counter for `collection` (0 until its first change)."""
+    return _versions.get(collection, 0)
+
+
+def versions() -> dict[str, int]:
+    with _lock:
+        return dict(_versions)
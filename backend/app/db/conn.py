@@ -1,9 +1,14 @@
 """SQLite connection helpers plus lightweight migrations on startup."""
 
+import json
 import sqlite3
+from array import array
+from contextlib import contextmanager
 from pathlib import Path
 from backend.app.core.config import settings
 
+FTS_TABLES = ("tasks_fts", "events_fts", "reminders_fts", "memories_fts")
+
 def get_conn() -> sqlite3.Connection:
     """Return a SQLite connection with Row factory; creates parent dirs if needed."""
     Path(settings.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -11,6 +16,15 @@ def get_conn() -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     return conn
 
+@contextmanager
+def use_conn(conn: sqlite3.Connection | None = None):
+    """Yield `conn` when the caller already holds one (e.g. a request snapshot), else a new one."""
+    if conn is not None:
+        yield conn
+        return
+    with get_conn() as fresh:
+        yield fresh
+
 def init_db() -> None:
     """Apply schema and in-place migrations (idempotent) on startup."""
     schema_path = Path(__file__).with_name("schema.sql")
@@ -38,6 +52,14 @@ def init_db() -> None:
                 "UPDATE events SET end_hhmm = COALESCE(end_hhmm, time(event_time, '+30 minutes')) "
                 "WHERE event_time IS NOT NULL;"
             )
+        for column in ("rrule", "until_date", "exdates"):
+            if column not in event_columns:
+                conn.execute(f"ALTER TABLE events ADD COLUMN {column} TEXT;")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_date ON events (event_date);")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_series ON events (until_date) "
+            "WHERE rrule IS NOT NULL;"
+        )
         workday_columns = [r["name"] for r in conn.execute("PRAGMA table_info(work_days);")]
         if "start_hhmm" not in workday_columns:
             conn.execute("ALTER TABLE work_days ADD COLUMN start_hhmm TEXT;")
@@ -53,13 +75,58 @@ def init_db() -> None:
                 "ALTER TABLE ai_memories ADD COLUMN word_count INTEGER NOT NULL DEFAULT 0;"
             )
         if "embedding" not in memory_columns:
-            conn.execute("ALTER TABLE ai_memories ADD COLUMN embedding TEXT;")
+            conn.execute("ALTER TABLE ai_memories ADD COLUMN embedding BLOB;")
+        # Embeddings used to be stored as JSON text; convert to float32 BLOBs.
+        legacy_embeddings = conn.execute(
+            "SELECT id, embedding FROM ai_memories WHERE typeof(embedding) = 'text';"
+        ).fetchall()
+        if legacy_embeddings:
+            converted = []
+            for row in legacy_embeddings:
+                try:
+                    blob = array("f", json.loads(row["embedding"])).tobytes()
+                except (TypeError, ValueError):
+                    blob = None
+                converted.append((blob, row["id"]))
+            conn.executemany("UPDATE ai_memories SET embedding = ? WHERE id = ?;", converted)
         if "last_used_at" not in memory_columns:
             conn.execute("ALTER TABLE ai_memories ADD COLUMN last_used_at TEXT;")
+        # LRU order used by prune_ai_memories (needs last_used_at, so created after the migration).
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ai_memories_kind_used "
+            "ON ai_memories (kind, COALESCE(last_used_at, created_at));"
+        )
         pronunciation_columns = [
             r["name"] for r in conn.execute("PRAGMA table_info(pronunciations);")
         ]
         if pronunciation_columns:
             if "updated_at" not in pronunciation_columns:
                 conn.execute("ALTER TABLE pronunciations ADD COLUMN updated_at TEXT;")
+        summary_columns = [
+            r["name"] for r in conn.execute("PRAGMA table_info(ai_history_summary);")
+        ]
+        if "covered_id" not in summary_columns:
+            conn.execute(
+                "ALTER TABLE ai_history_summary ADD COLUMN covered_id INTEGER NOT NULL DEFAULT 0;"
+            )
+            conn.execute(
+                "UPDATE ai_history_summary SET covered_id = COALESCE("
+                "(SELECT MAX(id) FROM ai_messages WHERE created_at <= covered_until), 0);"
+            )
         conn.commit()
+        _init_search(conn)
+        conn.commit()
+
+def _init_search(conn: sqlite3.Connection) -> None:
+    """Create the FTS5 search tables + sync triggers, backfilling new ones; no-op without FTS5."""
+    existing = {
+        r["name"]
+        for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    }
+    try:
+        conn.executescript(Path(__file__).with_name("search_schema.sql").read_text())
+    except sqlite3.OperationalError:
+        return
+    for table in FTS_TABLES:
+        if table not in existing:
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild');")
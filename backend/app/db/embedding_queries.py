@@ -0,0 +1,47 @@
+"""Persistent embedding cache helpers (float32 BLOBs keyed by model + text hash)."""
+
+from datetime import datetime
+
+import numpy as np
+
+from backend.app.db.conn import get_conn
+from backend.app.db.memory_index import decode_embedding, encode_embedding
+
+
+def get_cached_embeddings(model: str, text_keys: list[str]) -> dict[str, np.ndarray]:
+    """Return {text_key: embedding} (read-only float32 views) for the keys present."""
+    if not text_keys:
+        return {}
+    placeholders = ",".join("?" for _ in text_keys)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"SELECT text_key, embedding FROM embedding_cache "
+            f"WHERE model = ? AND text_key IN ({placeholders})",
+            (model, *text_keys),
+        ).fetchall()
+    return {r["text_key"]: decode_embedding(r["embedding"]) for r in rows}
+
+
+def put_cached_embeddings(model: str, items: dict[str, np.ndarray]) -> None:
+    """Upsert embeddings for the given text keys."""
+    if not items:
+        return
+    ts = datetime.utcnow().isoformat(timespec="seconds")
+    with get_conn() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (model, text_key, embedding, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(model, key, encode_embedding(emb), ts) for key, emb in items.items()],
+        )
+        conn.commit()
+
+
+def prune_embedding_cache(max_rows: int) -> None:
+    """Keep only the newest `max_rows` cached embeddings."""
+    with get_conn() as conn:
+        conn.execute(
+            "DELETE FROM embedding_cache WHERE rowid NOT IN "
+            "(SELECT rowid FROM embedding_cache ORDER BY created_at DESC LIMIT ?)",
+            (max_rows,),
+        )
+        conn.commit()
@@ -1,7 +1,17 @@
-"""Event storage helpers (create/list/delete)."""
+"""Event storage helpers (create/list/delete); recurring series are expanded on read."""
 
-from datetime import datetime
-from backend.app.db.conn import get_conn
+import sqlite3
+from datetime import date as Date, datetime
+from functools import lru_cache
+from backend.app.db.changes import notify, version
+from backend.app.db.conn import get_conn, use_conn
+from backend.app.db.recurrence import occurs_on, parse_exdates, parse_rrule
+
+EVENT_COLUMNS = (
+    "id, title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset, rrule, until_date, exdates"
+)
+# Series that may still have occurrences on/after a date (bind the date twice).
+_RUNNING_SERIES = "(rrule IS NOT NULL AND (until_date IS NULL OR until_date >= ?))"
 
 def add_event(
     title: str,
@@ -10,13 +20,19 @@ def add_event(
     end_hhmm: str | None,
     all_day: bool,
     reminder_preset: str,
+    rrule: str | None = None,
+    until_date: str | None = None,
+    exdates: str | None = None,
 ) -> int:
-    """Insert an event row and return its id."""
+    """Insert an event row (or a recurring series starting on `event_date`) and return its id."""
+    if rrule:
+        parse_rrule(rrule)
     with get_conn() as conn:
         cur = conn.execute(
             """
-            INSERT INTO events (title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?);
+            INSERT INTO events (title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset,
+                                rrule, until_date, exdates, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             """,
             (
                 title,
@@ -25,41 +41,87 @@ def add_event(
                 end_hhmm,
                 1 if all_day else 0,
                 reminder_preset,
+                rrule or None,
+                until_date if rrule else None,
+                exdates if rrule else None,
                 datetime.now().isoformat(timespec="seconds"),
             ),
         )
         conn.commit()
-        return int(cur.lastrowid)
+    event_id = int(cur.lastrowid)
+    notify("events", "insert", event_id)
+    return event_id
 
-def list_events_for_date(event_date: str):
-    """List events for a specific date ordered by all-day then start time."""
+@lru_cache(maxsize=64)
+def _events_on(event_date: str, events_version: int) -> tuple[dict, ...]:
+    """Expanded events for one date; keyed by the events change version so writes invalidate it."""
     with get_conn() as conn:
-        return conn.execute(
-            """
-            SELECT id, title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset
+        rows = conn.execute(
+            f"""
+            SELECT {EVENT_COLUMNS}
             FROM events
-            WHERE event_date = ?
-            ORDER BY all_day DESC, start_hhmm ASC;
+            WHERE (rrule IS NULL AND event_date = ?)
+               OR (event_date <= ? AND {_RUNNING_SERIES})
             """,
-            (event_date,),
+            (event_date, event_date, event_date),
         ).fetchall()
+    day = Date.fromisoformat(event_date)
+    events = [dict(r, event_date=event_date) for r in rows if occurs_on(r, day)]
+    events.sort(key=lambda e: (-e["all_day"], e["start_hhmm"] or ""))
+    return tuple(events)
 
-def list_events_from_date(event_date: str):
-    """List events from a start date onward ordered by date."""
-    with get_conn() as conn:
+def list_events_for_date(event_date: str) -> list[dict]:
+    """List events (including occurrences of recurring series) for a date, all-day first then by start time."""
+    # Read the version before querying: a write racing the query leaves a stale key behind.
+    return [dict(e) for e in _events_on(event_date, version("events"))]
+
+def expansion_cache_stats() -> dict:
+    info = _events_on.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+def list_events_from_date(event_date: str, conn: sqlite3.Connection | None = None):
+    """List events from a start date onward, plus recurring series still running then, ordered by date."""
+    with use_conn(conn) as conn:
         return conn.execute(
-            """
-            SELECT id, title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset
+            f"""
+            SELECT {EVENT_COLUMNS}
             FROM events
-            WHERE event_date >= ?
+            WHERE event_date >= ? OR {_RUNNING_SERIES}
             ORDER BY event_date ASC;
             """,
-            (event_date,),
+            (event_date, event_date),
         ).fetchall()
 
 
 def delete_event(event_id: int) -> None:
-    """Delete an event by id."""
+    """Delete an event (a whole series for recurring events) by id."""
     with get_conn() as conn:
         conn.execute("DELETE FROM events WHERE id = ?;", (event_id,))
         conn.commit()
+    notify("events", "delete", event_id)
+
+
+def add_event_exdate(event_id: int, exdate: str) -> None:
+    """Skip one occurrence (YYYY-MM-DD) of a recurring event."""
+    with get_conn() as conn:
+        row = conn.execute("SELECT exdates FROM events WHERE id = ?;", (event_id,)).fetchone()
+        if row is None:
+            return
+        exdates = ",".join(sorted(parse_exdates(row["exdates"]) | {exdate}))
+        conn.execute("UPDATE events SET exdates = ? WHERE id = ?;", (exdates, event_id))
+        conn.commit()
+    notify("events", "update", event_id)
+
+
+def get_event(event_id: int, conn: sqlite3.Connection | None = None) -> dict | None:
+    """Fetch one event by id."""
+    with use_conn(conn) as conn:
+        row = conn.execute(
+            f"""
+            SELECT {EVENT_COLUMNS}
+            FROM events
+            WHERE id = ?;
+            """,
+            (event_id,),
+        ).fetchone()
+    return dict(row) if row else None
@@ -0,0 +1,256 @@
+"""
+Approximate nearest-neighbour search for memory embeddings: an IVF (inverted file)
+index with a spherical k-means coarse quantiser, persisted next to `pa.db`.
+
+Search probes only the `nprobe` lists whose centroids are closest to the query, so
+the number of vectors scored grows roughly with N * nprobe / nlist instead of N.
+
+Recall benchmark against exact search:
+  python -m backend.app.db.memory_ann --n 50000 --dim 256 --k 8 --nprobe 4,8,16
+  python -m backend.app.db.memory_ann --from-db --k 8
+"""
+
+import itertools
+import os
+from pathlib import Path
+
+import numpy as np
+
+TRAIN_SAMPLE = 50_000
+ASSIGN_BATCH = 8192
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+class IVFIndex:
+    """Coarse quantiser + inverted lists of memory ids; vectors stay in `MemoryIndex`."""
+
+    def __init__(self, centroids: np.ndarray, nprobe: int):
+        self.centroids = centroids.astype(np.float32)
+        self.nprobe = nprobe
+        self.lists: list[set[int]] = [set() for _ in range(len(centroids))]
+        self._assignment: dict[int, int] = {}
+        self.trained_size = 0
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dim(self) -> int:
+        return self.centroids.shape[1]
+
+    def __len__(self) -> int:
+        return len(self._assignment)
+
+    @classmethod
+    def train(
+        cls,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        nlist: int | None = None,
+        nprobe: int | None = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Fit centroids on unit vectors with spherical k-means and assign every id."""
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = nlist or max(1, int(4 * np.sqrt(n)))
+        nlist = min(nlist, n)
+        nprobe = nprobe or max(1, nlist // 16)
+        sample = vectors
+        if n > TRAIN_SAMPLE:
+            sample = vectors[rng.choice(n, TRAIN_SAMPLE, replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = _nearest(centroids, sample)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters from random points.
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _unit_rows(sums)
+        index = cls(centroids, nprobe)
+        index.add_many(ids, vectors)
+        index.trained_size = n
+        return index
+
+    def add(self, memory_id: int, vector: np.ndarray) -> None:
+        self.remove(memory_id)
+        cell = int(np.argmax(self.centroids @ vector))
+        self.lists[cell].add(memory_id)
+        self._assignment[memory_id] = cell
+
+    def add_many(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        labels = _nearest(self.centroids, vectors)
+        for memory_id, cell in zip(ids.tolist(), labels.tolist()):
+            self.remove(memory_id)
+            self.lists[cell].add(memory_id)
+            self._assignment[memory_id] = cell
+
+    def remove(self, memory_id: int) -> None:
+        cell = self._assignment.pop(memory_id, None)
+        if cell is not None:
+            self.lists[cell].discard(memory_id)
+
+    def candidates(self, query: np.ndarray, nprobe: int | None = None) -> np.ndarray:
+        """Ids in the `nprobe` lists nearest to a unit-length query."""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        scores = self.centroids @ query
+        probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return np.fromiter(
+            itertools.chain.from_iterable(self.lists[c] for c in probe), dtype=np.int64
+        )
+
+    def save(self, path: Path) -> None:
+        """Write centroids + assignments atomically (`.npz`)."""
+        ids = np.fromiter(self._assignment.keys(), dtype=np.int64, count=len(self._assignment))
+        cells = np.fromiter(self._assignment.values(), dtype=np.int32, count=len(self._assignment))
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                ids=ids,
+                cells=cells,
+                params=np.array([self.nprobe, self.trained_size], dtype=np.int64),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex | None":
+        try:
+            with np.load(path) as data:
+                nprobe, trained_size = (int(v) for v in data["params"])
+                index = cls(data["centroids"], nprobe)
+                for memory_id, cell in zip(data["ids"].tolist(), data["cells"].tolist()):
+                    index.lists[cell].add(memory_id)
+                    index._assignment[memory_id] = cell
+        except (OSError, KeyError, ValueError):
+            return None
+        index.trained_size = trained_size
+        return index
+
+    def sync(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Reconcile a loaded index with the current rows (drop stale ids, assign new ones)."""
+        live = set(ids.tolist())
+        for memory_id in [i for i in self._assignment if i not in live]:
+            self.remove(memory_id)
+        missing = np.array([i not in self._assignment for i in ids.tolist()], dtype=bool)
+        if missing.any():
+            self.add_many(ids[missing], vectors[missing])
+
+
+def _nearest(centroids: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """Nearest centroid (max inner product) per row, batched to bound memory."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BATCH):
+        block = vectors[start : start + ASSIGN_BATCH]
+        labels[start : start + ASSIGN_BATCH] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix @ query
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def recall_at_k(
+    index: IVFIndex, ids: np.ndarray, matrix: np.ndarray, queries: np.ndarray, k: int, nprobe: int
+) -> float:
+    """Mean fraction of the exact top-k ids that the IVF search also returns."""
+    row_of = _row_lookup(ids)
+    hits = 0
+    for query in queries:
+        truth = set(ids[exact_top_k(matrix, query, k)].tolist())
+        cand = index.candidates(query, nprobe)
+        if len(cand):
+            found = set(cand[exact_top_k(matrix[row_of[cand]], query, k)].tolist())
+        else:
+            found = set()
+        hits += len(truth & found)
+    return hits / (len(queries) * k)
+
+
+def _row_lookup(ids: np.ndarray) -> np.ndarray:
+    lookup = np.full(int(ids.max()) + 1, -1, dtype=np.int64)
+    lookup[ids] = np.arange(len(ids))
+    return lookup
+
+
+def _synthetic(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(0, clusters, n)] + 0.6 * rng.normal(size=(n, dim))
+    return _unit_rows(points.astype(np.float32))
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="IVF recall@k vs exact search")
+    parser.add_argument("--from-db", action="store_true", help="use ai_memories embeddings")
+    parser.add_argument("--n", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--nprobe", default="1,4,8,16,32")
+    args = parser.parse_args(argv)
+
+    if args.from_db:
+        from backend.app.db.ai_queries import list_ai_memories_with_embeddings
+        from backend.app.db.memory_index import decode_embedding
+
+        rows = list_ai_memories_with_embeddings()
+        if not rows:
+            print("No embedded memories in the database.")
+            return 2
+        dim = len(decode_embedding(rows[0]["embedding"]))
+        rows = [r for r in rows if len(decode_embedding(r["embedding"])) == dim]
+        matrix = _unit_rows(np.stack([decode_embedding(r["embedding"]) for r in rows]))
+        ids = np.array([r["id"] for r in rows], dtype=np.int64)
+    else:
+        matrix = _synthetic(args.n, args.dim, args.clusters, seed=1)
+        ids = np.arange(len(matrix), dtype=np.int64)
+
+    rng = np.random.default_rng(2)
+    queries = matrix[rng.choice(len(matrix), min(args.queries, len(matrix)), replace=False)]
+    queries = _unit_rows(queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32))
+
+    start = time.perf_counter()
+    index = IVFIndex.train(ids, matrix, nlist=args.nlist)
+    print(f"{len(matrix)} vectors, dim {matrix.shape[1]}, nlist {index.nlist}, "
+          f"trained in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for query in queries:
+        exact_top_k(matrix, query, args.k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"exact: {exact_ms:.3f} ms/query")
+
+    row_of = _row_lookup(ids)
+    for nprobe in (int(p) for p in args.nprobe.split(",")):
+        recall = recall_at_k(index, ids, matrix, queries, args.k, nprobe)
+        start = time.perf_counter()
+        for query in queries:
+            cand = index.candidates(query, nprobe)
+            exact_top_k(matrix[row_of[cand]], query, args.k)
+        ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"nprobe={nprobe:<4} recall@{args.k}={recall:.3f}  {ivf_ms:.3f} ms/query")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
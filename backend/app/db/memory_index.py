@@ -0,0 +1,235 @@
+"""In-memory, L2-normalised embedding matrix over `ai_memories` for fast top-k retrieval."""
+
+import threading
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.db.memory_ann import IVFIndex
+
+# Below this many memories brute force is already sub-millisecond; above it an IVF
+# index (persisted next to pa.db) keeps search sublinear.
+ANN_MIN_SIZE = 4096
+ANN_RETRAIN_GROWTH = 4
+ANN_SAVE_EVERY = 256
+
+
+def encode_embedding(embedding) -> bytes:
+    """Pack an embedding as a float32 BLOB."""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def decode_embedding(blob: bytes) -> np.ndarray:
+    """Unpack a float32 BLOB (zero-copy, read-only view)."""
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return vector
+    return vector / norm
+
+
+class MemoryIndex:
+    """
+    Dense matrix of unit-length memory embeddings, one row per memory.
+    Rows are added/removed incrementally (amortised O(d) insert, swap-remove delete),
+    and top-k is a single matrix-vector product plus `argpartition`. Once the index
+    holds `ANN_MIN_SIZE` rows, search only scores the candidates of an `IVFIndex`,
+    which is (re)trained in a background thread; until the first one is ready,
+    search stays exact.
+    """
+
+    def __init__(self, ann_path: Path | None = None, ann_min_size: int = ANN_MIN_SIZE):
+        self.ann_path = ann_path
+        self.ann_min_size = ann_min_size
+        self._ann: IVFIndex | None = None
+        self._ann_dirty = 0
+        self._training = False
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dim = 0
+        self._size = 0
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._meta: list[dict] = []
+        self._rows: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def ensure_loaded(self, load_rows: Callable[[], Iterable[dict]]) -> None:
+        """Build the matrix from `load_rows()` once (rows: id, summary, kind, embedding BLOB)."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = list(load_rows())
+            self._reset()
+            # Newest rows first: if the embedding model changed, index the current dimension.
+            for row in rows:
+                vector = decode_embedding(row["embedding"])
+                if not self._dim:
+                    self._dim = vector.shape[0]
+                if vector.shape[0] != self._dim:
+                    continue
+                self._append(row["id"], row["summary"], row["kind"], vector)
+            self._loaded = True
+            self._load_ann()
+
+    def add(self, memory_id: int, summary: str, kind: str, embedding) -> None:
+        """Insert (or replace) one memory's vector."""
+        with self._lock:
+            if not self._loaded:
+                return
+            vector = np.asarray(embedding, dtype=np.float32)
+            if self._dim and vector.shape[0] != self._dim:
+                # Embedding model changed; rebuild from the database on next use.
+                self._loaded = False
+                return
+            if not self._dim:
+                self._dim = vector.shape[0]
+            if memory_id in self._rows:
+                self.remove([memory_id])
+            self._append(memory_id, summary, kind, vector)
+            if self._ann is not None:
+                self._ann.add(memory_id, self._matrix[self._size - 1])
+                self._mark_ann_dirty()
+                if self._size >= self._ann.trained_size * ANN_RETRAIN_GROWTH:
+                    self._schedule_train()
+            elif self._size >= self.ann_min_size:
+                self._schedule_train()
+
+    def remove(self, memory_ids: Iterable[int]) -> None:
+        """Drop memories by id (swap-with-last, so O(d) per row)."""
+        with self._lock:
+            for memory_id in memory_ids:
+                row = self._rows.pop(memory_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._meta[row] = self._meta[last]
+                    self._rows[self._meta[row]["id"]] = row
+                self._meta.pop()
+                self._size -= 1
+                if self._ann is not None:
+                    self._ann.remove(memory_id)
+                    self._mark_ann_dirty()
+
+    def search(self, query, k: int) -> list[dict]:
+        """Return up to k memories by cosine similarity: dicts of id, summary, kind, score."""
+        with self._lock:
+            if not self._size or k <= 0:
+                return []
+            q = np.asarray(query, dtype=np.float32)
+            if q.shape[0] != self._dim:
+                return []
+            q = _normalize(q)
+            if self._ann is not None:
+                cand = self._ann.candidates(q).tolist()
+                rows = np.fromiter(
+                    (self._rows[i] for i in cand if i in self._rows), dtype=np.int64
+                )
+            else:
+                rows = np.arange(self._size)
+            if not len(rows):
+                return []
+            scores = self._matrix[rows] @ q
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [{**self._meta[rows[i]], "score": float(scores[i])} for i in top]
+
+    def invalidate(self) -> None:
+        """Forget the matrix; the next `ensure_loaded` rebuilds it."""
+        with self._lock:
+            self._loaded = False
+
+    def flush(self) -> None:
+        """Persist the ANN index if it has unsaved changes."""
+        with self._lock:
+            if self._ann is not None and self._ann_dirty and self.ann_path is not None:
+                self._ann.save(self.ann_path)
+                self._ann_dirty = 0
+
+    def _live_ids(self) -> np.ndarray:
+        return np.fromiter((m["id"] for m in self._meta), dtype=np.int64, count=self._size)
+
+    def _load_ann(self) -> None:
+        """Reuse the persisted IVF index (reconciled with current rows) or train one."""
+        self._ann = None
+        if self._size < self.ann_min_size:
+            return
+        ann = IVFIndex.load(self.ann_path) if self.ann_path and self.ann_path.exists() else None
+        if ann is None or ann.dim != self._dim:
+            self._schedule_train()
+            return
+        ann.sync(self._live_ids(), self._matrix[: self._size])
+        self._ann = ann
+        self._ann_dirty = 1
+        self.flush()
+
+    def _schedule_train(self) -> None:
+        """Train a new IVF index off the insert path; callers hold the lock."""
+        if self._training:
+            return
+        self._training = True
+        ids = self._live_ids()
+        vectors = self._matrix[: self._size].copy()
+        threading.Thread(
+            target=self._train_ann, args=(ids, vectors, self._generation), daemon=True
+        ).start()
+
+    def _train_ann(self, ids: np.ndarray, vectors: np.ndarray, generation: int) -> None:
+        try:
+            ann = IVFIndex.train(ids, vectors)
+            with self._lock:
+                if generation != self._generation or ann.dim != self._dim:
+                    return
+                # Catch up with inserts/deletes made while training.
+                ann.sync(self._live_ids(), self._matrix[: self._size])
+                self._ann = ann
+                self._ann_dirty = 1
+                self.flush()
+        finally:
+            with self._lock:
+                self._training = False
+
+    def _mark_ann_dirty(self) -> None:
+        self._ann_dirty += 1
+        if self._ann_dirty >= ANN_SAVE_EVERY:
+            self.flush()
+
+    def _reset(self) -> None:
+        self._generation += 1
+        self._ann = None
+        self._dim = 0
+        self._size = 0
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._meta = []
+        self._rows = {}
+
+    def _append(self, memory_id: int, summary: str, kind: str, vector: np.ndarray) -> None:
+        if self._size == self._matrix.shape[0]:
+            capacity = max(64, self._matrix.shape[0] * 2)
+            grown = np.zeros((capacity, self._dim), dtype=np.float32)
+            if self._size:
+                grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size] = _normalize(vector)
+        self._meta.append({"id": memory_id, "summary": summary, "kind": kind})
+        self._rows[memory_id] = self._size
+        self._size += 1
+
+
+memory_index = MemoryIndex(ann_path=Path(settings.db_path).with_name("ai_memories.ivf.npz"))
@@ -0,0 +1,58 @@
+"""People and their relationships to Dad (or to each other), captured from chat."""
+
+from datetime import datetime
+from backend.app.db.changes import notify
+from backend.app.db.conn import get_conn
+
+FAMILY_RELATIONS = frozenset(
+    {
+        "wife", "husband", "partner", "son", "daughter", "dad", "father",
+        "mum", "mom", "mother", "sister", "brother",
+    }
+)
+
+
+def _person_id(conn, name: str, now: str) -> int:
+    conn.execute(
+        "INSERT OR IGNORE INTO people (name, created_at) VALUES (?, ?);", (name, now)
+    )
+    return conn.execute("SELECT id FROM people WHERE name = ?;", (name,)).fetchone()["id"]
+
+
+def add_relationships(facts: list[tuple[str, str, str | None]]) -> int:
+    """
+    Store (name, relation, owner) facts in one transaction; owner None means Dad.
+    Returns how many were new.
+    """
+    now = datetime.utcnow().isoformat(timespec="seconds")
+    added = 0
+    with get_conn() as conn:
+        for name, relation, owner in facts:
+            person_id = _person_id(conn, name.strip(), now)
+            owner_id = _person_id(conn, owner.strip(), now) if owner else None
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO relationships (person_id, relation, owner_id, created_at) "
+                "VALUES (?, ?, ?, ?);",
+                (person_id, relation.strip().lower(), owner_id, now),
+            )
+            added += cur.rowcount
+        conn.commit()
+    if added:
+        notify("people", "insert")
+    return added
+
+
+def add_relationship(name: str, relation: str, owner: str | None = None) -> bool:
+    return add_relationships([(name, relation, owner)]) > 0
+
+
+def list_relationships() -> list[dict]:
+    """All relationships as {name, relation, owner} (owner None = Dad), oldest first."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT p.name, r.relation, o.name AS owner FROM relationships r "
+            "JOIN people p ON p.id = r.person_id "
+            "LEFT JOIN people o ON o.id = r.owner_id "
+            "ORDER BY r.id;"
+        ).fetchall()
+    return [dict(r) for r in rows]
@@ -1,7 +1,9 @@
 """Task and alert query helpers for the dashboard/API."""
 
+import sqlite3
 from datetime import datetime
-from backend.app.db.conn import get_conn
+from backend.app.db.changes import notify
+from backend.app.db.conn import get_conn, use_conn
 
 def get_alerts() -> list[str]:
     """Return the latest alert messages (max 10)."""
@@ -50,10 +52,10 @@ def get_tasks() -> list[dict]:
         ).fetchall()
     return [dict(r) for r in rows]
 
-def add_task(title: str, priority: str = "medium") -> None:
-    """Insert a new task with status=todo."""
+def add_task(title: str, priority: str = "medium") -> int:
+    """Insert a new task with status=todo and return its id."""
     with get_conn() as conn:
-        conn.execute(
+        cur = conn.execute(
             """
             INSERT INTO tasks (title, priority, status, created_at)
             VALUES (?, ?, 'todo', ?);
@@ -61,19 +63,24 @@ def add_task(title: str, priority: str = "medium") -> None:
             (title, priority, datetime.now().isoformat(timespec="seconds")),
         )
         conn.commit()
+    task_id = int(cur.lastrowid)
+    notify("tasks", "insert", task_id)
+    return task_id
 
 def mark_task_done(task_id: int) -> None:
     """Mark a task as done by id."""
     with get_conn() as conn:
         conn.execute("UPDATE tasks SET status='done' WHERE id = ?;", (task_id,))
         conn.commit()
+    notify("tasks", "update", task_id)
 
 def mark_all_tasks_done() -> int:
     """Mark all todo tasks as done; returns count updated."""
     with get_conn() as conn:
         cur = conn.execute("UPDATE tasks SET status='done' WHERE status='todo';")
         conn.commit()
-        return cur.rowcount
+    notify("tasks", "reset")
+    return cur.rowcount
 
 def update_task_priority(task_id: int, priority: str) -> None:
     """Update a task's priority."""
@@ -82,11 +89,12 @@ def update_task_priority(task_id: int, priority: str) -> None:
             "UPDATE tasks SET priority = ? WHERE id = ?;", (priority, task_id)
         )
         conn.commit()
+    notify("tasks", "update", task_id)
 
 
-def list_open_tasks() -> list[dict]:
+def list_open_tasks(conn: sqlite3.Connection | None = None) -> list[dict]:
     """List open tasks (status=todo) ordered by priority then id."""
-    with get_conn() as conn:
+    with use_conn(conn) as conn:
         rows = conn.execute(
             """
             SELECT id, title, priority, status, created_at
@@ -103,3 +111,13 @@ def list_open_tasks() -> list[dict]:
             """
         ).fetchall()
     return [dict(r) for r in rows]
+
+
+def get_task(task_id: int, conn: sqlite3.Connection | None = None) -> dict | None:
+    """Fetch one task by id (any status)."""
+    with use_conn(conn) as conn:
+        row = conn.execute(
+            "SELECT id, title, priority, status, created_at FROM tasks WHERE id = ?;",
+            (task_id,),
+        ).fetchone()
+    return dict(row) if row else None
@@ -0,0 +1,135 @@
+"""
+RRULE-style event recurrence, expanded on demand. A series is one `events` row whose
+`event_date` is the first occurrence, with `rrule` (a subset: FREQ=DAILY|WEEKLY|MONTHLY|YEARLY,
+INTERVAL, BYDAY for weekly rules), an optional inclusive `until_date` and comma-separated
+`exdates` that are skipped.
+"""
+
+from datetime import MAXYEAR, date as Date, timedelta
+from functools import lru_cache
+from typing import Iterator
+
+FREQS = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def daily_rule(interval: int = 1) -> str:
+    return "FREQ=DAILY" if interval == 1 else f"FREQ=DAILY;INTERVAL={interval}"
+
+
+@lru_cache(maxsize=256)
+def parse_rrule(rule: str) -> tuple[str, int, frozenset[int]]:
+    """(freq, interval, weekday numbers) for `rule`; ValueError if unsupported."""
+    parts = {}
+    for part in rule.upper().split(";"):
+        if part.strip():
+            key, _, value = part.partition("=")
+            parts[key.strip()] = value.strip()
+    freq = parts.pop("FREQ", "")
+    if freq not in FREQS:
+        raise ValueError(f"unsupported FREQ: {freq or rule}")
+    interval = int(parts.pop("INTERVAL", "1"))
+    if interval < 1:
+        raise ValueError("INTERVAL must be positive")
+    byday = frozenset(WEEKDAYS.index(d) for d in parts.pop("BYDAY", "").split(",") if d)
+    if byday and freq != "WEEKLY":
+        raise ValueError("BYDAY is only supported for WEEKLY rules")
+    if parts:
+        raise ValueError(f"unsupported RRULE parts: {', '.join(parts)}")
+    return freq, interval, byday
+
+
+@lru_cache(maxsize=256)
+def parse_exdates(exdates: str | None) -> frozenset[str]:
+    return frozenset(d.strip() for d in (exdates or "").split(",") if d.strip())
+
+
+def _matches_rule(start: Date, day: Date, rule: str) -> bool:
+    freq, interval, byday = parse_rrule(rule)
+    if freq == "DAILY":
+        return (day - start).days % interval == 0
+    if freq == "WEEKLY":
+        week_start = start - timedelta(days=start.weekday())
+        weeks = (day - week_start).days // 7
+        return day.weekday() in (byday or {start.weekday()}) and weeks % interval == 0
+    if freq == "MONTHLY":
+        months = (day.year - start.year) * 12 + day.month - start.month
+        return day.day == start.day and months % interval == 0
+    return (day.month, day.day) == (start.month, start.day) and (day.year - start.year) % interval == 0
+
+
+def occurs_on(event, day: Date) -> bool:
+    """True if `event` (a row with event_date/rrule/until_date/exdates) has an occurrence on `day`."""
+    start = Date.fromisoformat(event["event_date"])
+    if day < start:
+        return False
+    rule = event["rrule"]
+    if not rule:
+        return day == start
+    if event["until_date"] and day.isoformat() > event["until_date"]:
+        return False
+    if day.isoformat() in parse_exdates(event["exdates"]):
+        return False
+    return _matches_rule(start, day, rule)
+
+
+def _aligned_from(start: Date, day: Date, rule: str) -> Iterator[Date]:
+    """Occurrences of `rule` from `start` on or after `day`, in order, ignoring exdates/until."""
+    freq, interval, byday = parse_rrule(rule)
+    day = max(start, day)
+    if freq == "DAILY":
+        day += timedelta(days=-(day - start).days % interval)
+        while True:
+            yield day
+            day += timedelta(days=interval)
+    if freq == "WEEKLY":
+        weekdays = sorted(byday or {start.weekday()})
+        week_start = start - timedelta(days=start.weekday())
+        weeks = (day - week_start).days // 7
+        weeks += -weeks % interval
+        while True:
+            monday = week_start + timedelta(weeks=weeks)
+            for weekday in weekdays:
+                candidate = monday + timedelta(days=weekday)
+                if candidate >= day:
+                    yield candidate
+            weeks += interval
+    per_year = 12 if freq == "MONTHLY" else 1
+    periods = (day.year - start.year) * per_year
+    if freq == "MONTHLY":
+        periods += day.month - start.month
+    periods += -periods % interval
+    while True:
+        # Months/years without the start day (the 31st, Feb 29) are skipped, as in occurs_on.
+        if freq == "MONTHLY":
+            years, month0 = divmod(start.month - 1 + periods, 12)
+            year, month = start.year + years, month0 + 1
+        else:
+            year, month = start.year + periods, start.month
+        if year > MAXYEAR:
+            return
+        try:
+            candidate = Date(year, month, start.day)
+        except ValueError:
+            candidate = None
+        if candidate is not None and candidate >= day:
+            yield candidate
+        periods += interval
+
+
+def next_occurrence(event, on_or_after: Date) -> Date | None:
+    """First occurrence of `event` on or after `on_or_after`, or None if the series has ended."""
+    start = Date.fromisoformat(event["event_date"])
+    if not event["rrule"]:
+        return start if start >= on_or_after else None
+    until = Date.fromisoformat(event["until_date"]) if event["until_date"] else None
+    exdates = parse_exdates(event["exdates"])
+    try:
+        for day in _aligned_from(start, on_or_after, event["rrule"]):
+            if until is not None and day > until:
+                return None
+            if day.isoformat() not in exdates:
+                return day
+    except OverflowError:
+        pass
+    return None
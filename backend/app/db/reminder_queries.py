@@ -1,7 +1,9 @@
 """Reminder schedule + active reminder CRUD helpers."""
 
+import sqlite3
 from datetime import datetime, timedelta
-from backend.app.db.conn import get_conn
+from backend.app.db.changes import notify
+from backend.app.db.conn import get_conn, use_conn
 
 def get_schedules_for_day_type(day_type: str):
     """Return reminder schedules for a given day type ('work'|'off')."""
@@ -32,12 +34,14 @@ def create_active_for_date(reminder_key: str, label: str, speak_text: str, dose_
             (reminder_key, label, speak_text, dose_date, scheduled_hhmm, next_fire_at_iso, datetime.now().isoformat(timespec="seconds")),
         )
         conn.commit()
-        return conn.execute(
+        row = conn.execute(
             """SELECT * FROM reminder_active
                WHERE reminder_key=? AND dose_date=? AND status='active'
                ORDER BY id DESC LIMIT 1;""",
             (reminder_key, dose_date),
         ).fetchone()
+    notify("reminders", "insert", row["id"] if row else None)
+    return row
 
 def get_due_active(now_iso: str):
     """Fetch the next due active reminder at/ before `now_iso`."""
@@ -69,18 +73,21 @@ def mark_done(active_id: int):
     with get_conn() as conn:
         conn.execute("UPDATE reminder_active SET status='done' WHERE id=?;", (active_id,))
         conn.commit()
+    notify("reminders", "update", active_id)
 
 def delete_active_reminder(active_id: int):
     """Delete an active reminder by id."""
     with get_conn() as conn:
         conn.execute("DELETE FROM reminder_active WHERE id=?;", (active_id,))
         conn.commit()
+    notify("reminders", "delete", active_id)
 
 def mark_missed(active_id: int):
     """Mark an active reminder as missed."""
     with get_conn() as conn:
         conn.execute("UPDATE reminder_active SET status='missed' WHERE id=?;", (active_id,))
         conn.commit()
+    notify("reminders", "update", active_id)
 
 def log_action(reminder_key: str, action: str):
     """Insert a reminder action log row."""
@@ -108,9 +115,9 @@ def list_for_date(dose_date: str):
         ).fetchall()
 
 
-def list_active_reminders() -> list[dict]:
+def list_active_reminders(conn: sqlite3.Connection | None = None) -> list[dict]:
     """List all active reminders ordered by date then time."""
-    with get_conn() as conn:
+    with use_conn(conn) as conn:
         rows = conn.execute(
             """SELECT id, reminder_key, label, speak_text, dose_date, scheduled_hhmm, status
                FROM reminder_active
@@ -120,9 +127,11 @@ def list_active_reminders() -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def list_recent_reminders(limit: int = 20) -> list[dict]:
+def list_recent_reminders(
+    limit: int = 20, conn: sqlite3.Connection | None = None
+) -> list[dict]:
     """List recent reminders regardless of status (default last 20)."""
-    with get_conn() as conn:
+    with use_conn(conn) as conn:
         rows = conn.execute(
             """SELECT id, reminder_key, label, speak_text, dose_date, scheduled_hhmm, status
                FROM reminder_active
@@ -133,12 +142,25 @@ def list_recent_reminders(limit: int = 20) -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def delete_event_reminders(event_id: int) -> None:
-    """Delete reminder_active rows for a given event id prefix."""
-    prefix = f"event:{event_id}:"
+def delete_event_reminders(event_id: int, dose_date: str | None = None) -> None:
+    """Delete reminder_active rows for a given event id prefix (only `dose_date`'s if given)."""
+    prefix = f"event:{event_id}:{dose_date}" if dose_date else f"event:{event_id}:"
     with get_conn() as conn:
         conn.execute(
             "DELETE FROM reminder_active WHERE reminder_key LIKE ?;",
             (f"{prefix}%",),
         )
         conn.commit()
+    notify("reminders", "reset")
+
+
+def get_reminder(active_id: int, conn: sqlite3.Connection | None = None) -> dict | None:
+    """Fetch one reminder_active row by id (any status)."""
+    with use_conn(conn) as conn:
+        row = conn.execute(
+            """SELECT id, reminder_key, label, speak_text, dose_date, scheduled_hhmm, status
+               FROM reminder_active
+               WHERE id=?;""",
+            (active_id,),
+        ).fetchone()
+    return dict(row) if row else None
@@ -0,0 +1,119 @@
+"""Batch writer for parsed `/api/ai/schedule` results (one transaction per command)."""
+
+import sqlite3
+from datetime import datetime
+from typing import Callable
+
+from backend.app.db.changes import notify
+from backend.app.db.conn import get_conn
+from backend.app.db.event_queries import EVENT_COLUMNS
+from backend.app.db.workday_queries import DEFAULT_WORK_END, DEFAULT_WORK_START
+
+
+def _insert_many(
+    conn: sqlite3.Connection, table: str, sql: str, rows: list[tuple], columns: str = "id"
+) -> list[dict]:
+    """executemany `sql` and return the inserted rows (ids are allocated in order under the write lock)."""
+    if not rows:
+        return []
+    last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table};").fetchone()[0]
+    conn.executemany(sql, rows)
+    return [
+        dict(r)
+        for r in conn.execute(
+            f"SELECT {columns} FROM {table} WHERE id > ? ORDER BY id;", (last_id,)
+        )
+    ]
+
+
+def apply_schedule_batch(
+    tasks: list[tuple[str, str]] = (),
+    events: list[dict] = (),
+    reminders: list[dict] = (),
+    workdays: list[tuple[str, bool, str | None, str | None]] = (),
+    plan_event_reminders: Callable[[list[dict]], list[dict]] | None = None,
+) -> dict:
+    """
+    Insert tasks (title, priority), events (one row per series for recurring ones),
+    ad-hoc reminders and workday overrides (date, is_work, start, end) in one
+    transaction. Reminders returned by `plan_event_reminders(new_event_rows)` are
+    written in the same transaction. Returns the new `task_ids`, `event_ids` and
+    `reminder_ids`.
+    """
+    now = datetime.now().isoformat(timespec="seconds")
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE;")
+        new_tasks = _insert_many(
+            conn,
+            "tasks",
+            "INSERT INTO tasks (title, priority, status, created_at) VALUES (?, ?, 'todo', ?);",
+            [(title, priority, now) for title, priority in tasks],
+        )
+        new_events = _insert_many(
+            conn,
+            "events",
+            "INSERT INTO events (title, event_date, start_hhmm, end_hhmm, all_day, reminder_preset, "
+            "rrule, until_date, exdates, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);",
+            [
+                (
+                    e["title"],
+                    e["event_date"],
+                    e.get("start_hhmm"),
+                    e.get("end_hhmm"),
+                    1 if e.get("all_day") else 0,
+                    e.get("reminder_preset") or "standard",
+                    e.get("rrule"),
+                    e.get("until_date"),
+                    e.get("exdates"),
+                    now,
+                )
+                for e in events
+            ],
+            EVENT_COLUMNS,
+        )
+        planned = list(reminders)
+        if plan_event_reminders is not None and new_events:
+            planned += plan_event_reminders(new_events)
+        new_reminders = _insert_many(
+            conn,
+            "reminder_active",
+            "INSERT INTO reminder_active "
+            "(reminder_key, label, speak_text, dose_date, scheduled_hhmm, status, next_fire_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, 'active', ?, ?);",
+            [
+                (
+                    r["reminder_key"],
+                    r["label"],
+                    r["speak_text"],
+                    r["dose_date"],
+                    r["scheduled_hhmm"],
+                    r["next_fire_at"],
+                    now,
+                )
+                for r in planned
+            ],
+        )
+        if workdays:
+            conn.executemany(
+                "INSERT INTO work_days (date, is_work, start_hhmm, end_hhmm) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(date) DO UPDATE SET is_work=excluded.is_work, start_hhmm=excluded.start_hhmm, end_hhmm=excluded.end_hhmm;",
+                [
+                    (day, 1 if is_work else 0, start or DEFAULT_WORK_START, end or DEFAULT_WORK_END)
+                    for day, is_work, start, end in workdays
+                ],
+            )
+        conn.commit()
+    for collection, rows in (
+        ("tasks", new_tasks),
+        ("events", new_events),
+        ("reminders", new_reminders),
+    ):
+        for row in rows:
+            notify(collection, "insert", row["id"])
+    if workdays:
+        notify("workdays", "update")
+    return {
+        "task_ids": [r["id"] for r in new_tasks],
+        "event_ids": [r["id"] for r in new_events],
+        "reminder_ids": [r["id"] for r in new_reminders],
+    }
@@ -15,6 +15,9 @@ CREATE TABLE IF NOT EXISTS events (
   end_hhmm TEXT,
   all_day INTEGER NOT NULL DEFAULT 0,
   reminder_preset TEXT NOT NULL DEFAULT 'none',
+  rrule TEXT,                   -- recurrence (FREQ=DAILY;INTERVAL=2 ...); NULL for one-off events
+  until_date TEXT,              -- last possible occurrence (inclusive); NULL = open-ended
+  exdates TEXT,                 -- comma-separated skipped occurrence dates
   created_at TEXT NOT NULL
 );
 
@@ -72,17 +75,52 @@ CREATE TABLE IF NOT EXISTS ai_messages (
   created_at TEXT NOT NULL
 );
 
+-- Rolling summary of chat turns older than the verbatim window (single row)
+CREATE TABLE IF NOT EXISTS ai_history_summary (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  summary TEXT NOT NULL,
+  covered_until TEXT NOT NULL,   -- created_at of the newest folded message
+  covered_id INTEGER NOT NULL DEFAULT 0,  -- ai_messages.id of the newest folded message
+  updated_at TEXT NOT NULL
+);
+
 -- AI profile memory (long-term)
 CREATE TABLE IF NOT EXISTS ai_memories (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   summary TEXT NOT NULL UNIQUE,
   kind TEXT NOT NULL DEFAULT 'short',
   word_count INTEGER NOT NULL DEFAULT 0,
-  embedding TEXT,
+  embedding BLOB,               -- float32 vector
   last_used_at TEXT,
   created_at TEXT NOT NULL
 );
 
+-- People Dad has told us about, and how they relate to him or to each other
+CREATE TABLE IF NOT EXISTS people (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+  created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS relationships (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  person_id INTEGER NOT NULL REFERENCES people(id) ON DELETE CASCADE,
+  relation TEXT NOT NULL,       -- son, wife, dog, friend, ...
+  owner_id INTEGER REFERENCES people(id) ON DELETE CASCADE,  -- NULL: Dad
+  created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_relationships_unique
+  ON relationships (person_id, relation, COALESCE(owner_id, 0));
+
+-- Embedding cache (model + normalised-text hash -> float32 vector)
+CREATE TABLE IF NOT EXISTS embedding_cache (
+  model TEXT NOT NULL,
+  text_key TEXT NOT NULL,
+  embedding BLOB NOT NULL,      -- float32 vector
+  created_at TEXT NOT NULL,
+  PRIMARY KEY (model, text_key)
+);
+
 -- TTS pronunciation overrides
 CREATE TABLE IF NOT EXISTS pronunciations (
   term TEXT PRIMARY KEY,
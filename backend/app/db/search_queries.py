@@ -0,0 +1,126 @@
+"""Full-text search over tasks, events, reminders and memories (FTS5, BM25-ranked)."""
+
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from backend.app.db.conn import get_conn
+
+TZ = ZoneInfo("Europe/London")
+_TERM_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "at", "be", "for", "i", "in", "is", "it", "me", "my",
+        "of", "on", "or", "that", "the", "this", "to", "ve", "with",
+    }
+)
+
+# kind -> (fts table, source table, selected columns, bm25 expression, LIKE haystack, open-only filter)
+_SOURCES = {
+    "task": (
+        "tasks_fts",
+        "tasks",
+        "t.id, t.title, t.priority, t.status",
+        "bm25(tasks_fts)",
+        "t.title",
+        "t.status = 'todo'",
+    ),
+    "event": (
+        "events_fts",
+        "events",
+        "t.id, t.title, t.event_date, t.start_hhmm, t.end_hhmm, t.all_day, t.rrule, t.until_date",
+        "bm25(events_fts)",
+        "t.title",
+        "(t.event_date >= :today OR (t.rrule IS NOT NULL AND COALESCE(t.until_date, :today) >= :today))",
+    ),
+    "reminder": (
+        "reminders_fts",
+        "reminder_active",
+        "t.id, t.label AS title, t.reminder_key, t.dose_date, t.scheduled_hhmm, t.status",
+        "bm25(reminders_fts, 2.0, 1.0)",  # label outweighs speak_text
+        "t.label || ' ' || t.speak_text",
+        "t.status = 'active'",
+    ),
+    "memory": (
+        "memories_fts",
+        "ai_memories",
+        "t.id, t.summary AS title, t.summary, t.kind, t.created_at",
+        "bm25(memories_fts)",
+        "t.summary",
+        None,
+    ),
+}
+SEARCH_KINDS = tuple(_SOURCES)
+
+_fts_ready = False
+
+
+def _terms(text: str) -> list[str]:
+    return [t for t in dict.fromkeys(_TERM_RE.findall(text.lower())) if t not in _STOPWORDS]
+
+
+def match_query(text: str) -> str | None:
+    """FTS5 MATCH expression OR-ing the prefix of each meaningful term (None if there are none)."""
+    terms = _terms(text)
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"*' for term in terms)
+
+
+def fts_available() -> bool:
+    """True once `init_db` has created the FTS5 tables (SQLite builds without FTS5 never do)."""
+    global _fts_ready
+    if not _fts_ready:
+        with get_conn() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts';"
+            ).fetchone()
+        _fts_ready = row is not None
+    return _fts_ready
+
+
+def search_items(
+    text: str,
+    kinds: tuple[str, ...] | list[str] | None = None,
+    limit: int = 20,
+    include_done: bool = False,
+    today: str | None = None,
+) -> list[dict]:
+    """
+    Rows matching any term of `text`, best BM25 rank first (lower is better), each tagged
+    with its `type`. Unless `include_done`, only open tasks, active reminders and events
+    from `today` on are returned. Falls back to LIKE (unranked) without FTS5.
+    """
+    terms = _terms(text)
+    if not terms:
+        return []
+    params = {
+        "query": match_query(text),
+        "limit": limit,
+        "today": today or datetime.now(TZ).date().isoformat(),
+    }
+    use_fts = fts_available()
+    results: list[dict] = []
+    with get_conn() as conn:
+        for kind in kinds or SEARCH_KINDS:
+            fts, table, columns, rank, haystack, open_filter = _SOURCES[kind]
+            filters = [] if include_done or not open_filter else [open_filter]
+            if use_fts:
+                sql = (
+                    f"SELECT {columns}, {rank} AS rank FROM {fts} "
+                    f"JOIN {table} t ON t.id = {fts}.rowid "
+                    f"WHERE {' AND '.join([f'{fts} MATCH :query', *filters])} "
+                    "ORDER BY rank LIMIT :limit;"
+                )
+                kind_params = params
+            else:
+                likes = " OR ".join(f"{haystack} LIKE :term{i}" for i in range(len(terms)))
+                sql = (
+                    f"SELECT {columns}, 0.0 AS rank FROM {table} t "
+                    f"WHERE {' AND '.join([f'({likes})', *filters])} "
+                    "ORDER BY t.id DESC LIMIT :limit;"
+                )
+                kind_params = {**params, **{f"term{i}": f"%{t}%" for i, t in enumerate(terms)}}
+            rows = conn.execute(sql, kind_params).fetchall()
+            results += [{"type": kind, **dict(r)} for r in rows]
+    results.sort(key=lambda r: r["rank"])
+    return results[:limit]
@@ -0,0 +1,74 @@
+-- Full-text search (FTS5, external content) over item titles and memory summaries.
+-- Applied by conn.init_db() only when the SQLite build ships FTS5; kept in sync by triggers.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+  title,
+  content='tasks',
+  content_rowid='id',
+  tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+  INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+  INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title ON tasks BEGIN
+  INSERT INTO tasks_fts(tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+  INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+  title,
+  content='events',
+  content_rowid='id',
+  tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+  INSERT INTO events_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+  INSERT INTO events_fts(events_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title ON events BEGIN
+  INSERT INTO events_fts(events_fts, rowid, title) VALUES ('delete', old.id, old.title);
+  INSERT INTO events_fts(rowid, title) VALUES (new.id, new.title);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS reminders_fts USING fts5(
+  label, speak_text,
+  content='reminder_active',
+  content_rowid='id',
+  tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS reminders_fts_ai AFTER INSERT ON reminder_active BEGIN
+  INSERT INTO reminders_fts(rowid, label, speak_text) VALUES (new.id, new.label, new.speak_text);
+END;
+CREATE TRIGGER IF NOT EXISTS reminders_fts_ad AFTER DELETE ON reminder_active BEGIN
+  INSERT INTO reminders_fts(reminders_fts, rowid, label, speak_text) VALUES ('delete', old.id, old.label, old.speak_text);
+END;
+CREATE TRIGGER IF NOT EXISTS reminders_fts_au AFTER UPDATE OF label, speak_text ON reminder_active BEGIN
+  INSERT INTO reminders_fts(reminders_fts, rowid, label, speak_text) VALUES ('delete', old.id, old.label, old.speak_text);
+  INSERT INTO reminders_fts(rowid, label, speak_text) VALUES (new.id, new.label, new.speak_text);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+  summary,
+  content='ai_memories',
+  content_rowid='id',
+  tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS memories_fts_ai AFTER INSERT ON ai_memories BEGIN
+  INSERT INTO memories_fts(rowid, summary) VALUES (new.id, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_ad AFTER DELETE ON ai_memories BEGIN
+  INSERT INTO memories_fts(memories_fts, rowid, summary) VALUES ('delete', old.id, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_au AFTER UPDATE OF summary ON ai_memories BEGIN
+  INSERT INTO memories_fts(memories_fts, rowid, summary) VALUES ('delete', old.id, old.summary);
+  INSERT INTO memories_fts(rowid, summary) VALUES (new.id, new.summary);
+END;
@@ -1,6 +1,7 @@
 """Work/off day overrides and default work hours."""
 
 from datetime import date as Date
+from backend.app.db.changes import notify
 from backend.app.db.conn import get_conn
 
 # Default pattern if no override exists in DB:
@@ -25,6 +26,7 @@ def set_work_day(
             (date_yyyy_mm_dd, 1 if is_work else 0, start_val, end_val),
         )
         conn.commit()
+    notify("workdays", "update")
 
 def is_work_day(date_yyyy_mm_dd: str) -> bool:
     """Return True if the date is marked as work, else follow default pattern."""
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from backend.app.db.conn import init_db
+from backend.app.services.intent_classifier import warm_intent_classifier
+from backend.app.services.memory_pipeline import memory_pipeline, run_memory_maintenance
 from backend.app.services.scheduler_service import start_scheduler
 from backend.app.api.routes_dashboard import router as dashboard_router
 from backend.app.api.routes_tasks import router as tasks_router
@@ -10,6 +12,7 @@ from backend.app.api.routes_events import router as events_router
 from backend.app.api.routes_tts import router as tts_router
 from backend.app.api.routes_stt import router as stt_router
 from backend.app.api.routes_ai import router as ai_router
+from backend.app.api.routes_search import router as search_router
 
 load_dotenv()
 app = FastAPI(title="Sam Kitchen PA")
@@ -18,6 +21,12 @@ app = FastAPI(title="Sam Kitchen PA")
 def _startup():
     init_db()
     start_scheduler()
+    warm_intent_classifier()
+
+@app.on_event("shutdown")
+def _shutdown():
+    memory_pipeline.drain()
+    run_memory_maintenance()
 
 @app.get("/health")
 def health():
@@ -31,3 +40,4 @@ app.include_router(events_router)
 app.include_router(tts_router)
 app.include_router(stt_router)
 app.include_router(ai_router)
+app.include_router(search_router)
@@ -0,0 +1,123 @@
+"""
+Pre-rendered spoken briefing: today's summary text is synthesised to OGG in the
+background at `arm_today` and after schedule changes, so "what have I got today"
+can answer with audio that is already on disk.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from backend.app.core.config import settings
+from backend.app.db.changes import subscribe
+from backend.app.services.day_summary import WATCHED_COLLECTIONS, day_summary
+
+_KEY_RE = re.compile(r"[0-9a-f]{16}")
+
+
+class BriefingService:
+    """One daemon worker that re-renders the briefing when the summary text changes."""
+
+    def __init__(self, audio_dir: str, debounce_s: float = 2.0):
+        self.audio_dir = Path(audio_dir)
+        self.debounce_s = debounce_s
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._current: dict | None = None  # {"text", "key", "path"}
+        self.renders = 0
+        self.errors = 0
+        self.last_render_s = 0.0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def start(self) -> None:
+        """Start the worker and re-render on task/event/reminder/workday writes."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        for collection in WATCHED_COLLECTIONS:
+            subscribe(collection, lambda op, item_id: self.refresh())
+
+    def refresh(self) -> None:
+        """Ask the worker to re-render if the summary text has changed (debounced)."""
+        self._wake.set()
+
+    def audio_url(self, text: str) -> str | None:
+        """URL of the rendered audio for exactly `text`, or None if it is not warm yet."""
+        current = self._current
+        if current is None or current["text"] != text or not current["path"].exists():
+            self.refresh()
+            return None
+        return f"/api/tts/briefing?v={current['key']}"
+
+    def audio_path(self, key: str | None = None) -> Path | None:
+        """
+        Rendered audio for the current summary, rendering it now if needed. With `key`
+        (the `v` of an issued `audio_url`), only the audio of that exact text is served.
+        """
+        if key is not None:
+            path = self.audio_dir / f"briefing-{key}.ogg"
+            return path if _KEY_RE.fullmatch(key) and path.exists() else None
+        text = day_summary.get()["text"]
+        current = self._current
+        if current is None or current["text"] != text or not current["path"].exists():
+            current = self._render(text)
+        return current["path"] if current else None
+
+    def stats(self) -> dict:
+        current = self._current
+        return {
+            "warm": current is not None and current["text"] == day_summary.get()["text"],
+            "renders": self.renders,
+            "errors": self.errors,
+            "last_render_s": round(self.last_render_s, 3),
+        }
+
+    def _worker(self) -> None:
+        while True:
+            self._wake.wait()
+            # Let a burst of writes (e.g. one schedule request) settle before rendering.
+            time.sleep(self.debounce_s)
+            self._wake.clear()
+            current = self._current
+            text = day_summary.get()["text"]
+            if current is None or current["text"] != text:
+                self._render(text)
+
+    def _render(self, text: str) -> dict | None:
+        from backend.app.services.voice_service import synthesize_blocking
+
+        key = self.key(text)
+        path = self.audio_dir / f"briefing-{key}.ogg"
+        start = time.monotonic()
+        with self._render_lock:
+            try:
+                if not path.exists():
+                    self.audio_dir.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f".{path.name}.tmp")
+                    synthesize_blocking(text, str(tmp_path))
+                    os.replace(tmp_path, path)
+            except Exception:
+                self.errors += 1
+                return None
+            rendered = {"text": text, "key": key, "path": path}
+            with self._lock:
+                self._current = rendered
+            for old in self.audio_dir.glob("briefing-*.ogg"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        self.renders += 1
+        self.last_render_s = time.monotonic() - start
+        return rendered
+
+
+briefing_service = BriefingService(settings.briefing_dir)
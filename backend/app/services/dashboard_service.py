@@ -2,12 +2,13 @@
 
 from datetime import datetime
 from backend.app.db import queries
+from backend.app.services.day_summary import day_summary
 
 def build_dashboard() -> dict:
     """Return a snapshot of dashboard data for the API."""
     return {
         "now": datetime.now().isoformat(timespec="seconds"),
-        "today_summary": "MVP: SQLite connected.",
+        "today_summary": day_summary.get()["text"],
         "alerts": queries.get_alerts(),
         "next_task": queries.get_next_task(),
     }
@@ -0,0 +1,131 @@
+"""
+Materialised "what have I got today" summary: the structured day plan and its spoken
+text are built once per (date, change versions) and reused until a task, event,
+reminder or workday write bumps one of the versions.
+"""
+
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from backend.app.db.changes import version
+from backend.app.db.event_queries import list_events_for_date
+from backend.app.db.queries import list_open_tasks
+from backend.app.db.reminder_queries import list_active_reminders
+from backend.app.db.workday_queries import get_work_day
+
+TZ = ZoneInfo("Europe/London")
+WATCHED_COLLECTIONS = ("tasks", "events", "reminders", "workdays")
+MED_KEYS = {"lanny_zee", "morning_meds", "lunch_meds", "evening_meds"}
+
+
+def natural_time(hhmm: str | None) -> str:
+    if not hhmm:
+        return ""
+    try:
+        dt = datetime.strptime(hhmm, "%H:%M")
+        hour = dt.strftime("%I").lstrip("0") or "12"
+        minute = dt.strftime("%M")
+        suffix = dt.strftime("%p").lower()
+        if minute == "00":
+            return f"{hour} {suffix}"
+        return f"{hour}:{minute} {suffix}"
+    except Exception:
+        return hhmm
+
+
+def build_day_summary(day: str) -> dict:
+    """Query and format the day plan: workday, events, open tasks and non-med alerts."""
+    events = [dict(e) for e in list_events_for_date(day)]
+    tasks = list_open_tasks()
+    workday = get_work_day(day)
+    alerts = [
+        r
+        for r in list_active_reminders()
+        if not r["reminder_key"].startswith("event:") and r["reminder_key"] not in MED_KEYS
+    ]
+    alerts_by_label: dict[str, dict] = {}
+    for alert in alerts:
+        label = alert["label"].strip()
+        if label not in alerts_by_label:
+            alerts_by_label[label] = alert
+            continue
+        # Keep the earliest scheduled time for summary.
+        if alert["scheduled_hhmm"] < alerts_by_label[label]["scheduled_hhmm"]:
+            alerts_by_label[label] = alert
+    alerts = list(alerts_by_label.values())
+    event_lines = []
+    if workday and workday.get("is_work"):
+        work_start = natural_time(workday.get("start_hhmm") or "08:00")
+        work_end = natural_time(workday.get("end_hhmm") or "16:30")
+        event_lines.append(f"{work_start} until {work_end} — Work")
+    for e in events:
+        if e["all_day"]:
+            when = "all day"
+        elif e["start_hhmm"] and e["end_hhmm"]:
+            start = natural_time(e["start_hhmm"])
+            end = natural_time(e["end_hhmm"])
+            when = f"{start} until {end}"
+        else:
+            when = natural_time(e["start_hhmm"]) or "time TBD"
+        event_lines.append(f"{when} — {e['title']}")
+    task_lines = [t["title"] for t in tasks if t.get("status") == "todo"]
+    events_text = ", ".join(event_lines) if event_lines else "none"
+    tasks_text = ", ".join(task_lines) if task_lines else "none"
+    alert_lines = [f"{a['label']} ({natural_time(a['scheduled_hhmm'])})" for a in alerts]
+    alerts_text = ", ".join(alert_lines) if alert_lines else "none"
+    return {
+        "date": day,
+        "workday": workday,
+        "events": events,
+        "tasks": tasks,
+        "alerts": alerts,
+        "text": f"Today: Events: {events_text}. Tasks: {tasks_text}. Alerts: {alerts_text}.",
+    }
+
+
+class DaySummary:
+    """Cached `build_day_summary` for one day, keyed by the watched change versions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: tuple | None = None
+        self._value: dict | None = None
+        self.hits = 0
+        self.builds = 0
+
+    @staticmethod
+    def _key_for(day: str) -> tuple:
+        return (day, tuple(version(c) for c in WATCHED_COLLECTIONS))
+
+    def get(self, day: str | None = None) -> dict:
+        """Today's (or `day`'s) summary; callers must treat it as read-only."""
+        day = day or datetime.now(TZ).date().isoformat()
+        # Versions are read before querying, so a write racing the build leaves the
+        # entry stale and the next call rebuilds it.
+        key = self._key_for(day)
+        with self._lock:
+            if self._key == key and self._value is not None:
+                self.hits += 1
+                return self._value
+            value = build_day_summary(day)
+            self._key = key
+            self._value = value
+            self.builds += 1
+            return value
+
+    def rebuild(self, day: str | None = None) -> dict:
+        """Drop the cached entry and build it now (e.g. from `arm_today`)."""
+        with self._lock:
+            self._key = None
+        return self.get(day)
+
+    def stats(self) -> dict:
+        return {
+            "date": self._key[0] if self._key else None,
+            "hits": self.hits,
+            "builds": self.builds,
+        }
+
+
+day_summary = DaySummary()
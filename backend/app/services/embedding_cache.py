@@ -0,0 +1,137 @@
+"""Embedding cache so repeated prompts and memories don't cost an embeddings round trip."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from backend.app.db.embedding_queries import (
+    get_cached_embeddings,
+    prune_embedding_cache,
+    put_cached_embeddings,
+)
+from backend.app.services.caching import SingleFlight, TTLCache
+
+_TRAILING_PUNCT_RE = re.compile(r"[\s.!?,;:]+$")
+
+
+def _frozen(embedding) -> np.ndarray:
+    """Own float32 copy, read-only so callers cannot corrupt the shared cache entry."""
+    vector = np.array(embedding, dtype=np.float32)
+    vector.flags.writeable = False
+    return vector
+
+
+def normalize_text(text: str) -> str:
+    """Casefold, collapse whitespace and drop trailing punctuation ("How are you?" == "how are you")."""
+    collapsed = " ".join(text.casefold().split())
+    return _TRAILING_PUNCT_RE.sub("", collapsed)
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + `embedding_cache` table) cache keyed by (model, normalised text).
+    Concurrent requests for the same text share one API call; misses in a batch are
+    embedded with a single `embeddings.create` request. Entries are read-only float32
+    arrays (the `memory_index` BLOB format), returned as-is without copying.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_rows: int = 20_000, persist: bool = True):
+        self.max_rows = max_rows
+        self.persist = persist
+        self._memory = TTLCache(max_entries)
+        self._inflight = SingleFlight()
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.api_requests = 0
+        self.api_texts = 0
+        self._writes = 0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+    def embed(self, client, text: str, model: str) -> np.ndarray:
+        """Embed one text, sharing in-flight API calls for identical prompts."""
+        text_key = self.key(text)
+        cached = self._memory.get((model, text_key))
+        if cached is not None:
+            return cached
+        return self._inflight.do(
+            (model, text_key), lambda: self._embed_missing(client, model, {text_key: text})[text_key]
+        )
+
+    def embed_many(self, client, texts: list[str], model: str) -> list[np.ndarray]:
+        """Embed several texts; cache misses go out as one batched request."""
+        keys = [self.key(text) for text in texts]
+        found: dict[str, np.ndarray] = {}
+        missing: dict[str, str] = {}
+        for text_key, text in zip(keys, texts):
+            if text_key in found or text_key in missing:
+                continue
+            cached = self._memory.get((model, text_key))
+            if cached is not None:
+                found[text_key] = cached
+            else:
+                missing[text_key] = text
+        if missing:
+            found.update(self._embed_missing(client, model, missing))
+        return [found[text_key] for text_key in keys]
+
+    def stats(self) -> dict:
+        return {
+            **self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "shared_inflight": self._inflight.shared,
+            "api_requests": self.api_requests,
+            "api_texts": self.api_texts,
+        }
+
+    def _embed_missing(self, client, model: str, missing: dict[str, str]) -> dict[str, np.ndarray]:
+        """Resolve memory misses from SQLite, then embed whatever is left in one request."""
+        found = self._read_disk(model, list(missing))
+        with self._lock:
+            self.disk_hits += len(found)
+        remaining = [k for k in missing if k not in found]
+        if remaining:
+            response = client.embeddings.create(
+                model=model, input=[missing[k] for k in remaining]
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            fetched = {k: _frozen(item.embedding) for k, item in zip(remaining, data)}
+            with self._lock:
+                self.api_requests += 1
+                self.api_texts += len(remaining)
+            self._write_disk(model, fetched)
+            found.update(fetched)
+        for text_key, embedding in found.items():
+            self._memory.set((model, text_key), embedding)
+        return found
+
+    def _read_disk(self, model: str, text_keys: list[str]) -> dict[str, np.ndarray]:
+        if not self.persist:
+            return {}
+        try:
+            return {k: _frozen(v) for k, v in get_cached_embeddings(model, text_keys).items()}
+        except sqlite3.Error:
+            return {}
+
+    def _write_disk(self, model: str, items: dict[str, np.ndarray]) -> None:
+        if not self.persist:
+            return
+        try:
+            put_cached_embeddings(model, items)
+            with self._lock:
+                self._writes += len(items)
+                prune = self._writes >= 256
+                if prune:
+                    self._writes = 0
+            if prune:
+                prune_embedding_cache(self.max_rows)
+        except sqlite3.Error:
+            pass
+
+
+embedding_cache = EmbeddingCache()
@@ -1,9 +1,10 @@
 """Event reminder scheduling logic (monthly → weekly → day-before cadence)."""
 
-from datetime import date as Date, datetime
+from datetime import date as Date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from backend.app.db.event_queries import list_events_from_date
+from backend.app.db.recurrence import next_occurrence
 from backend.app.db.reminder_queries import create_active_for_date
 
 TZ = ZoneInfo("Europe/London")
@@ -39,14 +40,21 @@ def _reminder_time(start_hhmm: str | None, all_day: bool, days_until: int) -> st
         return start_hhmm
     return "09:00"
 
-def create_event_reminders_for_date(date_yyyy_mm_dd: str) -> None:
-    """Create active reminders for events relative to `date_yyyy_mm_dd`."""
+def plan_event_reminders(events, date_yyyy_mm_dd: str) -> list[dict]:
+    """Reminder rows (reminder_active columns) due on `date_yyyy_mm_dd`, at most one per event or series."""
     today = Date.fromisoformat(date_yyyy_mm_dd)
-    events = list_events_from_date(date_yyyy_mm_dd)
+    planned = []
     for e in events:
         if e["title"].strip().lower() == "work":
             continue
-        event_date = Date.fromisoformat(e["event_date"])
+        if e["rrule"]:
+            # A series is planned against its next occurrence after today, so the scan
+            # costs the same for a week-long series as for a year-long one.
+            event_date = next_occurrence(e, today + timedelta(days=1))
+            if event_date is None:
+                continue
+        else:
+            event_date = Date.fromisoformat(e["event_date"])
         preset = e["reminder_preset"] or "standard"
         if not _should_remind_today(event_date, today, preset):
             continue
@@ -67,13 +75,28 @@ def create_event_reminders_for_date(date_yyyy_mm_dd: str) -> None:
         time_range = ""
         if e["start_hhmm"] and e["end_hhmm"]:
             time_range = f" ({e['start_hhmm']}-{e['end_hhmm']})"
-        speak_text = f"{e['title']}{time_range} {when}"
-        reminder_key = f"event:{e['id']}:{date_yyyy_mm_dd}"
+        planned.append(
+            {
+                "reminder_key": f"event:{e['id']}:{date_yyyy_mm_dd}",
+                "label": e["title"],
+                "speak_text": f"{e['title']}{time_range} {when}",
+                "dose_date": date_yyyy_mm_dd,
+                "scheduled_hhmm": scheduled_hhmm,
+                "next_fire_at": fire_dt.isoformat(timespec="seconds"),
+            }
+        )
+    return planned
+
+def create_event_reminders_for_date(date_yyyy_mm_dd: str, events=None) -> None:
+    """Create active reminders for events (default: all upcoming) relative to `date_yyyy_mm_dd`."""
+    if events is None:
+        events = list_events_from_date(date_yyyy_mm_dd)
+    for r in plan_event_reminders(events, date_yyyy_mm_dd):
         create_active_for_date(
-            reminder_key=reminder_key,
-            label=e["title"],
-            speak_text=speak_text,
-            dose_date=date_yyyy_mm_dd,
-            scheduled_hhmm=scheduled_hhmm,
-            next_fire_at_iso=fire_dt.isoformat(timespec="seconds"),
+            reminder_key=r["reminder_key"],
+            label=r["label"],
+            speak_text=r["speak_text"],
+            dose_date=r["dose_date"],
+            scheduled_hhmm=r["scheduled_hhmm"],
+            next_fire_at_iso=r["next_fire_at"],
         )
@@ -0,0 +1,175 @@
+"""
+Conversation history for `/api/ai/respond` within a token budget: the newest turns go
+to the model verbatim, and older turns from the 24h window are folded in the background
+into a rolling summary kept in the `ai_history_summary` table.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+from backend.app.db.ai_queries import (
+    add_ai_message,
+    get_history_summary,
+    list_ai_messages_since,
+    set_history_summary,
+)
+
+SUMMARY_PROMPT = (
+    "You keep a running summary of a conversation between Dad and Sam, his assistant. "
+    "Merge the new messages into the current summary. Keep facts, requests, decisions and "
+    "open questions; drop small talk. Reply with the updated summary only, under {words} words."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4 + 1
+
+
+class HistoryManager:
+    """Ring buffer of the recent chat window plus the persisted rolling summary."""
+
+    def __init__(self, window_s: float = 86400.0, max_messages: int = 500, summary_words: int = 200):
+        self.window_s = window_s
+        self.summary_words = summary_words
+        self._buffer: deque[dict] = deque(maxlen=max_messages)
+        self._summary: dict | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._folding = False
+        self.folds = 0
+        self.fold_errors = 0
+        self.last_context_tokens = 0
+        self.last_verbatim_turns = 0
+
+    def _ensure_loaded(self, since: str) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._buffer.extend(list_ai_messages_since(since))
+                self._summary = get_history_summary()
+                self._loaded = True
+
+    def _since(self, now: datetime) -> str:
+        return (now - timedelta(seconds=self.window_s)).isoformat(timespec="seconds")
+
+    def append(self, role: str, content: str, created_at: str) -> None:
+        """Persist a chat message and add it to the in-memory window."""
+        message_id = add_ai_message(role, content, created_at)
+        if self._loaded:
+            with self._lock:
+                self._buffer.append(
+                    {"id": message_id, "role": role, "content": content, "created_at": created_at}
+                )
+
+    def recent(self, now: datetime) -> list[dict]:
+        """Messages from the last `window_s` seconds (UTC `now`), oldest first."""
+        since = self._since(now)
+        self._ensure_loaded(since)
+        with self._lock:
+            while self._buffer and self._buffer[0]["created_at"] < since:
+                self._buffer.popleft()
+            return list(self._buffer)
+
+    def context(
+        self,
+        history: list[dict],
+        client,
+        model: str,
+        token_budget: int = 1500,
+        keep_turns: int = 12,
+    ) -> tuple[str | None, list[dict]]:
+        """
+        Return (rolling summary, verbatim turns) for `history` within `token_budget`.
+        Unsummarised turns that no longer fit are folded into the summary in the
+        background, so they reach the model from the next request on.
+        """
+        since = history[0]["created_at"] if history else ""
+        with self._lock:
+            summary = self._summary
+        # A summary whose newest message left the window only describes an old conversation.
+        if summary is not None and summary["covered_until"] < since:
+            summary = None
+        # Folded messages are tracked by id: timestamps only have one-second resolution.
+        covered_id = summary["covered_id"] if summary else 0
+        unfolded = [m for m in history if m["id"] > covered_id]
+
+        budget_left = token_budget - (estimate_tokens(summary["summary"]) if summary else 0)
+        turns: list[dict] = []
+        for message in reversed(unfolded):
+            if len(turns) >= keep_turns:
+                break
+            cost = estimate_tokens(message["content"])
+            if turns and cost > budget_left:
+                break
+            turns.append(message)
+            budget_left -= cost
+        turns.reverse()
+
+        overflow = unfolded[: len(unfolded) - len(turns)]
+        if overflow:
+            self._schedule_fold(client, model, summary, overflow)
+        self.last_context_tokens = token_budget - budget_left
+        self.last_verbatim_turns = len(turns)
+        return (
+            summary["summary"] if summary else None,
+            [{"role": m["role"], "content": m["content"]} for m in turns],
+        )
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "summary_tokens": estimate_tokens(self._summary["summary"]) if self._summary else 0,
+            "folds": self.folds,
+            "fold_errors": self.fold_errors,
+            "folding": self._folding,
+            "last_context_tokens": self.last_context_tokens,
+            "last_verbatim_turns": self.last_verbatim_turns,
+        }
+
+    def _schedule_fold(self, client, model: str, summary: dict | None, messages: list[dict]) -> None:
+        with self._lock:
+            if self._folding:
+                return
+            self._folding = True
+        threading.Thread(
+            target=self._fold, args=(client, model, summary, messages), daemon=True
+        ).start()
+
+    def _fold(self, client, model: str, summary: dict | None, messages: list[dict]) -> None:
+        """Merge `messages` into the summary with one LLM call and persist it."""
+        try:
+            lines = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+            current = summary["summary"] if summary else "(none yet)"
+            response = client.responses.create(
+                model=model,
+                input=[
+                    {"role": "system", "content": SUMMARY_PROMPT.format(words=self.summary_words)},
+                    {
+                        "role": "user",
+                        "content": f"Current summary:\n{current}\n\nNew messages:\n{lines}",
+                    },
+                ],
+                store=False,
+            )
+            text = (response.output_text or "").strip()
+            if text:
+                folded = {
+                    "summary": text,
+                    "covered_until": messages[-1]["created_at"],
+                    "covered_id": messages[-1]["id"],
+                }
+                set_history_summary(folded["summary"], folded["covered_until"], folded["covered_id"])
+                with self._lock:
+                    self._summary = folded
+                self.folds += 1
+        except Exception:
+            self.fold_errors += 1
+        finally:
+            with self._lock:
+                self._folding = False
+
+
+history_manager = HistoryManager()
@@ -0,0 +1,295 @@
+"""
+Fuzzy title matching for tasks, reminders and events over persistent token -> item
+inverted indexes. The indexes are built on first use and kept current from
+`db.changes` notifications, so a lookup only scores items sharing a token with the prompt.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from backend.app.db.changes import subscribe
+from backend.app.db.event_queries import get_event, list_events_from_date
+from backend.app.db.queries import get_task, list_open_tasks
+from backend.app.db.reminder_queries import get_reminder, list_active_reminders
+
+TZ = ZoneInfo("Europe/London")
+MATCH_THRESHOLD = 0.3
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_PRIORITY_RANK = {"vital": 0, "medium": 1, "trivial": 2}
+
+
+def tokenize(text: str) -> list[str]:
+    normalized = text.lower()
+    normalized = normalized.replace("docs", "doctors")
+    normalized = normalized.replace("doc", "doctor")
+    return _TOKEN_RE.findall(normalized)
+
+
+@lru_cache(maxsize=4096)
+def _title_tokens(title: str) -> frozenset[str]:
+    return frozenset(tokenize(title))
+
+
+def _ranked(scored: list[tuple[float, dict]]) -> list[dict]:
+    # Stable sort: equal scores keep the candidate order.
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+    return [{"score": score, "item": item} for score, item in scored]
+
+
+def rank_items(prompt: str, candidates: list[dict], key: str) -> list[dict]:
+    """Score an ad-hoc candidate list (e.g. recent reminders); items without any shared token are dropped."""
+    prompt_tokens = set(tokenize(prompt))
+    scored = []
+    for item in candidates:
+        title_tokens = _title_tokens(str(item.get(key, "")))
+        overlap = len(prompt_tokens.intersection(title_tokens))
+        if overlap:
+            scored.append((overlap / len(title_tokens), item))
+    return _ranked(scored)
+
+
+def best_item(prompt: str, candidates: list[dict], key: str) -> tuple[dict | None, float]:
+    ranked = rank_items(prompt, candidates, key)
+    if ranked and ranked[0]["score"] >= MATCH_THRESHOLD:
+        return ranked[0]["item"], ranked[0]["score"]
+    return None, 0.0
+
+
+class ItemView:
+    """
+    Immutable point-in-time view of an `ItemIndex`. The index copies its containers
+    before changing them once a view is out, so lookups here never see later writes.
+    """
+
+    def __init__(self, index: "ItemIndex"):
+        self._index = index
+        self._items = index._items
+        self._tokens = index._tokens
+        self._postings = index._postings
+
+    def rank(self, prompt: str, where: Callable[[dict], bool] | None = None) -> list[dict]:
+        """`[{"score", "item"}]` for items sharing a token with `prompt`, best first."""
+        include = self._index._include
+        overlaps: dict[int, int] = {}
+        for token in set(tokenize(prompt)):
+            for item_id in self._postings.get(token, ()):
+                overlaps[item_id] = overlaps.get(item_id, 0) + 1
+        self._index._count_lookup(len(overlaps))
+        scored = []
+        for item_id, overlap in overlaps.items():
+            item = self._items[item_id]
+            if not include(item) or (where is not None and not where(item)):
+                continue
+            scored.append((overlap / len(self._tokens[item_id]), dict(item)))
+        scored.sort(key=lambda entry: self._index._order(entry[1]))
+        return _ranked(scored)
+
+    def best(
+        self, prompt: str, where: Callable[[dict], bool] | None = None
+    ) -> tuple[dict | None, float]:
+        """Best-scoring item at or above `MATCH_THRESHOLD`, else `(None, 0.0)`."""
+        ranked = self.rank(prompt, where)
+        if ranked and ranked[0]["score"] >= MATCH_THRESHOLD:
+            return ranked[0]["item"], ranked[0]["score"]
+        return None, 0.0
+
+    def items(self, where: Callable[[dict], bool] | None = None) -> list[dict]:
+        """All indexed items (copies) in list order, optionally filtered."""
+        include = self._index._include
+        items = [
+            dict(item)
+            for item in self._items.values()
+            if include(item) and (where is None or where(item))
+        ]
+        items.sort(key=self._index._order)
+        return items
+
+    def get(self, item_id: int) -> dict | None:
+        item = self._items.get(item_id)
+        return dict(item) if item is not None and self._index._include(item) else None
+
+    def count(self) -> int:
+        include = self._index._include
+        return sum(1 for item in self._items.values() if include(item))
+
+
+class ItemIndex:
+    """
+    Inverted index over one item table. Change notifications only mark ids as pending;
+    they are re-read by id on the next lookup, and bulk changes trigger a full rebuild.
+    Lookups run on an `ItemView`; `view()` hands one out for a caller to keep.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        key: str,
+        load_all: Callable[[sqlite3.Connection | None], list[dict]],
+        load_one: Callable[[int, sqlite3.Connection | None], dict | None],
+        include: Callable[[dict], bool],
+        order: Callable[[dict], tuple],
+        max_age_s: float = 300.0,
+    ):
+        self.collection = collection
+        self.key = key
+        self._load_all = load_all
+        self._load_one = load_one
+        self._include = include
+        self._order = order
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._items: dict[int, dict] = {}
+        self._tokens: dict[int, frozenset[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._shared = False
+        self._pending: set[int] = set()
+        self._stale = True
+        self._built_at = 0.0
+        self.rebuilds = 0
+        self.updates = 0
+        self.lookups = 0
+        self.scored = 0
+        subscribe(collection, self._on_change)
+
+    def _on_change(self, op: str, item_id: int | None) -> None:
+        with self._lock:
+            if item_id is None:
+                self._stale = True
+            else:
+                self._pending.add(item_id)
+
+    def _add(self, item: dict) -> None:
+        tokens = _title_tokens(str(item.get(self.key, "")))
+        self._items[item["id"]] = item
+        self._tokens[item["id"]] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(item["id"])
+
+    def _remove(self, item_id: int) -> None:
+        self._items.pop(item_id, None)
+        for token in self._tokens.pop(item_id, ()):
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._postings[token]
+
+    def _refresh(self, conn: sqlite3.Connection | None = None) -> None:
+        """Apply pending changes; callers hold the lock."""
+        # Periodic rebuilds also pick up writes that bypassed the db helpers.
+        if self._stale or time.monotonic() - self._built_at >= self.max_age_s:
+            self._items = {}
+            self._tokens = {}
+            self._postings = {}
+            self._shared = False
+            self._pending.clear()
+            for item in self._load_all(conn):
+                self._add(dict(item))
+            self._stale = False
+            self._built_at = time.monotonic()
+            self.rebuilds += 1
+            return
+        if self._pending and self._shared:
+            # Copy on write: views already handed out keep the old containers.
+            self._items = dict(self._items)
+            self._tokens = dict(self._tokens)
+            self._postings = {token: set(ids) for token, ids in self._postings.items()}
+            self._shared = False
+        while self._pending:
+            item_id = self._pending.pop()
+            self._remove(item_id)
+            item = self._load_one(item_id, conn)
+            if item is not None and self._include(item):
+                self._add(item)
+            self.updates += 1
+
+    def _count_lookup(self, scored: int) -> None:
+        with self._lock:
+            self.lookups += 1
+            self.scored += scored
+
+    def view(self, conn: sqlite3.Connection | None = None) -> ItemView:
+        """Bring the index up to date, reading through `conn` if given, and freeze it."""
+        with self._lock:
+            self._refresh(conn)
+            self._shared = True
+            return ItemView(self)
+
+    def rank(self, prompt: str, where: Callable[[dict], bool] | None = None) -> list[dict]:
+        return self.view().rank(prompt, where)
+
+    def best(
+        self, prompt: str, where: Callable[[dict], bool] | None = None
+    ) -> tuple[dict | None, float]:
+        return self.view().best(prompt, where)
+
+    def items(self, where: Callable[[dict], bool] | None = None) -> list[dict]:
+        return self.view().items(where)
+
+    def get(self, item_id: int) -> dict | None:
+        return self.view().get(item_id)
+
+    def count(self) -> int:
+        return self.view().count()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._items),
+            "tokens": len(self._postings),
+            "rebuilds": self.rebuilds,
+            "updates": self.updates,
+            "lookups": self.lookups,
+            "scored": self.scored,
+        }
+
+
+def _today() -> str:
+    return datetime.now(TZ).date().isoformat()
+
+
+def _date_desc(value: str | None) -> int:
+    try:
+        return -date.fromisoformat(value or "").toordinal()
+    except ValueError:
+        return 0
+
+
+tasks_index = ItemIndex(
+    "tasks",
+    "title",
+    load_all=list_open_tasks,
+    load_one=get_task,
+    include=lambda t: t.get("status") == "todo",
+    order=lambda t: (_PRIORITY_RANK.get(t.get("priority"), 3), t["id"]),
+)
+reminders_index = ItemIndex(
+    "reminders",
+    "label",
+    load_all=list_active_reminders,
+    load_one=get_reminder,
+    include=lambda r: r.get("status") == "active",
+    order=lambda r: (_date_desc(r.get("dose_date")), r.get("scheduled_hhmm") or "", r["id"]),
+)
+events_index = ItemIndex(
+    "events",
+    "title",
+    load_all=lambda conn: [dict(e) for e in list_events_from_date(_today(), conn)],
+    load_one=get_event,
+    include=lambda e: (e.get("event_date") or "") >= _today()
+    or (bool(e.get("rrule")) and (e.get("until_date") or "9999-12-31") >= _today()),
+    order=lambda e: (e.get("event_date") or "", e["id"]),
+)
+
+
+def matcher_stats() -> dict:
+    return {
+        "tasks": tasks_index.stats(),
+        "reminders": reminders_index.stats(),
+        "events": events_index.stats(),
+    }
@@ -0,0 +1,189 @@
+"""
+Background memory extraction for `/api/ai/respond`: turns are queued after the reply
+is sent, and a worker extracts memories over several turns at once, embeds them in
+one request. `run_memory_maintenance` (a scheduler job) flushes buffered `last_used_at`
+touches and prunes the memory tables.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from backend.app.db.ai_queries import (
+    add_ai_memory,
+    flush_ai_memory_touches,
+    prune_ai_memories,
+)
+from backend.app.db.people_queries import add_relationships
+from backend.app.services.embedding_cache import embedding_cache
+from backend.app.services.people_profile import parse_family_memory
+
+MEMORY_PROMPT = (
+    "Extract long-term memories worth saving about projects, relationships, "
+    "preferences (likes/dislikes) and ongoing goals. Family identity facts "
+    "(\"My son is Tom\") may be returned as one short sentence each in that form. "
+    "Do NOT save schedules, calendar details, workday swaps, "
+    "or pronunciation instructions. Return a JSON array of sentences; short memories "
+    "should be under 50 words. Longer memories can be any length. If none, return []."
+)
+
+
+class MemoryPipeline:
+    """Bounded queue of chat turns drained by one daemon worker in small batches."""
+
+    def __init__(
+        self,
+        max_pending: int = 64,
+        batch_turns: int = 8,
+        batch_wait_s: float = 2.0,
+    ):
+        self.batch_turns = batch_turns
+        self.batch_wait_s = batch_wait_s
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.turns = 0
+        self.batches = 0
+        self.memories_added = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_batch_s = 0.0
+
+    def submit(self, client, prompt: str, memory_model: str, embedding_model: str) -> bool:
+        """Queue one user turn for extraction; returns False if the queue is full."""
+        self._ensure_worker()
+        job = {
+            "client": client,
+            "prompt": prompt,
+            "memory_model": memory_model,
+            "embedding_model": embedding_model,
+        }
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def drain(self, timeout_s: float = 5.0) -> bool:
+        """Wait (up to `timeout_s`) for queued turns to be processed, e.g. at shutdown."""
+        deadline = time.monotonic() + timeout_s
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "turns": self.turns,
+            "batches": self.batches,
+            "memories_added": self.memories_added,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_batch_s": round(self.last_batch_s, 3),
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        """Continuously pull turns off the queue and process them in batches."""
+        while True:
+            batch = [self._queue.get()]  # blocks
+            deadline = time.monotonic() + self.batch_wait_s
+            while len(batch) < self.batch_turns:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            start = time.monotonic()
+            try:
+                self._process(batch)
+            except Exception:
+                self.errors += 1
+            finally:
+                self.last_batch_s = time.monotonic() - start
+                self.batches += 1
+                self.turns += len(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process(self, batch: list[dict]) -> None:
+        latest = batch[-1]
+        client = latest["client"]
+        prompts = [job["prompt"] for job in batch]
+        if len(prompts) == 1:
+            content = prompts[0]
+        else:
+            content = "Messages from Dad:\n" + "\n".join(f"- {p}" for p in prompts)
+        memory_resp = client.responses.create(
+            model=latest["memory_model"],
+            input=[
+                {"role": "system", "content": MEMORY_PROMPT},
+                {"role": "user", "content": content},
+            ],
+            store=False,
+        )
+        items = json.loads(memory_resp.output_text or "[]")
+        if isinstance(items, list):
+            cleaned_items = list(
+                dict.fromkeys(
+                    item.strip() for item in items if isinstance(item, str) and item.strip()
+                )
+            )
+            # Identity sentences ("My son is Tom.") go to the typed relationship store
+            # instead of being embedded as free-text memories.
+            facts = []
+            free_text = []
+            for cleaned in cleaned_items:
+                matches = parse_family_memory(cleaned)
+                if matches:
+                    facts.extend((name, rel, None) for name, rel in matches)
+                else:
+                    free_text.append(cleaned)
+            if facts:
+                add_relationships(facts)
+            if not free_text:
+                return
+            try:
+                embeddings = embedding_cache.embed_many(
+                    client, free_text, latest["embedding_model"]
+                )
+            except Exception:
+                embeddings = [None] * len(free_text)
+            for cleaned, emb in zip(free_text, embeddings):
+                if add_ai_memory(cleaned, embedding=emb) is not None:
+                    self.memories_added += 1
+
+memory_pipeline = MemoryPipeline()
+
+_maintenance = {"runs": 0, "touches_flushed": 0, "pruned": 0, "last_run_s": 0.0}
+
+
+def run_memory_maintenance() -> dict:
+    """Flush buffered memory touches, then trim each memory kind to its limit."""
+    start = time.monotonic()
+    flushed = flush_ai_memory_touches()
+    pruned = len(prune_ai_memories("short", int(os.getenv("AI_MEMORY_SHORT_MAX", "20000"))))
+    pruned += len(prune_ai_memories("long", int(os.getenv("AI_MEMORY_LONG_MAX", "10000"))))
+    _maintenance["runs"] += 1
+    _maintenance["touches_flushed"] += flushed
+    _maintenance["pruned"] += pruned
+    _maintenance["last_run_s"] = round(time.monotonic() - start, 3)
+    return {"touches_flushed": flushed, "pruned": pruned}
+
+
+def maintenance_stats() -> dict:
+    return dict(_maintenance)
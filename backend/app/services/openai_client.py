@@ -0,0 +1,274 @@
+"""
+Process-wide OpenAI clients (sync + async) sharing one keep-alive connection pool each,
+with per-call deadlines, bounded retries with jitter and a circuit breaker so that
+an unhealthy upstream fails fast to the local fallbacks.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Transient upstream failures worth retrying (and counting against the breaker).
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the upstream while the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; after `reset_after_s`
+    one trial call is let through (half-open) and its outcome closes or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after_s = reset_after_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_after_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class _RetryPolicy:
+    def __init__(self, timeout_s: float, deadline_s: float, max_retries: int, backoff_s: float):
+        self.timeout_s = timeout_s
+        self.deadline_s = deadline_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.retries = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, self.backoff_s * (2**attempt))
+
+
+class _Resource:
+    """`client.responses` / `client.embeddings` proxy whose `create` is guarded."""
+
+    def __init__(self, owner: "GuardedOpenAI", raw):
+        self._owner = owner
+        self._raw = raw
+
+    def create(self, *, deadline_s: float | None = None, **kwargs):
+        return self._owner._call(self._raw.create, kwargs, deadline_s)
+
+
+class _AsyncResource:
+    def __init__(self, owner: "AsyncGuardedOpenAI", raw):
+        self._owner = owner
+        self._raw = raw
+
+    async def create(self, *, deadline_s: float | None = None, **kwargs):
+        return await self._owner._call(self._raw.create, kwargs, deadline_s)
+
+
+class GuardedOpenAI:
+    """Sync client wrapper exposing `.responses` and `.embeddings` with deadlines/retries/breaker."""
+
+    def __init__(self, client: OpenAI, breaker: CircuitBreaker, policy: _RetryPolicy):
+        self.raw = client
+        self.breaker = breaker
+        self.policy = policy
+        self.responses = _Resource(self, client.responses)
+        self.embeddings = _Resource(self, client.embeddings)
+
+    def _call(self, fn, kwargs: dict, deadline_s: float | None):
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenAI circuit open")
+        deadline = time.monotonic() + (deadline_s or self.policy.deadline_s)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                result = fn(**kwargs, timeout=min(self.policy.timeout_s, max(remaining, 0.1)))
+            except RETRYABLE_ERRORS:
+                delay = self.policy.backoff(attempt)
+                if attempt >= self.policy.max_retries or time.monotonic() + delay >= deadline:
+                    self.policy.failures += 1
+                    self.breaker.record_failure()
+                    raise
+                attempt += 1
+                self.policy.retries += 1
+                time.sleep(delay)
+                continue
+            except Exception:
+                # Client-side errors (bad request, auth) say nothing about upstream health.
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+class AsyncGuardedOpenAI:
+    """Async counterpart of `GuardedOpenAI`; shares its breaker and retry policy."""
+
+    def __init__(self, client: AsyncOpenAI, breaker: CircuitBreaker, policy: _RetryPolicy):
+        self.raw = client
+        self.breaker = breaker
+        self.policy = policy
+        self.responses = _AsyncResource(self, client.responses)
+        self.embeddings = _AsyncResource(self, client.embeddings)
+
+    async def _call(self, fn, kwargs: dict, deadline_s: float | None):
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenAI circuit open")
+        deadline = time.monotonic() + (deadline_s or self.policy.deadline_s)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                result = await fn(
+                    **kwargs, timeout=min(self.policy.timeout_s, max(remaining, 0.1))
+                )
+            except RETRYABLE_ERRORS:
+                delay = self.policy.backoff(attempt)
+                if attempt >= self.policy.max_retries or time.monotonic() + delay >= deadline:
+                    self.policy.failures += 1
+                    self.breaker.record_failure()
+                    raise
+                attempt += 1
+                self.policy.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+_lock = threading.Lock()
+_breaker: CircuitBreaker | None = None
+_policy: _RetryPolicy | None = None
+_sync_client: GuardedOpenAI | None = None
+_async_client: AsyncGuardedOpenAI | None = None
+
+
+def _shared_settings() -> tuple[CircuitBreaker, _RetryPolicy, httpx.Limits, httpx.Timeout]:
+    global _breaker, _policy
+    timeout_s = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("OPENAI_BREAKER_FAILURES", "5")),
+            reset_after_s=float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30")),
+        )
+    if _policy is None:
+        _policy = _RetryPolicy(
+            timeout_s=timeout_s,
+            deadline_s=float(os.getenv("OPENAI_DEADLINE_SECONDS", "30")),
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+            backoff_s=float(os.getenv("OPENAI_RETRY_BACKOFF_SECONDS", "0.25")),
+        )
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=60.0,
+    )
+    timeout = httpx.Timeout(
+        timeout_s, connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))
+    )
+    return _breaker, _policy, limits, timeout
+
+
+def get_openai_client(api_key: str) -> GuardedOpenAI:
+    """Return the process-wide sync client (built on first use)."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                breaker, policy, limits, timeout = _shared_settings()
+                client = OpenAI(
+                    api_key=api_key,
+                    timeout=timeout,
+                    max_retries=0,  # retries are handled by the wrapper, within the deadline
+                    http_client=DefaultHttpxClient(limits=limits, timeout=timeout),
+                )
+                _sync_client = GuardedOpenAI(client, breaker, policy)
+    return _sync_client
+
+
+def get_async_openai_client(api_key: str) -> AsyncGuardedOpenAI:
+    """Return the process-wide async client (built on first use)."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                breaker, policy, limits, timeout = _shared_settings()
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    timeout=timeout,
+                    max_retries=0,
+                    http_client=DefaultAsyncHttpxClient(limits=limits, timeout=timeout),
+                )
+                _async_client = AsyncGuardedOpenAI(client, breaker, policy)
+    return _async_client
+
+
+def client_stats() -> dict:
+    """Breaker state plus retry/failure counters for `/api/ai/stats`."""
+    if _breaker is None or _policy is None:
+        return {"state": "closed", "initialised": False}
+    return {
+        **_breaker.stats(),
+        "retries": _policy.retries,
+        "failures": _policy.failures,
+        "initialised": True,
+    }
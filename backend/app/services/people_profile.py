@@ -0,0 +1,106 @@
+"""
+Typed view of who is who: relationships captured from chat are read once per change
+of the `people` tables and served as the family answer and a compact prompt block.
+"""
+
+import re
+import threading
+
+from backend.app.db.changes import version
+from backend.app.db.people_queries import (
+    FAMILY_RELATIONS,
+    add_relationships,
+    list_relationships,
+)
+from backend.app.db.search_queries import search_items
+
+# Identity sentences saved as free-text memories before the people tables existed.
+_LEGACY_PATTERNS = (
+    (re.compile(r"^(?P<names>.+?) (?:is|are) my (?P<rel>[A-Za-z ]+)\.?$", re.IGNORECASE), ""),
+    (re.compile(r"^my (?P<rel>[A-Za-z ]+) (?:is|are) (?P<names>.+?)\.?$", re.IGNORECASE), ""),
+    (re.compile(r"^the (?P<rel>[A-Za-z ]+) is named (?P<names>.+?)\.?$", re.IGNORECASE), ""),
+    (
+        re.compile(r"^the family has (?P<rel>[A-Za-z ]+) named (?P<names>.+?)\.?$", re.IGNORECASE),
+        "twin ",
+    ),
+)
+
+
+def parse_family_memory(summary: str) -> list[tuple[str, str]]:
+    """(name, relation) pairs stated by a legacy identity memory, family relations only."""
+    for pattern, drop in _LEGACY_PATTERNS:
+        match = pattern.match(summary.strip())
+        if not match:
+            continue
+        rel = match.group("rel").strip().lower()
+        if drop:
+            rel = rel.replace(drop, "")
+        rel = rel[:-1] if rel.endswith("s") else rel
+        if rel not in FAMILY_RELATIONS:
+            return []
+        names = [n.strip() for n in re.split(r",| and ", match.group("names"))]
+        return [(name, rel) for name in names if name]
+    return []
+
+
+class PeopleProfile:
+    """Relationships cached until the next write to the `people` tables."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._relationships: list[dict] = []
+        self._imported = False
+        self.hits = 0
+        self.loads = 0
+
+    def _import_legacy(self) -> None:
+        """
+        Copy family facts from free-text memories saved before the people tables existed,
+        once per process (idempotent); new ones are added as the memory pipeline stores them.
+        """
+        memories = search_items(" ".join(FAMILY_RELATIONS), kinds=("memory",), limit=200)
+        facts = [
+            (name, rel, None)
+            for memory in memories
+            for name, rel in parse_family_memory(memory.get("summary", ""))
+        ]
+        if facts:
+            add_relationships(facts)
+
+    def relationships(self) -> list[dict]:
+        with self._lock:
+            if not self._imported:
+                self._imported = True
+                self._import_legacy()
+            current = version("people")
+            if self._version == current:
+                self.hits += 1
+                return self._relationships
+            self._relationships = list_relationships()
+            self._version = current
+            self.loads += 1
+            return self._relationships
+
+    def family_text(self) -> str:
+        members = [
+            f"{r['name']} ({r['relation']})"
+            for r in self.relationships()
+            if r["owner"] is None and r["relation"] in FAMILY_RELATIONS
+        ]
+        if not members:
+            return "I don't have any family details saved yet."
+        return "Your family includes " + ", ".join(["you (Dad)", *members]) + "."
+
+    def prompt_block(self) -> str | None:
+        """One line per relationship, e.g. "- Tom: Dad's son", or None if nobody is known."""
+        lines = [
+            f"- {r['name']}: {r['owner'] or 'Dad'}'s {r['relation']}" for r in self.relationships()
+        ]
+        return "People:\n" + "\n".join(lines) if lines else None
+
+    def stats(self) -> dict:
+        return {"relationships": len(self._relationships), "hits": self.hits, "loads": self.loads}
+
+
+people_profile = PeopleProfile()
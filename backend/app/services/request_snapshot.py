@@ -0,0 +1,111 @@
+"""
+Request-scoped unit of work for `/api/ai/resolve`: each collection the handler reads is
+loaded at most once, through one connection inside one read transaction, and a write
+only marks the collection it touched for reloading. Between those points the request
+sees a frozen view, whatever other threads write.
+"""
+
+import sqlite3
+import threading
+from typing import Any, Callable
+
+from backend.app.db.conn import get_conn
+from backend.app.db.reminder_queries import list_recent_reminders
+from backend.app.services.item_matcher import (
+    ItemIndex,
+    ItemView,
+    events_index,
+    reminders_index,
+    tasks_index,
+)
+
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "queries": 0, "last_queries": 0, "max_queries": 0}
+
+
+class RequestSnapshot:
+    """
+    Lazily loaded view of tasks, reminders and events for one request. Tasks, active
+    reminders and upcoming events are frozen views of the shared item indexes, synced
+    once through the snapshot connection; recent reminders are read once and kept.
+    """
+
+    def __init__(self):
+        self._conn: sqlite3.Connection | None = None
+        self._views: dict[str, ItemView] = {}
+        self._recent: list[dict] | None = None
+        self.queries = 0
+
+    def __enter__(self) -> "RequestSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _count(self, statement: str) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.queries += 1
+
+    def _read_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = get_conn()
+            self._conn.set_trace_callback(self._count)
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN;")
+        return self._conn
+
+    def _index(self, collection: str, index: ItemIndex) -> ItemView:
+        if collection not in self._views:
+            self._views[collection] = index.view(self._read_conn())
+        return self._views[collection]
+
+    @property
+    def tasks(self) -> ItemView:
+        return self._index("tasks", tasks_index)
+
+    @property
+    def reminders(self) -> ItemView:
+        return self._index("reminders", reminders_index)
+
+    @property
+    def events(self) -> ItemView:
+        return self._index("events", events_index)
+
+    def recent_reminders(self) -> list[dict]:
+        """The last 20 reminders of any status."""
+        if self._recent is None:
+            self._recent = list_recent_reminders(conn=self._read_conn())
+        return [dict(r) for r in self._recent]
+
+    def release(self) -> None:
+        """End the read transaction (before writes or LLM calls); loaded data is kept."""
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.commit()
+
+    def write(self, collections: str | tuple[str, ...], fn: Callable[..., Any], *args) -> Any:
+        """Run a db write helper outside the read transaction and reload only `collections`."""
+        self.release()
+        for collection in (collections,) if isinstance(collections, str) else collections:
+            self._views.pop(collection, None)
+            if collection == "reminders":
+                self._recent = None
+        return fn(*args)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self.release()
+            self._conn.close()
+            self._conn = None
+        with _stats_lock:
+            _stats["requests"] += 1
+            _stats["queries"] += self.queries
+            _stats["last_queries"] = self.queries
+            _stats["max_queries"] = max(_stats["max_queries"], self.queries)
+
+
+def snapshot_stats() -> dict:
+    """Per-request query counts for `/api/ai/stats`."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_queries"] = round(stats["queries"] / stats["requests"], 2) if stats["requests"] else 0.0
+    return stats
@@ -9,7 +9,10 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from backend.app.db.reminder_seed import seed_defaults_if_empty
 from backend.app.db.workday_queries import is_work_day
+from backend.app.services.briefing_service import briefing_service
+from backend.app.services.day_summary import day_summary
 from backend.app.services.event_reminder_service import create_event_reminders_for_date
+from backend.app.services.memory_pipeline import run_memory_maintenance
 from backend.app.services.voice_service import synthesize_and_play_async
 from backend.app.db.reminder_queries import (
     get_schedules_for_day_type,
@@ -64,6 +67,7 @@ def _format_alert_speech(text: str) -> str:
 def start_scheduler():
     """Boot the scheduler, arm today's reminders, and register jobs."""
     seed_defaults_if_empty()
+    briefing_service.start()
     arm_today()
 
     scheduler.add_job(
@@ -80,6 +84,13 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    scheduler.add_job(
+        func=run_memory_maintenance,
+        trigger=IntervalTrigger(minutes=5),
+        id="memory_maintenance",
+        replace_existing=True,
+    )
+
     scheduler.start()
 
 def arm_today():
@@ -101,6 +112,8 @@ def arm_today():
         )
 
     create_event_reminders_for_date(today)
+    day_summary.rebuild(today)
+    briefing_service.refresh()
 
 def _nag_tick():
     """Every 5s: fire due reminders, speak, and roll next_fire until window ends."""
@@ -10,7 +10,51 @@ import threading
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any, Tuple
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+SAMPLE_RATE = 16000
+
+
+# Raw 16 kHz mono bodies that skip ffmpeg entirely (base media type -> sample dtype).
+# audio/L16 is big-endian per RFC 2586 unless `endianness=little-endian` is given.
+RAW_PCM_TYPES = {
+    "audio/l16": ">i2",
+    "audio/x-float32": "<f4",
+}
+
+
+class STTLimitError(RuntimeError):
+    """Raised when an upload exceeds the configured byte or duration cap."""
+
+
+class STTFormatError(RuntimeError):
+    """Raised when a raw PCM upload has parameters the model cannot take as-is."""
+
+
+def raw_pcm_dtype(content_type: Optional[str]) -> Optional[np.dtype]:
+    """
+    Return the sample dtype for a raw PCM content type (e.g. `audio/L16;rate=16000`),
+    or None if the body is a container that needs ffmpeg.
+    """
+    if not content_type:
+        return None
+    base, *params = [p.strip() for p in content_type.split(";")]
+    dtype = RAW_PCM_TYPES.get(base.lower())
+    if dtype is None:
+        return None
+    options = {}
+    for param in params:
+        key, _, value = param.partition("=")
+        options[key.strip().lower()] = value.strip().strip('"').lower()
+    if options.get("rate", str(SAMPLE_RATE)) != str(SAMPLE_RATE):
+        raise STTFormatError(f"raw PCM must be {SAMPLE_RATE} Hz")
+    if options.get("channels", "1") != "1":
+        raise STTFormatError("raw PCM must be mono")
+    if options.get("endianness") == "little-endian":
+        dtype = "<" + dtype[1:]
+    return np.dtype(dtype)
 
 
 @dataclass(frozen=True)
@@ -25,6 +69,7 @@ class STTResult:
     text: str
     segments: List[STTSegment]
     language: Optional[str] = None
+    duration: Optional[float] = None
 
 
 class STTService:
@@ -32,6 +77,8 @@ class STTService:
     Core STT service:
       - Converts input audio to 16kHz mono wav (PCM) via ffmpeg
       - Transcribes with faster-whisper
+      - Long recordings are split on VAD boundaries into overlapping chunks and
+        run through faster-whisper's batched pipeline, then stitched back together
     """
 
     def __init__(
@@ -41,15 +88,32 @@ class STTService:
         compute_type: str = "int8",   # cpu: "int8" is usually best
         default_language: Optional[str] = "en",
         vad_filter: bool = True,
+        cpu_threads: int = 0,         # 0 lets CTranslate2 pick
+        long_audio_s: float = 45.0,   # recordings at least this long use chunked mode
+        chunk_s: float = 28.0,        # max chunk length (whisper window is 30s)
+        chunk_overlap_s: float = 1.0,
+        batch_size: int = 8,
+        max_upload_bytes: Optional[int] = None,
+        max_duration_s: Optional[float] = None,
+        cache: Optional[Any] = None,  # STTResultCache; keyed by decoded audio
     ):
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
         self.default_language = default_language
         self.vad_filter = vad_filter
+        self.cpu_threads = cpu_threads
+        self.long_audio_s = long_audio_s
+        self.chunk_s = chunk_s
+        self.chunk_overlap_s = chunk_overlap_s
+        self.batch_size = batch_size
+        self.max_upload_bytes = max_upload_bytes
+        self.max_duration_s = max_duration_s
+        self.cache = cache
 
         self._model = WhisperModel(
-            model_size, device=device, compute_type=compute_type)
+            model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        self._batched = BatchedInferencePipeline(model=self._model)
         self._lock = threading.Lock()
 
     def transcribe_file(self, input_path: str, language: Optional[str] = None) -> STTResult:
@@ -61,46 +125,181 @@ class STTService:
 
         with tempfile.TemporaryDirectory() as td:
             wav_path = os.path.join(td, "audio_16k_mono.wav")
-            self._convert_to_wav_16k_mono(input_path, wav_path)
-
-            # model.transcribe returns (segments_iterator, info)
-            with self._lock:
-                segments_iter, info = self._model.transcribe(
-                    wav_path,
-                    language=lang_arg,
-                    vad_filter=self.vad_filter,
-                )
-
-                segments: List[STTSegment] = []
-                text_parts: List[str] = []
-
-                for s in segments_iter:
-                    t = (s.text or "").strip()
-                    if not t:
-                        continue
-                    segments.append(STTSegment(start=float(
-                        s.start), end=float(s.end), text=t))
-                    text_parts.append(t)
-
-            detected_lang = getattr(info, "language", None)
-            return STTResult(text=" ".join(text_parts).strip(), segments=segments, language=detected_lang)
+            self._convert_to_wav_16k_mono(input_path, wav_path, self._ffmpeg_time_limit())
+            audio = self._load_wav(wav_path)
+
+        return self._transcribe_audio(audio, lang_arg)
+
+    def transcribe_pcm(
+        self, data: bytes, dtype: np.dtype, language: Optional[str] = None
+    ) -> STTResult:
+        """
+        Transcribe a raw 16 kHz mono PCM body with no temp file or ffmpeg pass.
+        float32 little-endian is mapped zero-copy with `np.frombuffer`; PCM16 only
+        needs the scale to [-1, 1] that faster-whisper expects of array input.
+        """
+        lang_arg = language if language is not None else self.default_language
+        if len(data) % dtype.itemsize:
+            raise STTFormatError("raw PCM body is not a whole number of samples")
+        audio = np.frombuffer(data, dtype=dtype)
+        if dtype.kind == "i":
+            audio = audio.astype(np.float32) / 32768.0
+        elif dtype != np.dtype(np.float32):
+            audio = audio.astype(np.float32)
+        self._check_duration(audio)
+        return self._transcribe_audio(audio, lang_arg)
+
+    def open_stream(self, language: Optional[str] = None) -> "STTStream":
+        """Start an incremental upload; see `STTStream`."""
+        return STTStream(self, language if language is not None else self.default_language)
+
+    def _ffmpeg_time_limit(self) -> Optional[float]:
+        # Decode slightly past the cap so "longer than allowed" is detectable.
+        if self.max_duration_s is None:
+            return None
+        return self.max_duration_s + 1.0
+
+    def _load_wav(self, wav_path: str):
+        """Read normalised wav samples, enforcing the duration cap."""
+        audio = decode_audio(wav_path, sampling_rate=SAMPLE_RATE)
+        self._check_duration(audio)
+        return audio
+
+    def _check_duration(self, audio) -> None:
+        if self.max_duration_s is not None and audio.shape[0] > self.max_duration_s * SAMPLE_RATE:
+            raise STTLimitError(
+                f"audio longer than {self.max_duration_s:g} seconds")
+
+    def _transcribe_audio(self, audio, language: Optional[str]) -> STTResult:
+        """Transcribe 16kHz mono float32 samples, via the result cache when configured."""
+        if self.cache is None:
+            return self._transcribe_uncached(audio, language)
+        key = self.cache.key(audio, self.model_size, language)
+        return self.cache.get_or_compute(
+            key, lambda: self._transcribe_uncached(audio, language))
+
+    def _transcribe_uncached(self, audio, language: Optional[str]) -> STTResult:
+        """Transcribe samples, switching to chunked mode for long audio."""
+        duration = audio.shape[0] / SAMPLE_RATE
+        if duration >= self.long_audio_s:
+            return self._transcribe_long(audio, language, duration)
+
+        # model.transcribe returns (segments_iterator, info)
+        with self._lock:
+            segments_iter, info = self._model.transcribe(
+                audio,
+                language=language,
+                vad_filter=self.vad_filter,
+            )
+            segments = self._collect_segments(segments_iter)
+
+        return self._build_result(segments, info, duration)
+
+    def _transcribe_long(self, audio, language: Optional[str], duration: float) -> STTResult:
+        """Transcribe a long recording as overlapping VAD-aligned chunks in one batched pass."""
+        clips = self._plan_chunks(audio)
+        if not clips:
+            return STTResult(text="", segments=[], language=language, duration=duration)
+
+        with self._lock:
+            segments_iter, info = self._batched.transcribe(
+                audio,
+                language=language,
+                clip_timestamps=clips,
+                vad_filter=False,
+                without_timestamps=False,
+                batch_size=self.batch_size,
+            )
+            segments = self._collect_segments(segments_iter)
+
+        return self._build_result(self._stitch_segments(segments), info, duration)
+
+    def _plan_chunks(self, audio) -> List[Dict[str, int]]:
+        """
+        Group VAD speech regions into chunks of at most `chunk_s` seconds, as sample
+        offsets (what `clip_timestamps` slices the audio with). Each chunk after the
+        first starts `chunk_overlap_s` before its first speech region so words clipped
+        at a boundary are heard twice rather than lost.
+        """
+        vad_options = VadOptions(
+            max_speech_duration_s=self.chunk_s - self.chunk_overlap_s,
+            min_silence_duration_ms=160,
+        )
+        max_samples = int(self.chunk_s * SAMPLE_RATE)
+        overlap = int(self.chunk_overlap_s * SAMPLE_RATE)
+        clips: List[Dict[str, int]] = []
+        chunk_start: Optional[int] = None
+        chunk_end = 0
+        for ts in get_speech_timestamps(audio, vad_options):
+            start, end = int(ts["start"]), int(ts["end"])
+            if chunk_start is None:
+                chunk_start, chunk_end = start, end
+                continue
+            if end - chunk_start <= max_samples:
+                chunk_end = end
+                continue
+            clips.append({"start": chunk_start, "end": chunk_end})
+            chunk_start, chunk_end = max(start - overlap, 0), end
+        if chunk_start is not None:
+            clips.append({"start": chunk_start, "end": chunk_end})
+        return clips
+
+    @staticmethod
+    def _drop_repeated_words(prev_text: str, text: str, max_words: int = 12) -> str:
+        """Remove leading words of `text` that repeat the tail of `prev_text` (overlap audio)."""
+        def norm(word: str) -> str:
+            return "".join(ch for ch in word.lower() if ch.isalnum())
+
+        prev_words = [norm(w) for w in prev_text.split()][-max_words:]
+        words = text.split()
+        lead = [norm(w) for w in words[:max_words]]
+        for k in range(min(len(prev_words), len(lead)), 0, -1):
+            if prev_words[-k:] == lead[:k]:
+                return " ".join(words[k:])
+        return text
+
+    @classmethod
+    def _stitch_segments(cls, segments: List[STTSegment]) -> List[STTSegment]:
+        """Order chunk segments by time and drop/trim repeats from the overlap regions."""
+        stitched: List[STTSegment] = []
+        for seg in sorted(segments, key=lambda s: (s.start, s.end)):
+            if stitched and seg.start < stitched[-1].end:
+                prev = stitched[-1]
+                if seg.end <= prev.end + 0.25:
+                    # Fully inside the previous chunk's audio: already transcribed.
+                    continue
+                text = cls._drop_repeated_words(prev.text, seg.text)
+                if not text:
+                    continue
+                seg = STTSegment(start=prev.end, end=seg.end, text=text)
+            stitched.append(seg)
+        return stitched
 
     @staticmethod
-    def _convert_to_wav_16k_mono(input_path: str, output_wav_path: str) -> None:
+    def _collect_segments(segments_iter) -> List[STTSegment]:
+        segments: List[STTSegment] = []
+        for s in segments_iter:
+            t = (s.text or "").strip()
+            if not t:
+                continue
+            segments.append(STTSegment(start=float(
+                s.start), end=float(s.end), text=t))
+        return segments
+
+    @staticmethod
+    def _build_result(segments: List[STTSegment], info, duration: float) -> STTResult:
+        detected_lang = getattr(info, "language", None)
+        text = " ".join(s.text for s in segments).strip()
+        return STTResult(text=text, segments=segments, language=detected_lang, duration=duration)
+
+    @staticmethod
+    def _convert_to_wav_16k_mono(
+        input_path: str, output_wav_path: str, max_duration_s: Optional[float] = None
+    ) -> None:
         """
         Uses ffmpeg to normalise audio. This is the key step that makes browser audio painless.
         """
-        ffmpeg_bin = os.getenv("FFMPEG_PATH", "ffmpeg")
-        cmd = [
-            ffmpeg_bin,
-            "-y",
-            "-loglevel", "error",
-            "-i", input_path,
-            "-ac", "1",
-            "-ar", "16000",
-            "-f", "wav",
-            output_wav_path,
-        ]
+        cmd = _ffmpeg_cmd(input_path, output_wav_path, max_duration_s)
         try:
             subprocess.run(cmd, check=True, capture_output=True)
         except FileNotFoundError as e:
@@ -112,6 +311,112 @@ class STTService:
                 f"ffmpeg conversion failed: {err or 'unknown error'}") from e
 
 
+class STTStream:
+    """
+    Incremental upload sink. Bytes are piped into ffmpeg as they arrive, so decoding
+    overlaps the upload, and a copy is spooled to disk in case the container is not
+    streamable (e.g. mp4 with a trailing moov atom) and has to be re-read as a file.
+    Memory use is bounded by the chunk size regardless of upload length.
+    """
+
+    def __init__(self, service: STTService, language: Optional[str]):
+        self._service = service
+        self._language = language
+        self._td = tempfile.TemporaryDirectory()
+        self._raw_path = os.path.join(self._td.name, "upload.bin")
+        self._wav_path = os.path.join(self._td.name, "audio_16k_mono.wav")
+        self._raw = open(self._raw_path, "wb")
+        self.bytes_received = 0
+        try:
+            self._proc: Optional[subprocess.Popen] = subprocess.Popen(
+                _ffmpeg_cmd("pipe:0", self._wav_path, service._ffmpeg_time_limit()),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError as e:
+            self.close()
+            raise RuntimeError(
+                "ffmpeg not found. Install ffmpeg and ensure it is on PATH.") from e
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the upload, enforcing the byte and duration caps early."""
+        if not chunk:
+            return
+        self.bytes_received += len(chunk)
+        limit = self._service.max_upload_bytes
+        if limit is not None and self.bytes_received > limit:
+            raise STTLimitError(f"upload larger than {limit} bytes")
+        self._raw.write(chunk)
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.write(chunk)
+        except (BrokenPipeError, OSError):
+            # ffmpeg stopped reading: either the duration cap was hit or the
+            # container needs seeking. finish() tells the two apart.
+            self._proc.wait()
+            if self._proc.returncode == 0 and self._service.max_duration_s is not None:
+                raise STTLimitError(
+                    f"audio longer than {self._service.max_duration_s:g} seconds")
+            self._stop_proc()
+
+    def finish(self) -> STTResult:
+        """Flush the upload, complete decoding and transcribe."""
+        self._raw.close()
+        decoded = False
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            self._proc.wait()
+            decoded = self._proc.returncode == 0
+            self._proc = None
+        if not decoded:
+            STTService._convert_to_wav_16k_mono(
+                self._raw_path, self._wav_path, self._service._ffmpeg_time_limit()
+            )
+        audio = self._service._load_wav(self._wav_path)
+        return self._service._transcribe_audio(audio, self._language)
+
+    def close(self) -> None:
+        """Stop ffmpeg (if still running) and delete temp files."""
+        if not self._raw.closed:
+            self._raw.close()
+        self._stop_proc()
+        self._td.cleanup()
+
+    def _stop_proc(self) -> None:
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._proc = None
+
+
+def _ffmpeg_cmd(
+    input_path: str, output_wav_path: str, max_duration_s: Optional[float] = None
+) -> List[str]:
+    ffmpeg_bin = os.getenv("FFMPEG_PATH", "ffmpeg")
+    cmd = [
+        ffmpeg_bin,
+        "-y",
+        "-loglevel", "error",
+        "-i", input_path,
+    ]
+    if max_duration_s is not None:
+        cmd += ["-t", f"{max_duration_s:g}"]
+    cmd += [
+        "-ac", "1",
+        "-ar", "16000",
+        "-f", "wav",
+        output_wav_path,
+    ]
+    return cmd
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
@@ -0,0 +1,286 @@
+"""
+STT benchmark harness: run `STTService` over a local corpus for one or more model
+configurations and report real-time factor, latency percentiles, peak RSS and WER.
+
+Corpus layout: a directory of audio clips, each with a reference transcript in a
+sibling `.txt` file of the same stem (`shopping_list.webm` + `shopping_list.txt`).
+
+Usage:
+  python -m backend.app.services.stt_benchmark --corpus clips/ \\
+      --models small.en,base.en --compute-types int8,float32 --threads 0,4 \\
+      --out results.json --baseline baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional
+
+AUDIO_SUFFIXES = {".wav", ".webm", ".ogg", ".opus", ".m4a", ".mp3", ".flac"}
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    model_size: str
+    compute_type: str
+    cpu_threads: int
+    device: str = "cpu"
+
+    @property
+    def name(self) -> str:
+        return f"{self.model_size}/{self.compute_type}/threads={self.cpu_threads}/{self.device}"
+
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, Optional[str]]]:
+    """Return `{path, reference}` for each audio clip (reference None if no .txt)."""
+    clips = []
+    for path in sorted(Path(corpus_dir).iterdir()):
+        if path.suffix.lower() not in AUDIO_SUFFIXES:
+            continue
+        ref_path = path.with_suffix(".txt")
+        reference = ref_path.read_text().strip() if ref_path.exists() else None
+        clips.append({"path": str(path), "reference": reference})
+    return clips
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase and strip punctuation (keeping apostrophes) before scoring."""
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """Return (substitutions + deletions + insertions, reference word count)."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    prev = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        cur = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            cur[j] = min(
+                prev[j] + 1,
+                cur[j - 1] + 1,
+                prev[j - 1] + (ref_word != hyp_word),
+            )
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def run_config(config: BenchConfig, clips: List[dict], warmup: int, repeat: int) -> dict:
+    """Benchmark one configuration. Runs in a fresh process so peak RSS is per config."""
+    from backend.app.services.speech_to_text import STTService
+
+    load_start = time.perf_counter()
+    svc = STTService(
+        model_size=config.model_size,
+        device=config.device,
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+        default_language=os.getenv("WHISPER_LANGUAGE", "en"),
+        long_audio_s=float(os.getenv("WHISPER_LONG_AUDIO_SECONDS", "45")),
+        batch_size=int(os.getenv("WHISPER_BATCH_SIZE", "8")),
+    )
+    load_s = time.perf_counter() - load_start
+
+    for clip in clips[:warmup]:
+        svc.transcribe_file(clip["path"])
+
+    latencies: List[float] = []
+    audio_s = 0.0
+    errors = 0
+    ref_words = 0
+    per_clip = []
+    for clip in clips:
+        clip_latencies: List[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = svc.transcribe_file(clip["path"])
+            clip_latencies.append(time.perf_counter() - start)
+            audio_s += result.duration or 0.0
+        latencies.extend(clip_latencies)
+        clip_wer = None
+        if clip["reference"] is not None:
+            clip_errors, clip_words = word_errors(clip["reference"], result.text)
+            errors += clip_errors
+            ref_words += clip_words
+            clip_wer = clip_errors / clip_words if clip_words else 0.0
+        per_clip.append(
+            {
+                "clip": Path(clip["path"]).name,
+                "duration_s": round(result.duration or 0.0, 3),
+                # Median over the repeats; every timed run is kept alongside.
+                "latency_s": round(percentile(clip_latencies, 50), 4),
+                "latencies_s": [round(value, 4) for value in clip_latencies],
+                "wer": None if clip_wer is None else round(clip_wer, 4),
+                "text": result.text,
+            }
+        )
+
+    return {
+        "config": config.name,
+        "settings": asdict(config),
+        "model_load_s": round(load_s, 3),
+        "clips": len(clips),
+        "runs": len(latencies),
+        "audio_s": round(audio_s, 3),
+        "rtf": round(sum(latencies) / audio_s, 4) if audio_s else None,
+        "latency_p50_s": round(percentile(latencies, 50), 4),
+        "latency_p95_s": round(percentile(latencies, 95), 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "wer": round(errors / ref_words, 4) if ref_words else None,
+        "per_clip": per_clip,
+    }
+
+
+def compare_to_baseline(
+    results: List[dict], baseline: List[dict], tolerance: float, wer_tolerance: float
+) -> List[dict]:
+    """Diff results against a baseline run; flags slower RTF/p95 or worse WER."""
+    by_name = {entry["config"]: entry for entry in baseline}
+    comparisons = []
+    for entry in results:
+        base = by_name.get(entry["config"])
+        if base is None:
+            continue
+        regressions = []
+        for metric in ("rtf", "latency_p95_s", "peak_rss_mb"):
+            new, old = entry.get(metric), base.get(metric)
+            if new is not None and old and new > old * (1 + tolerance):
+                regressions.append(metric)
+        if (
+            entry.get("wer") is not None
+            and base.get("wer") is not None
+            and entry["wer"] > base["wer"] + wer_tolerance
+        ):
+            regressions.append("wer")
+        comparisons.append(
+            {
+                "config": entry["config"],
+                "deltas": {
+                    metric: _delta(entry.get(metric), base.get(metric))
+                    for metric in ("rtf", "latency_p50_s", "latency_p95_s", "peak_rss_mb", "wer")
+                },
+                "regressions": regressions,
+            }
+        )
+    return comparisons
+
+
+def _delta(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    if new is None or old is None:
+        return None
+    return round(new - old, 4)
+
+
+def _print_table(results: List[dict], comparisons: List[dict]) -> None:
+    flagged = {c["config"]: c["regressions"] for c in comparisons}
+    header = f"{'config':<42} {'rtf':>7} {'p50 s':>8} {'p95 s':>8} {'rss MB':>8} {'wer':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        wer = "-" if r["wer"] is None else f"{r['wer']:.3f}"
+        rtf = "-" if r["rtf"] is None else f"{r['rtf']:.3f}"
+        line = (
+            f"{r['config']:<42} {rtf:>7} {r['latency_p50_s']:>8.3f} "
+            f"{r['latency_p95_s']:>8.3f} {r['peak_rss_mb']:>8.1f} {wer:>7}"
+        )
+        if flagged.get(r["config"]):
+            line += "  REGRESSED: " + ", ".join(flagged[r["config"]])
+        print(line)
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", required=True, help="directory of clips + .txt references")
+    parser.add_argument("--models", default=os.getenv("WHISPER_MODEL", "small.en"))
+    parser.add_argument("--compute-types", default=os.getenv("WHISPER_COMPUTE_TYPE", "int8"))
+    parser.add_argument("--threads", default=os.getenv("WHISPER_CPU_THREADS", "0"))
+    parser.add_argument("--device", default=os.getenv("WHISPER_DEVICE", "cpu"))
+    parser.add_argument("--warmup", type=int, default=1, help="clips transcribed before timing")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per clip")
+    parser.add_argument("--out", help="write JSON results here")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--wer-tolerance", type=float, default=0.02, help="allowed WER increase")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    clips = load_corpus(args.corpus)
+    if not clips:
+        print(f"No audio clips found in {args.corpus}")
+        return 2
+
+    configs = [
+        BenchConfig(model_size=m, compute_type=c, cpu_threads=int(t), device=args.device)
+        for m, c, t in itertools.product(
+            _csv(args.models), _csv(args.compute_types), _csv(args.threads)
+        )
+    ]
+
+    results = []
+    for config in configs:
+        print(f"Benchmarking {config.name} on {len(clips)} clip(s)...", flush=True)
+        # spawn (not fork) so each configuration starts from a clean process
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results.append(
+                pool.submit(run_config, config, clips, args.warmup, args.repeat).result()
+            )
+
+    comparisons: List[dict] = []
+    if args.baseline and not args.save_baseline and Path(args.baseline).exists():
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        comparisons = compare_to_baseline(results, baseline, args.tolerance, args.wer_tolerance)
+
+    _print_table(results, comparisons)
+
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "corpus": str(Path(args.corpus).resolve()),
+        "results": results,
+        "baseline_comparison": comparisons,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(payload, indent=2))
+    if args.save_baseline and args.baseline:
+        Path(args.baseline).write_text(json.dumps(payload, indent=2))
+        print(f"Baseline written to {args.baseline}")
+
+    regressed = any(c["regressions"] for c in comparisons)
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
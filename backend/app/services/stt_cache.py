@@ -0,0 +1,119 @@
+"""Transcription result cache keyed by decoded audio, so retried uploads are free."""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from backend.app.services.caching import SingleFlight, TTLCache
+from backend.app.services.speech_to_text import STTResult, STTSegment
+
+
+class STTResultCache:
+    """
+    Two-tier (memory LRU + JSON files on disk) cache of `STTResult`s with a TTL.
+    Concurrent requests for the same audio share one transcription.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None,
+        ttl_s: float = 600.0,
+        max_entries: int = 64,
+        max_disk_entries: int = 512,
+    ):
+        self.ttl_s = ttl_s
+        self.max_disk_entries = max_disk_entries
+        self._memory = TTLCache(max_entries, ttl_s)
+        self._inflight = SingleFlight()
+        self._dir = Path(cache_dir) if cache_dir else None
+        self.disk_hits = 0
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(audio, model_size: str, language: Optional[str]) -> str:
+        """Hash the decoded samples together with the settings that change the output."""
+        digest = hashlib.sha256()
+        digest.update(f"{model_size}|{language or ''}|".encode("utf-8"))
+        digest.update(memoryview(np.ascontiguousarray(audio)).cast("B"))
+        return digest.hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], STTResult]) -> STTResult:
+        """Return a cached result, or run `compute` once for all concurrent callers."""
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+        return self._inflight.do(key, lambda: self._load_or_compute(key, compute))
+
+    def stats(self) -> dict:
+        return {
+            **self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "shared_inflight": self._inflight.shared,
+        }
+
+    def _load_or_compute(self, key: str, compute: Callable[[], STTResult]) -> STTResult:
+        result = self._read_disk(key)
+        if result is not None:
+            self.disk_hits += 1
+        else:
+            result = compute()
+            self._write_disk(key, result)
+        self._memory.set(key, result)
+        return result
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> STTResult | None:
+        if self._dir is None:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime >= self.ttl_s:
+                path.unlink(missing_ok=True)
+                return None
+            payload = json.loads(path.read_text())
+            return STTResult(
+                text=payload["text"],
+                segments=[STTSegment(**s) for s in payload["segments"]],
+                language=payload.get("language"),
+                duration=payload.get("duration"),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, result: STTResult) -> None:
+        if self._dir is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(asdict(result)))
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self) -> None:
+        """Drop expired files and keep only the newest `max_disk_entries`."""
+        now = time.time()
+        entries = []
+        for path in self._dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime >= self.ttl_s:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((mtime, path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_disk_entries :]:
+            path.unlink(missing_ok=True)